@@ -1,9 +1,30 @@
 from __future__ import annotations
+from ..repo.catalog_repo import CatalogRepository
+from ..repo.item_group_repo import ItemGroupRepository
+from ..repo.pos_session_repo import PosSessionRepository
+from ..repo.print_job_repo import PrintJobRepository
 from ..repo.printing_repo import PrintingRepository
+from ..repo.report_repo import ReportRepository
+from ..repo.session_summary_repo import SessionSummaryRepository
+from ..usecase.catalog_usecase import CatalogUseCase
+from ..usecase.print_spooler_usecase import PrintSpoolerUseCase
+from ..usecase.printer_health_usecase import PrinterHealthUseCase
 from ..usecase.printing_usecase import PrintingUseCase
+from ..usecase.report_usecase import ReportUseCase
+from ..usecase.session_summary_usecase import SessionSummaryUseCase
+from ..usecase.session_usecase import SessionUseCase
 
 # Construct once per process at import time
 repo = PrintingRepository()
 printing_uc = PrintingUseCase(repo=repo)
+catalog_uc = CatalogUseCase(repo=CatalogRepository(), group_repo=ItemGroupRepository())
+session_uc = SessionUseCase(repo=PosSessionRepository())
+session_summary_uc = SessionSummaryUseCase(repo=SessionSummaryRepository())
+report_uc = ReportUseCase(repo=ReportRepository())
+printer_health_uc = PrinterHealthUseCase(repo=repo)
+print_spooler_uc = PrintSpoolerUseCase(repo=PrintJobRepository(), health=printer_health_uc)
 
-__all__ = ["printing_uc"]
+__all__ = [
+    "catalog_uc", "print_spooler_uc", "printer_health_uc", "printing_uc",
+    "report_uc", "session_summary_uc", "session_uc",
+]
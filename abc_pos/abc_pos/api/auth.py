@@ -1,67 +1,69 @@
+import hmac
 import frappe
 from frappe import _
 from frappe.utils.password import check_password
 from frappe.core.doctype.user.user import generate_keys
-from frappe.utils.password import get_decrypted_password
+from frappe.utils.password import get_decrypted_password, set_encrypted_password
 from frappe.sessions import Session
-from frappe.utils import random_string, now_datetime
+from frappe.utils import cint, flt, random_string, now_datetime
+from typing import Dict, Optional
+from . import catalog_uc, printing_uc, session_uc
+from .pos_session import currency_list
+from .throttle import ThrottledError, throttle
+
+CASHIER_TOKEN_KEY = "abc_pos:cashier_token:"
+CASHIER_TOKEN_TTL = 12 * 60 * 60
+# Per cashier code: a burst of LOGIN_BURST attempts, then one every 1 / LOGIN_REFILL_PER_SEC seconds
+LOGIN_BURST = 5
+LOGIN_REFILL_PER_SEC = 0.2
+
 
 @frappe.whitelist(allow_guest=True)
 def cashier_login(cashier_code, cashier_password, remember_me=0):
     try:
-        # 1. Find user linked to cashier_code
-        user_name = frappe.db.get_value("User", {"cashier_code": cashier_code, "cashier_password" : cashier_password,"enabled": 1}, "name")
-        if not user_name:
+        throttle(
+            f"cashier_login:{cashier_code}",
+            cint(frappe.conf.get("abc_pos_login_burst")) or LOGIN_BURST,
+            flt(frappe.conf.get("abc_pos_login_refill_per_sec")) or LOGIN_REFILL_PER_SEC,
+        )
+
+        # 1. Find user by the indexed cashier_code, then compare the password in constant time
+        candidates = frappe.get_all(
+            "User",
+            filters={"cashier_code": cashier_code, "enabled": 1},
+            fields=["name", "full_name", "cashier_password", "api_key"],
+            limit=5,
+        )
+        user = next(
+            (
+                row for row in candidates
+                if hmac.compare_digest(str(row.cashier_password or ""), str(cashier_password or ""))
+            ),
+            None,
+        )
+        if not user:
             frappe.throw(_("User Not Found"))
 
-        # 2. Validate password
-        # if not check_password(user_name, cashier_password, doctype="User", fieldname="password"):
-        #     frappe.throw(_("Invalid cashier credentials"))
-        #
-        # 3. Get user document
-        user_doc = frappe.get_doc("User", user_name)
-
-        # 4. Generate API credentials if they don't exist
-        api_key = user_doc.api_key
-        api_secret = None
-
-        if api_key:
-            try:
-                api_secret = get_decrypted_password("User", user_name, "api_secret")
-            except:
-                api_secret = None
-
-        # Generate new API credentials if missing
-        if not api_key or not api_secret:
-            # Generate new API key and secret
-            api_key = frappe.generate_hash(length=15)
-            api_secret = frappe.generate_hash(length=15)
-
-            # Update user document
-            user_doc.api_key = api_key
-            user_doc.api_secret = api_secret
-            user_doc.save(ignore_permissions=True)
-            frappe.db.commit()
-
-        # 5. Create authorization token
-        token_value = f"{api_key}:{api_secret}"
-
+        # 2. Issue the cached token, creating API credentials on first login
+        token_value = _cashier_token(user)
 
         return {
             "success": True,
             "authorization": token_value,
             "token_type": "token",
-            "user": user_name,
-            "full_name": user_doc.full_name,
+            "user": user.name,
+            "full_name": user.full_name,
             "message": "Login successful"
         }
 
     except Exception as e:
-        # Log the error for debugging
-        frappe.log_error(f"Cashier login failed: {str(e)}", "Cashier Login Error")
+        throttled = isinstance(e, ThrottledError)
+        if not throttled:
+            # Log the error for debugging
+            frappe.log_error(f"Cashier login failed: {str(e)}", "Cashier Login Error")
 
         # Return proper error response
-        frappe.local.response["http_status_code"] = 401
+        frappe.local.response["http_status_code"] = 429 if throttled else 401
         return {
             "success": False,
             "message": str(e),
@@ -69,34 +71,141 @@ def cashier_login(cashier_code, cashier_password, remember_me=0):
         }
 
 
+def _cashier_token(user) -> str:
+    """
+    "api_key:api_secret" for the user, from Redis when cached. Missing
+    credentials are written with set_value / set_encrypted_password instead
+    of saving the whole User document.
+    """
+    cache_key = CASHIER_TOKEN_KEY + user.name
+    token_value = frappe.cache().get_value(cache_key)
+    if token_value:
+        return token_value
+
+    api_key = user.api_key
+    api_secret = None
+    if api_key:
+        try:
+            api_secret = get_decrypted_password("User", user.name, "api_secret", raise_exception=False)
+        except Exception:
+            api_secret = None
+
+    if not api_key or not api_secret:
+        api_key = api_key or frappe.generate_hash(length=15)
+        api_secret = frappe.generate_hash(length=15)
+        frappe.db.set_value("User", user.name, "api_key", api_key, update_modified=False)
+        set_encrypted_password("User", user.name, api_secret, "api_secret")
+        frappe.db.commit()
+
+    token_value = f"{api_key}:{api_secret}"
+    frappe.cache().set_value(cache_key, token_value, expires_in_sec=CASHIER_TOKEN_TTL)
+    return token_value
+
+
+def evict_cashier_token(user: str):
+    frappe.cache().delete_value(CASHIER_TOKEN_KEY + user)
+
+
+BOOTSTRAP_KEY = "abc_pos:bootstrap:"
+BOOTSTRAP_TTL = 12 * 60 * 60
+CURRENCIES_KEY = "abc_pos:currencies"
+
+
 @frappe.whitelist()
 def get_session_info():
     """Get current session information for authenticated users"""
     if frappe.session.user == "Guest":
         frappe.throw(_("Not authenticated"), frappe.AuthenticationError)
 
-    user_doc = frappe.get_doc("User", frappe.session.user)
+    profile = _user_bootstrap(frappe.session.user)
 
     return {
         "success": True,
-        "user": {
-            "name": user_doc.name,
-            "full_name": user_doc.full_name,
-            "email": user_doc.email,
-            "user_image": user_doc.user_image,
-            "roles": frappe.get_roles(frappe.session.user),
-            "cashier_code": user_doc.cashier_code,
-            "language": user_doc.language or frappe.local.lang,
-        },
-        "session": {
-            "sid": frappe.session.sid,
-            "csrf_token": frappe.sessions.get_csrf_token(),
+        "user": dict(profile["user"], roles=profile["roles"]),
+        "session": _request_session(profile),
+        "timestamp": now_datetime(),
+    }
+
+
+@frappe.whitelist()
+def bootstrap(cashier_device_name: Optional[str] = None):
+    """
+    Everything a tablet needs on launch or resume in one call: user and roles,
+    the active POS session, the device's printer map, currencies and the
+    catalog version of the session's POS Profile.
+
+    Each part is served from its own cache: the user part per user (evicted on
+    User and System Settings changes), currencies globally (evicted on Currency
+    Exchange changes), and the session, printer map and catalog from their
+    existing caches.
+    """
+    user = frappe.session.user
+    if user == "Guest":
+        frappe.throw(_("Not authenticated"), frappe.AuthenticationError)
+
+    profile = _user_bootstrap(user)
+    pos_session = session_uc.get_active(user)
+    device = cashier_device_name or frappe.get_request_header("X-Device-Id")
+
+    catalog_version = None
+    if pos_session:
+        snapshot = catalog_uc.get_snapshot(pos_session.pos_profile)
+        catalog_version = snapshot["version"] if snapshot else None
+
+    return {
+        "success": True,
+        "user": profile["user"],
+        "roles": profile["roles"],
+        "session": _request_session(profile),
+        "pos_session": pos_session,
+        "printers": printing_uc.get_cashier_printers_cache(device) if device else [],
+        "currencies": frappe.cache().get_value(CURRENCIES_KEY, generator=currency_list),
+        "catalog_version": catalog_version,
+        "timestamp": now_datetime(),
+    }
+
+
+def _user_bootstrap(user: str) -> Dict:
+    profile = frappe.cache().get_value(BOOTSTRAP_KEY + user)
+    if profile is None:
+        user_doc = frappe.get_doc("User", user)
+        profile = {
+            "user": {
+                "name": user_doc.name,
+                "full_name": user_doc.full_name,
+                "email": user_doc.email,
+                "user_image": user_doc.user_image,
+                "cashier_code": user_doc.cashier_code,
+                "language": user_doc.language or frappe.local.lang,
+            },
+            "roles": frappe.get_roles(user),
             "time_zone": frappe.db.get_system_setting("time_zone"),
             "currency": frappe.db.get_default("Currency"),
-        },
-        "timestamp": now_datetime(),
+        }
+        frappe.cache().set_value(BOOTSTRAP_KEY + user, profile, expires_in_sec=BOOTSTRAP_TTL)
+    return profile
+
+
+def _request_session(profile: Dict) -> Dict:
+    return {
+        "sid": frappe.session.sid,
+        "csrf_token": frappe.sessions.get_csrf_token(),
+        "time_zone": profile["time_zone"],
+        "currency": profile["currency"],
     }
 
+
+def evict_bootstrap(user: Optional[str] = None):
+    """Drop one user's cached bootstrap, or every user's when `user` is None."""
+    if user:
+        frappe.cache().delete_value(BOOTSTRAP_KEY + user)
+    else:
+        frappe.cache().delete_keys(BOOTSTRAP_KEY)
+
+
+def evict_currencies():
+    frappe.cache().delete_value(CURRENCIES_KEY)
+
 @frappe.whitelist()
 def cashier_logout():
     """Logout current user and destroy session"""
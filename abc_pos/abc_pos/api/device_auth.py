@@ -1,12 +1,37 @@
 import frappe
 from functools import wraps
 from frappe import _
+from typing import Dict, Optional
+from ..usecase.two_tier_cache import TwoTierCache
+
+# Disabling a device takes effect in other workers within DEVICE_LOCAL_TTL seconds
+DEVICE_LOCAL_TTL = 10
+# Unknown ids are not cached: the header is client-supplied, so any string can arrive
+device_registry = TwoTierCache("abc_pos:cashier_device", local_ttl=DEVICE_LOCAL_TTL, cache_missing=False)
 
 def _deny(status: int, msg: str):
     frappe.local.response = getattr(frappe.local, "response", {}) or {}
     frappe.local.response["http_status_code"] = status
     raise PermissionError(_(msg))
 
+def _load_device(device_id: str) -> Optional[Dict]:
+    device = frappe.db.get_value(
+        "Cashier Device", {"name": device_id, "enabled": 1}, ["name", "restaurant"], as_dict=True
+    )
+    if not device:
+        return None
+    device["production_areas"] = frappe.get_all(
+        "Casheir Device Production Area",
+        filters={"parent": device_id, "parenttype": "Cashier Device"},
+        pluck="production_area",
+        order_by="idx",
+    )
+    return dict(device)
+
+def get_device(device_id: str) -> Optional[Dict]:
+    """Enabled Cashier Device with its restaurant and production areas, or None."""
+    return device_registry.get(device_id, lambda: _load_device(device_id))
+
 def device_protected(fn):
     """
     Ensure that X-Device-Id is passed in headers.
@@ -14,6 +39,9 @@ def device_protected(fn):
         @frappe.whitelist()
         @device_protected
         def my_api(): ...
+
+    Sets frappe.local.device, device_restaurant and device_production_areas
+    from the cached device registry.
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
@@ -23,11 +51,13 @@ def device_protected(fn):
         if not device_id:
             _deny(403, "Missing X-Device-Id header.")
 
-        if not frappe.db.exists("Cashier Device", {"name": device_id, "enabled": 1}):
+        device = get_device(device_id)
+        if not device:
             _deny(403, "Unauthorized or disabled device.")
 
-        # Only store the device name
         frappe.local.device = device_id
+        frappe.local.device_restaurant = device["restaurant"]
+        frappe.local.device_production_areas = device["production_areas"]
         return fn(*args, **kwargs)
 
     return wrapper
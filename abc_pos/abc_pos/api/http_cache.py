@@ -0,0 +1,39 @@
+import frappe
+from typing import Optional
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(version: Optional[str]) -> bool:
+    """
+    Check the request's If-None-Match header against a resource version.
+    """
+    if not version:
+        return False
+
+    header = frappe.get_request_header("If-None-Match") or ""
+    if header.strip() == "*":
+        return True
+
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == make_etag(version) or tag == version:
+            return True
+    return False
+
+
+def set_etag(version: str) -> None:
+    headers = getattr(frappe.local, "response_headers", None)
+    if headers is not None:
+        headers["ETag"] = make_etag(version)
+        headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(version: str) -> dict:
+    frappe.local.response["http_status_code"] = 304
+    set_etag(version)
+    return {"ok": True, "not_modified": True, "version": version}
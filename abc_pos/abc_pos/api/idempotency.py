@@ -0,0 +1,72 @@
+import hashlib
+import json
+import frappe
+from functools import wraps
+from frappe import _
+
+IDEMPOTENCY_KEY = "abc_pos:idempotency:"
+DEFAULT_TTL = 24 * 60 * 60
+PENDING_TTL = 60
+
+
+class IdempotencyConflictError(frappe.ValidationError):
+    http_status_code = 409
+
+
+class IdempotencyKeyReusedError(frappe.ValidationError):
+    http_status_code = 422
+
+
+def _fingerprint(kwargs) -> str:
+    payload = {k: v for k, v in kwargs.items() if k != "cmd"}
+    return hashlib.sha256(frappe.as_json(payload, indent=None).encode()).hexdigest()
+
+
+def idempotent(fn):
+    """
+    Replay the stored response when a request repeats its Idempotency-Key header.
+    Usage:
+        @frappe.whitelist()
+        @idempotent
+        def my_api(): ...
+
+    The first request reserves the key, runs the handler and stores its response
+    in Redis for `abc_pos_idempotency_ttl` seconds (site config, default 24h).
+    Retries with the same key and payload get the stored response without running
+    the handler; a retry arriving while the first is still running gets a 409, and
+    reusing a key with a different payload gets a 422. Failed requests release the key.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = frappe.get_request_header("Idempotency-Key")
+        if not key:
+            return fn(*args, **kwargs)
+
+        cache = frappe.cache()
+        cache_key = cache.make_key(f"{IDEMPOTENCY_KEY}{frappe.session.user}:{fn.__name__}:{key}")
+        fingerprint = _fingerprint(kwargs)
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+
+        if not cache.set(cache_key, pending, ex=PENDING_TTL, nx=True):
+            stored = cache.get(cache_key)
+            entry = json.loads(stored) if stored else None
+            if not entry:
+                frappe.throw(_("Request with this Idempotency-Key is being retried, try again."), IdempotencyConflictError)
+            if entry["fingerprint"] != fingerprint:
+                frappe.throw(_("Idempotency-Key was already used with a different payload."), IdempotencyKeyReusedError)
+            if entry["state"] != "done":
+                frappe.throw(_("Request with this Idempotency-Key is still in progress."), IdempotencyConflictError)
+            return entry["response"]
+
+        try:
+            response = fn(*args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        ttl = frappe.conf.get("abc_pos_idempotency_ttl") or DEFAULT_TTL
+        done = {"state": "done", "fingerprint": fingerprint, "response": response}
+        cache.set(cache_key, frappe.as_json(done, indent=None), ex=ttl)
+        return response
+
+    return wrapper
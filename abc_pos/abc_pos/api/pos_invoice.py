@@ -4,9 +4,16 @@ from frappe.exceptions import MandatoryError
 import pymysql.cursors
 import pymysql
 from frappe import _
+from frappe.utils import cint, get_datetime, now_datetime
+from frappe.utils.background_jobs import get_queues_timeout, is_job_enqueued
 import json
 from typing import Dict, TypedDict, List, Optional
+from ..repo.pos_invoice_repo import PosInvoiceItemRepository, get_item_upsert_engine
+from .idempotency import idempotent
+from .device_auth import get_device
+from . import print_spooler_uc, printing_uc, session_summary_uc
 
+invoice_item_repo = PosInvoiceItemRepository()
 
 
 class PaymentDict(TypedDict):
@@ -25,8 +32,79 @@ class InvoiceDict(TypedDict, total=False):
     payments: List[PaymentDict]
 
 
+class StaleInvoiceError(frappe.TimestampMismatchError):
+    http_status_code = 409
+
+
+INVOICE_TOTAL_FIELDS = (
+    "total_qty", "total", "net_total", "total_taxes_and_charges",
+    "discount_amount", "grand_total", "rounded_total", "paid_amount", "outstanding_amount",
+)
+
+
+def _invoice_summary(doc) -> Dict:
+    return {
+        "ok": True,
+        "invoice_id": doc.name,
+        "docstatus": doc.docstatus,
+        "modified": doc.modified,
+        "totals": {field: doc.get(field) for field in INVOICE_TOTAL_FIELDS},
+    }
+
+
 @frappe.whitelist(allow_guest=False, methods=["POST", "PUT"])
-def pos_invoice_upsert(invoice_id: str, invoice: Dict):
+@idempotent
+def pos_invoice_upsert(
+    invoice_id: str,
+    invoice: Dict,
+    slim: int = 0,
+    expected_modified: Optional[str] = None,
+    async_submit: int = 0,
+):
+    """
+    Create or update a POS Invoice header and its payments.
+
+    Args:
+        slim: When set, return only name, docstatus, modified and totals instead of the full document.
+        expected_modified: The `modified` the client last saw. If the invoice changed since,
+            the write is rejected with a 409 before the document is loaded or saved.
+        async_submit: When set, save a draft without validation and enqueue validation and
+            submit in the background; follow up with `pos_invoice_status` or the
+            `abc_pos_invoice_finalized` realtime event. The returned totals are then
+            marked `provisional`: taxes, rounding and defaults are only applied on
+            finalisation, which carries the validated totals.
+    """
+    doc = _apply_invoice(invoice_id, invoice, expected_modified, draft_only=cint(async_submit))
+
+    frappe.db.commit()
+
+    finalize_status = None
+    if cint(async_submit):
+        finalize_status = enqueue_invoice_finalize(doc.name)["status"]
+
+    if cint(slim):
+        response = _invoice_summary(doc)
+    else:
+        response = {
+            "ok": True,
+            "invoice_id": doc.name,
+            "docstatus": doc.docstatus,
+            "invoice": doc.as_dict(),
+        }
+    if finalize_status:
+        response["finalize_status"] = finalize_status
+        response["provisional"] = True
+    return response
+
+
+def _apply_invoice(
+    invoice_id: str, invoice: Dict, expected_modified: Optional[str] = None, draft_only: bool = False
+):
+    """
+    Load or create the invoice, apply header fields and payments, and save it.
+    With `draft_only`, validation is skipped; it runs when the invoice is finalised.
+    Does not commit; callers own the transaction.
+    """
     if not invoice or not isinstance(invoice, dict):
         frappe.throw("Invoice payload must be a dict")
 
@@ -35,7 +113,17 @@ def pos_invoice_upsert(invoice_id: str, invoice: Dict):
     # ----------------
     # 1. Load or create
     # ----------------
-    if frappe.db.exists("POS Invoice", invoice_id):
+    # Lock the row so the staleness check holds until commit
+    current_modified = frappe.db.get_value("POS Invoice", invoice_id, "modified", for_update=True)
+    if expected_modified and (
+        not current_modified or get_datetime(current_modified) != get_datetime(expected_modified)
+    ):
+        frappe.throw(
+            _("POS Invoice {0} was changed by someone else, reload it and try again.").format(invoice_id),
+            StaleInvoiceError,
+        )
+
+    if current_modified:
         doc = frappe.get_doc("POS Invoice", invoice_id)
         doc.update(invoice)
     else:
@@ -63,6 +151,9 @@ def pos_invoice_upsert(invoice_id: str, invoice: Dict):
     # ----------------
     # 3. Save (with retry if mandatory fields missing in items)
     # ----------------
+    if draft_only:
+        doc.flags.ignore_validate = True
+        doc.flags.ignore_mandatory = True
     try:
         doc.save()
     except MandatoryError as e:
@@ -80,14 +171,103 @@ def pos_invoice_upsert(invoice_id: str, invoice: Dict):
         else:
             raise
 
-    frappe.db.commit()
+    return doc
+
+
+FINALIZE_KEY = "abc_pos:invoice_finalize:"
+FINALIZE_STATUS_TTL = 24 * 60 * 60
+FINALIZE_TIMEOUT = 300
+FINALIZE_EVENT = "abc_pos_invoice_finalized"
+DEFAULT_FINALIZE_QUEUE = "abc_pos_finalize"
+
+
+def get_finalize_queue() -> str:
+    """
+    Queue for background invoice submits: site config `abc_pos_finalize_queue`,
+    else the dedicated "abc_pos_finalize" queue (see hooks.py). Sites that run
+    no worker for that queue fall back to "default".
+    """
+    queue = frappe.conf.get("abc_pos_finalize_queue") or DEFAULT_FINALIZE_QUEUE
+    return queue if queue in get_queues_timeout() else "default"
+
+
+def _finalize_job_id(invoice_id: str) -> str:
+    return f"abc_pos_finalize::{invoice_id}"
+
+
+def enqueue_invoice_finalize(invoice_id: str) -> Dict:
+    """
+    Queue validation and submit of a draft invoice, unless its job is already
+    queued or running. The stored status is only trusted while RQ still has
+    the job, so a worker that died mid-submit does not block a new attempt.
+    """
+    job_id = _finalize_job_id(invoice_id)
+    status = _get_finalize_status(invoice_id)
+    if status and status["status"] in ("queued", "running") and is_job_enqueued(job_id):
+        return status
+
+    status = _set_finalize_status(invoice_id, "queued")
+    frappe.enqueue(
+        "abc_pos.abc_pos.api.pos_invoice.finalize_invoice_job",
+        queue=get_finalize_queue(),
+        timeout=FINALIZE_TIMEOUT,
+        job_id=job_id,
+        deduplicate=True,
+        invoice_id=invoice_id,
+        user=frappe.session.user,
+    )
+    return status
+
+
+def finalize_invoice_job(invoice_id: str, user: str):
+    """Run the full validation and submit of a draft saved by `pos_invoice_upsert(async_submit=1)`."""
+    # Expires with the job timeout, so a crashed worker leaves no lasting "running" state
+    _set_finalize_status(invoice_id, "running", ttl=FINALIZE_TIMEOUT)
+    try:
+        doc = frappe.get_doc("POS Invoice", invoice_id)
+        if doc.docstatus == 0:
+            doc.submit()
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.clear_messages()
+        status = _set_finalize_status(invoice_id, "failed", error=str(e))
+        frappe.log_error(f"Finalising POS Invoice {invoice_id} failed: {e}", "POS Invoice Finalize")
+        frappe.publish_realtime(FINALIZE_EVENT, status, user=user)
+        return
+
+    status = _set_finalize_status(invoice_id, "submitted")
+    frappe.publish_realtime(FINALIZE_EVENT, dict(status, **_invoice_summary(doc)), user=user)
+
+
+@frappe.whitelist(allow_guest=False)
+def pos_invoice_status(invoice_id: str):
+    """
+    Finalisation state of an invoice: "queued", "running", "failed" (with error)
+    or "submitted", plus its current docstatus, modified and totals.
+    """
+    doc = frappe.get_doc("POS Invoice", invoice_id)
+    doc.check_permission("read")
+
+    status = _get_finalize_status(invoice_id) or {}
+    response = _invoice_summary(doc)
+    response["status"] = status.get("status") or ("submitted" if doc.docstatus == 1 else "draft")
+    response["error"] = status.get("error")
+    return response
+
+
+def _get_finalize_status(invoice_id: str) -> Optional[Dict]:
+    return frappe.cache().get_value(FINALIZE_KEY + invoice_id)
+
+
+def _set_finalize_status(
+    invoice_id: str, state: str, error: Optional[str] = None, ttl: int = FINALIZE_STATUS_TTL
+) -> Dict:
+    status = {"invoice_id": invoice_id, "status": state, "error": error}
+    frappe.cache().set_value(FINALIZE_KEY + invoice_id, status, expires_in_sec=ttl)
+    return status
+
 
-    return {
-        "ok": True,
-        "invoice_id": doc.name,
-        "docstatus": doc.docstatus,
-        "invoice": doc.as_dict(),
-    }
 @frappe.whitelist()
 def pos_invoice_item_void(item_row_id: str, cause: str):
     """
@@ -117,6 +297,7 @@ def pos_invoice_item_void(item_row_id: str, cause: str):
             "quanitity": item_row.qty,            # your Doctype field spelling
         })
         void_bin.insert(ignore_permissions=True)
+        session_summary_uc.record_voids([(item_row.parent, item_row.qty)])
 
         # --- Step 3: Delete the item row ---
         frappe.db.delete("POS Invoice Item", {"name": item_row_id})
@@ -145,10 +326,92 @@ def pos_invoice_item_void(item_row_id: str, cause: str):
 
 
 
+@frappe.whitelist(allow_guest=False, methods=["POST"])
+def pos_invoice_items_void(item_row_ids: list[str], cause: str):
+    """
+    Void several POS Invoice Items at once, e.g. a whole course or a cancelled table.
+
+    Rows are copied into POS Invoice Voide Bin with one INSERT ... SELECT and
+    removed with one DELETE, in a single transaction. The bin rows carry the same
+    fields as `pos_invoice_item_void` writes (invoice, item, quantity, cause,
+    created_by) plus the standard owner/creation/modified audit columns.
+    """
+    if isinstance(item_row_ids, str):
+        item_row_ids = json.loads(item_row_ids)
+    row_ids = tuple(dict.fromkeys(item_row_ids or []))
+    if not row_ids:
+        frappe.throw(_("No POS Invoice Items provided"))
+    if not cause:
+        frappe.throw(_("Cause is required"))
+
+    user = frappe.session.user
+    try:
+        # Lock the rows so they cannot change between the copy and the delete
+        rows = frappe.db.sql(
+            """
+            SELECT name, parent, item_code, qty
+            FROM `tabPOS Invoice Item`
+            WHERE name IN %(row_ids)s
+            FOR UPDATE
+            """,
+            {"row_ids": row_ids},
+            as_dict=True,
+        )
+        missing = set(row_ids) - {row.name for row in rows}
+        if missing:
+            frappe.throw(_("POS Invoice Items not found: {0}").format(", ".join(sorted(missing))))
+
+        frappe.db.sql(
+            """
+            INSERT INTO `tabPOS Invoice Voide Bin`
+                (name, pos_invoice, cause, created_by, item, quanitity,
+                 owner, modified_by, creation, modified, docstatus, idx)
+            SELECT
+                SUBSTRING(SHA2(CONCAT(UUID(), pii.name), 256), 1, 10),
+                pii.parent, %(cause)s, %(user)s, pii.item_code, TRUNCATE(pii.qty, 0),
+                %(user)s, %(user)s, %(now)s, %(now)s, 0, 0
+            FROM `tabPOS Invoice Item` pii
+            WHERE pii.name IN %(row_ids)s
+            """,
+            {"row_ids": row_ids, "cause": cause, "user": user, "now": now_datetime()},
+        )
+        frappe.db.sql("DELETE FROM `tabPOS Invoice Item` WHERE name IN %(row_ids)s", {"row_ids": row_ids})
+        session_summary_uc.record_voids([(row.parent, row.qty) for row in rows])
+
+        frappe.db.commit()
+
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(f"pos_invoice_items_void failed: {str(e)}", "POS Void Error")
+        raise
+
+    return {
+        "ok": True,
+        "count": len(rows),
+        "voided_items": [
+            {
+                "item_row_id": row.name,
+                "pos_invoice": row.parent,
+                "item_code": row.item_code,
+                "qty": row.qty,
+                "cause": cause,
+            }
+            for row in rows
+        ],
+    }
+
+
 @frappe.whitelist(allow_guest=False, methods=["POST", "PUT"])
-def pos_invoice_item_bulk_upsert(invoice_id: str,  items: list[dict]):
+@idempotent
+def pos_invoice_item_bulk_upsert(
+    invoice_id: str, items: list[dict], response_mode: str = "full", print_tickets: int = 0
+):
     """
-    API Endpoint: Bulk upsert POS Invoice Items into `tabPOS Invoice Item` using stored procedure.
+    API Endpoint: Bulk upsert POS Invoice Items into `tabPOS Invoice Item`.
+
+    The engine comes from site config `abc_pos_item_upsert_engine`: "procedure"
+    (default, stored procedure) or "executemany" (one defaults lookup and a
+    multi-row INSERT ... ON DUPLICATE KEY UPDATE from Python). Both give the same rows.
 
     Args:
         invoice_id (str): Target POS Invoice ID (parent).
@@ -162,15 +425,23 @@ def pos_invoice_item_bulk_upsert(invoice_id: str,  items: list[dict]):
             - amount (optional, float)
             - folio_window (optional, str)
             - description (optional, str)
+        response_mode (str): "full" (default) returns every item of the invoice,
+            "affected" returns only the rows inserted or updated by this call.
+        print_tickets (int): 1 to queue kitchen tickets for the written rows on the
+            preparation printers of the X-Device-Id device. Jobs only go to the Redis
+            print journal here; Print Job rows are written later in batches.
 
     Returns:
         dict: {
             "ok": True,
             "invoice_id": str,
-            "count": int,
-            "total_amount": float,
+            "count": int,            # items on the invoice
+            "affected_count": int,   # distinct rows written by this call
+            "total_amount": float,   # invoice totals, computed in SQL
             "total_qty": float,
-            "items": list[dict]
+            "items": list[dict],
+            "print_jobs": list[dict],  # only with print_tickets
+            "print_error": str         # only when tickets could not be queued; the items are saved
         }
     """
     user = frappe.session.user
@@ -178,47 +449,39 @@ def pos_invoice_item_bulk_upsert(invoice_id: str,  items: list[dict]):
     if not items:
         frappe.throw("No items provided")
 
-    # Validate required fields
-    for i, item in enumerate(items):
-        if not item.get("item_code"):
-            frappe.throw(f"Item {i+1}: item_code is required")
-        if not item.get("qty") and item.get("qty") != 0:
-            frappe.throw(f"Item {i+1}: qty is required")
+    _validate_items(items)
 
-    # Convert items list to JSON object format expected by stored procedure
-    json_data = {
-        "names":         [i.get("name", "") for i in items],
-        "item_codes":    [i.get("item_code", "") for i in items],
-        "item_names":    [i.get("item_name", "") for i in items],
-        "descriptions":  [i.get("description", "") for i in items],
-        "uoms":          [i.get("uom", "") for i in items],
-        "qtys":          [float(i.get("qty", 0)) for i in items],
-        "rates":         [float(i.get("rate", 0)) for i in items],
-        "amounts":       [float(i.get("amount", 0)) for i in items],
-        "folio_windows": [i.get("folio_window", "") for i in items],
-    }
+    if response_mode not in ("full", "affected"):
+        frappe.throw(f"Unknown response_mode '{response_mode}', expected 'full' or 'affected'")
+
+    print_tickets = cint(print_tickets)
+    device = frappe.get_request_header("X-Device-Id") if print_tickets else None
+    if print_tickets and not (device and get_device(device)):
+        frappe.throw(_("print_tickets needs a valid X-Device-Id header."), frappe.PermissionError)
+
+    engine = get_item_upsert_engine()
     try:
         # Use direct connection approach for stored procedures
         conn = frappe.db.get_connection()
         cur = conn.cursor(pymysql.cursors.DictCursor)
 
-        query = "CALL pos_invoice_item_bulk_upsert(%s,%s,%s)"
-        cur.execute(query, (invoice_id, user, json.dumps(json_data)))
-        result = cur.fetchall()
+        # List the written rows first (for affected_count and printing), the full invoice after
+        affected = invoice_item_repo.bulk_upsert(cur, engine, invoice_id, user, items, full_listing=False)
+        result = affected
+        if response_mode == "full":
+            result = invoice_item_repo.invoice_items(cur, invoice_id)
+        totals = invoice_item_repo.invoice_item_totals(cur, invoice_id)
         cur.close()
 
-        # Calculate totals from returned data
-        total_amount = sum(float(row.get('base_amount', 0)) for row in result)
-        total_qty = sum(float(row.get('qty', 0)) for row in result)
-
         conn.commit()
 
-        return {
+        response = {
             "ok": True,
             "invoice_id": invoice_id,
-            "count": len(result),
-            "total_amount": total_amount,
-            "total_qty": total_qty,
+            "count": totals["count"],
+            "affected_count": len(affected),
+            "total_amount": float(totals["total_amount"]),
+            "total_qty": float(totals["total_qty"]),
             "items": result
         }
 
@@ -232,5 +495,176 @@ def pos_invoice_item_bulk_upsert(invoice_id: str,  items: list[dict]):
                 pass
 
         error_msg = str(e)
-        frappe.log_error(f"Failed bulk upsert for invoice {invoice_id}: {error_msg}\nJSON Data: {json_data}", "POS Invoice Bulk Upsert")
+        frappe.log_error(f"Failed bulk upsert ({engine}) for invoice {invoice_id}: {error_msg}\nItems: {items}", "POS Invoice Bulk Upsert")
         frappe.throw(f"Error adding invoice items: {error_msg}")
+
+    # The items are committed from here on: a printing problem must not report the write as failed
+    if print_tickets:
+        try:
+            # End frappe.db's snapshot so routing sees the rows committed above
+            frappe.db.commit()
+            routed = printing_uc.route_kitchen_tickets(invoice_id, device, [row["name"] for row in affected])
+            response["print_jobs"] = print_spooler_uc.queue_jobs(routed)
+        except Exception as e:
+            frappe.clear_messages()
+            frappe.log_error(f"Queueing kitchen tickets for invoice {invoice_id} failed: {e}", "POS Kitchen Tickets")
+            response["print_jobs"] = []
+            response["print_error"] = str(e)
+    return response
+
+
+def _validate_items(items: List[Dict]):
+    for i, item in enumerate(items):
+        if not item.get("item_code"):
+            frappe.throw(f"Item {i+1}: item_code is required")
+        if not item.get("qty") and item.get("qty") != 0:
+            frappe.throw(f"Item {i+1}: qty is required")
+
+
+BATCH_SYNC_KEY = "abc_pos:batch_sync:"
+BATCH_SYNC_STATUS_TTL = 24 * 60 * 60
+DEFAULT_BATCH_CHUNK_SIZE = 25
+DEFAULT_BATCH_INLINE_LIMIT = 20
+
+
+@frappe.whitelist(allow_guest=False, methods=["POST"])
+@idempotent
+def pos_invoice_batch_sync(invoices: list[dict], chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE, background: int = 0):
+    """
+    Replay invoices captured offline in one call.
+
+    Each entry is {"invoice_id", "invoice" (header and payments as for
+    `pos_invoice_upsert`), "items" (as for `pos_invoice_item_bulk_upsert`),
+    "expected_modified" (optional)}. Invoices are written in chunks of
+    `chunk_size`, one commit per chunk; a failing invoice is rolled back to its
+    savepoint and reported without affecting the rest. Item defaults are looked
+    up once for the whole batch.
+
+    Batches larger than `abc_pos_batch_sync_inline_limit` (site config, default 20),
+    or any batch with `background` set, run on the long queue; poll
+    `pos_invoice_batch_sync_status` with the returned job_id.
+
+    Returns:
+        dict: {"ok", "job_id", "status", "total", "processed", "results": [
+            {"invoice_id", "ok", "docstatus", "modified", "item_count", "error"}
+        ]} — results are empty while a background job is queued.
+    """
+    if isinstance(invoices, str):
+        invoices = json.loads(invoices)
+    if not invoices or not isinstance(invoices, list):
+        frappe.throw("No invoices provided")
+    for i, entry in enumerate(invoices):
+        if not isinstance(entry, dict) or not entry.get("invoice_id"):
+            frappe.throw(f"Invoice {i+1}: invoice_id is required")
+
+    chunk_size = cint(chunk_size) if cint(chunk_size) > 0 else DEFAULT_BATCH_CHUNK_SIZE
+    inline_limit = cint(frappe.conf.get("abc_pos_batch_sync_inline_limit")) or DEFAULT_BATCH_INLINE_LIMIT
+    job_id = frappe.generate_hash(length=16)
+
+    if not cint(background) and len(invoices) <= inline_limit:
+        return _run_batch_sync(job_id, invoices, chunk_size)
+
+    _set_batch_status(job_id, {"status": "queued", "total": len(invoices), "processed": 0, "results": []})
+    frappe.enqueue(
+        "abc_pos.abc_pos.api.pos_invoice.run_batch_sync_job",
+        queue="long",
+        job_id=f"abc_pos_batch_sync::{job_id}",
+        batch_job_id=job_id,
+        invoices=invoices,
+        chunk_size=chunk_size,
+    )
+    return _batch_response(job_id, _get_batch_status(job_id))
+
+
+@frappe.whitelist(allow_guest=False)
+def pos_invoice_batch_sync_status(job_id: str):
+    """Progress and per-invoice results of a `pos_invoice_batch_sync` call."""
+    status = _get_batch_status(job_id)
+    if not status or status.get("user") != frappe.session.user:
+        frappe.throw(_("Batch sync job {0} not found").format(job_id), frappe.DoesNotExistError)
+    return _batch_response(job_id, status)
+
+
+def run_batch_sync_job(batch_job_id: str, invoices: List[Dict], chunk_size: int):
+    try:
+        _run_batch_sync(batch_job_id, invoices, chunk_size)
+    except Exception:
+        frappe.db.rollback()
+        status = _get_batch_status(batch_job_id) or {}
+        status["status"] = "failed"
+        _set_batch_status(batch_job_id, status)
+        frappe.log_error(f"Batch sync {batch_job_id} failed", "POS Invoice Batch Sync")
+        raise
+
+
+def _run_batch_sync(job_id: str, invoices: List[Dict], chunk_size: int) -> Dict:
+    user = frappe.session.user
+    status = {"status": "running", "total": len(invoices), "processed": 0, "results": []}
+    _set_batch_status(job_id, status)
+
+    # Items are written on frappe's own connection so they share each chunk's transaction
+    cur = frappe.db._conn.cursor(pymysql.cursors.DictCursor)
+    try:
+        defaults = invoice_item_repo.item_defaults(
+            cur, [item.get("item_code") for entry in invoices for item in entry.get("items") or []]
+        )
+        for start in range(0, len(invoices), chunk_size):
+            for entry in invoices[start:start + chunk_size]:
+                status["results"].append(_sync_one_invoice(cur, entry, user, defaults))
+            frappe.db.commit()
+            status["processed"] = len(status["results"])
+            _set_batch_status(job_id, status)
+    finally:
+        cur.close()
+
+    status["status"] = "finished"
+    _set_batch_status(job_id, status)
+    return _batch_response(job_id, status)
+
+
+def _sync_one_invoice(cur, entry: Dict, user: str, defaults: Dict[str, Dict]) -> Dict:
+    invoice_id = entry["invoice_id"]
+    items = entry.get("items") or []
+    save_point = f"abc_pos_sync_{frappe.generate_hash(length=8)}"
+    frappe.db.savepoint(save_point)
+    try:
+        if items:
+            _validate_items(items)
+        doc = _apply_invoice(invoice_id, dict(entry.get("invoice") or {}), entry.get("expected_modified"))
+        if items:
+            invoice_item_repo.bulk_upsert_executemany(
+                cur, invoice_id, user, items, full_listing=False, defaults=defaults
+            )
+        item_count = invoice_item_repo.invoice_item_totals(cur, invoice_id)["count"]
+    except Exception as e:
+        frappe.db.rollback(save_point=save_point)
+        frappe.clear_messages()
+        return {
+            "invoice_id": invoice_id, "ok": False, "docstatus": None,
+            "modified": None, "item_count": 0, "error": str(e),
+        }
+    frappe.db.release_savepoint(save_point)
+    return {
+        "invoice_id": doc.name, "ok": True, "docstatus": doc.docstatus,
+        "modified": doc.modified, "item_count": item_count, "error": None,
+    }
+
+
+def _batch_response(job_id: str, status: Dict) -> Dict:
+    return {
+        "ok": status["status"] != "failed",
+        "job_id": job_id,
+        "status": status["status"],
+        "total": status["total"],
+        "processed": status["processed"],
+        "results": status["results"],
+    }
+
+
+def _get_batch_status(job_id: str) -> Optional[Dict]:
+    return frappe.cache().get_value(BATCH_SYNC_KEY + job_id)
+
+
+def _set_batch_status(job_id: str, status: Dict):
+    status.setdefault("user", frappe.session.user)
+    frappe.cache().set_value(BATCH_SYNC_KEY + job_id, status, expires_in_sec=BATCH_SYNC_STATUS_TTL)
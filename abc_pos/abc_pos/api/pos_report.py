@@ -0,0 +1,21 @@
+import json
+import frappe
+from typing import List, Optional, Union
+from . import report_uc
+
+
+@frappe.whitelist()
+def pos_x_report(session_id: str, sections: Optional[Union[str, List[str]]] = None):
+    """
+    Mid-shift report of a session grouped by item, item_group, print_class and
+    mode_of_payment, or only the `sections` requested.
+    """
+    if isinstance(sections, str):
+        sections = json.loads(sections) if sections.startswith("[") else [sections]
+    return {"success": True, "report": report_uc.x_report(session_id, sections)}
+
+
+@frappe.whitelist()
+def pos_z_report(session_id: str):
+    """End-of-day report of a closed session, cached once built."""
+    return {"success": True, "report": report_uc.z_report(session_id)}
@@ -1,7 +1,15 @@
 
+import base64
+import json
 import frappe
 from frappe import _
+from frappe.utils import cint, flt
+from typing import List, Optional, Union
 from ..repo.pos_session_repo import PosSessionRepository
+from . import session_summary_uc, session_uc
+
+session_repo = PosSessionRepository()
+CLOSING_SUBMIT_TIMEOUT = 1500
 
 
 
@@ -39,16 +47,7 @@ def currency_list():
 
 @frappe.whitelist()
 def session_find_active():
-    repo = PosSessionRepository()
-    filters = {
-        "session_status": "Open",
-        "created_by": frappe.session.user,
-    }
-
-    session = repo.session_find_active(filters)
-    if not session:
-        return None
-    return session
+    return session_uc.get_active(frappe.session.user)
 
 
 @frappe.whitelist(allow_guest=False)
@@ -82,7 +81,7 @@ def session_open(pos_profile, company=None, opening_cash=0.0):
         "balance_details",
         {
             "mode_of_payment": "Cash",  # or get from pos_profile default
-            "amount": opening_cash,
+            "opening_amount": opening_cash,
         },
     )
 
@@ -97,6 +96,14 @@ def session_open(pos_profile, company=None, opening_cash=0.0):
     session.session_status = "Open"
     session.insert()
 
+    session_uc.set_active(user, {
+        "name": session.name,
+        "pos_profile": session.pos_profile,
+        "session_status": session.session_status,
+        "opening_entry": session.opening_entry,
+        "closing_entry": session.closing_entry,
+    })
+
     return {
         "success": True,
         "session": session.name,
@@ -105,12 +112,30 @@ def session_open(pos_profile, company=None, opening_cash=0.0):
 
 
 @frappe.whitelist(allow_guest=False)
-def sesison_close(session_name, closing_cash=0.0):
+def sesison_close(session_name, closing_cash=0.0, closing_amounts=None):
+    """
+    Close a session with what the cashier counted: `closing_cash` for the cash
+    drawer, or `closing_amounts` as {mode_of_payment: counted amount}. Counted
+    amounts are reconciled against opening balance plus session takings, so
+    shortages and overages show in the closing entry.
+
+    The closing entry is saved as a draft and submitted by a background job
+    after this request commits, since its submit consolidates every invoice of
+    the session. `closing_status` is "queued" until the entry is submitted.
+    """
     session = frappe.get_doc("POS Session", session_name)
 
     if session.session_status != "Open":
         frappe.throw(_("Session is not open."))
 
+    if isinstance(closing_amounts, str):
+        closing_amounts = json.loads(closing_amounts)
+    counted = {mode: flt(amount) for mode, amount in (closing_amounts or {}).items()}
+
+    # Totals come from the running session summary instead of walking every invoice
+    summary = session_summary_uc.summary(session.name)
+    opening = session_repo.opening_balances(session.opening_entry)
+
     # Create POS Closing Entry
     closing_entry = frappe.new_doc("POS Closing Entry")
     closing_entry.pos_opening_entry = session.opening_entry
@@ -119,47 +144,135 @@ def sesison_close(session_name, closing_cash=0.0):
     closing_entry.company = frappe.defaults.get_user_default("Company")
     closing_entry.closing_amount = closing_cash
     closing_entry.posting_date = frappe.utils.nowdate()
+    closing_entry.grand_total = summary.grand_total
+    closing_entry.total_quantity = summary.item_qty
+    for row in session_summary_uc.closing_reconciliation(summary, opening, counted, closing_cash):
+        closing_entry.append("payment_reconciliation", row)
     closing_entry.insert()
-    closing_entry.submit()
 
     # Mark session as closed
     session.closing_entry = closing_entry.name
     session.session_status = "Closed"
     session.save()
 
+    session_uc.evict(session.created_by)
+
+    frappe.enqueue(
+        "abc_pos.abc_pos.api.pos_session.submit_closing_entry_job",
+        queue="long",
+        timeout=CLOSING_SUBMIT_TIMEOUT,
+        job_id=f"abc_pos_closing::{closing_entry.name}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        closing_entry=closing_entry.name,
+    )
+
     return {
         "success": True,
         "session": session.name,
         "closing_entry": closing_entry.name,
+        "closing_status": "queued",
+        "summary": summary,
     }
 
 
+def submit_closing_entry_job(closing_entry: str):
+    """Submit a POS Closing Entry drafted by `sesison_close`, consolidating the session's invoices."""
+    try:
+        doc = frappe.get_doc("POS Closing Entry", closing_entry)
+        if doc.docstatus == 0:
+            doc.submit()
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.clear_messages()
+        frappe.log_error(f"Submitting POS Closing Entry {closing_entry} failed: {e}", "POS Closing Entry Submit")
+
+
 @frappe.whitelist()
-def session_invoice_list(session_id: str):
+def session_x_report(session_id: str):
+    """Mid-shift totals of a session, read from its running POS Session Summary."""
+    _validate_session(session_id)
+    return {"success": True, "summary": session_summary_uc.summary(session_id)}
+
+
+SESSION_INVOICE_PAGE_SIZE = 100
+SESSION_INVOICE_MAX_PAGE_SIZE = 500
+
+
+@frappe.whitelist()
+def session_invoice_list(
+    session_id: str,
+    status: Optional[Union[str, List[str]]] = None,
+    table_number: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = SESSION_INVOICE_PAGE_SIZE,
+):
+    """
+    Invoices of a session, newest first, one page at a time.
+
+    Pass the returned `next_cursor` back as `cursor` to get the next page;
+    it is None on the last page. `status` takes one status or a list.
+    Totals for the whole session come from `session_invoice_summary`.
+    """
+    _validate_session(session_id)
+    limit = max(1, min(cint(limit) or SESSION_INVOICE_PAGE_SIZE, SESSION_INVOICE_MAX_PAGE_SIZE))
+
+    # Fetch one extra row to know whether another page exists
+    invoices = session_repo.session_invoices(
+        session_id, _statuses(status), table_number, after=_decode_cursor(cursor), limit=limit + 1
+    )
+    next_cursor = None
+    if len(invoices) > limit:
+        invoices = invoices[:limit]
+        next_cursor = _encode_cursor(invoices[-1])
+
+    return {"success": True, "count": len(invoices), "orders": invoices, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def session_invoice_summary(
+    session_id: str, status: Optional[Union[str, List[str]]] = None, table_number: Optional[str] = None
+):
+    """
+    Invoice count, grand_total, paid_amount and outstanding per status for a
+    session, with the same filters as `session_invoice_list`, plus overall totals.
+    """
+    _validate_session(session_id)
+    by_status = session_repo.session_invoice_summary(session_id, _statuses(status), table_number)
+    totals = {
+        field: sum(row[field] for row in by_status)
+        for field in ("count", "grand_total", "paid_amount", "outstanding")
+    }
+    return {"success": True, "by_status": by_status, "totals": totals}
+
+
+def _validate_session(session_id: str):
     if not session_id:
         frappe.throw(_("POS Session ID is required."))
 
     if not frappe.db.exists("POS Session", session_id):
         frappe.throw(_("POS Session {0} not found.").format(session_id))
 
-    # ✅ Fetch invoices linked to this session
-    invoices = frappe.get_all(
-        "POS Invoice",
-        filters={"pos_session": session_id},
-        fields=[
-            "name",
-            "customer",
-            "grand_total",
-            "paid_amount",
-            "status",
-            "table_number",
-            "room_number",
-            "posting_date",
-            "creation",
-        ],
-        order_by="creation desc",
-    )
 
-    return {"success": True, "count": len(invoices), "orders": invoices}
+def _statuses(status) -> Optional[List[str]]:
+    if not status:
+        return None
+    if isinstance(status, str):
+        status = json.loads(status) if status.startswith("[") else [status]
+    return list(status)
+
 
+def _encode_cursor(row) -> str:
+    payload = json.dumps([str(row.creation), row.name])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
 
+
+def _decode_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        creation, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        frappe.throw(_("Invalid cursor"))
+    return creation, name
@@ -1,8 +1,74 @@
+import json
 import frappe
 from typing import List, Optional
+from .device_auth import device_protected, get_device
 from ..repo.printing_repo import CashierDevicePrintersMap
-from . import printing_uc
+from .http_cache import etag_matches, not_modified, set_etag
+from . import print_spooler_uc, printer_health_uc, printing_uc
 
 @frappe.whitelist(allow_guest=True, methods=["GET"])
 def get_cashier_printers_map(cashier_device_name: Optional[str] = None) -> List[CashierDevicePrintersMap]:
-    return printing_uc.get_cashier_printers_cache(cashier_device_name)
+    """
+    Printer map of a cashier device, served from the printer map cache.
+    Clients sending the ETag back in If-None-Match get a 304 until a printer,
+    production area or device changes. Unknown or disabled devices get [] and
+    are neither queried for a map nor cached.
+    """
+    if cashier_device_name and not get_device(cashier_device_name):
+        return []
+
+    entry = printing_uc.get_cashier_printers_entry(cashier_device_name)
+    if etag_matches(entry["version"]):
+        return not_modified(entry["version"])
+
+    set_etag(entry["version"])
+    return entry["value"]
+
+
+@frappe.whitelist(methods=["POST"])
+@device_protected
+def route_kitchen_tickets(invoice_id: str, item_row_ids: Optional[List[str]] = None):
+    """
+    Print jobs for an invoice on the calling device's preparation printers,
+    one per printer. Pass `item_row_ids` to print only newly added lines.
+    """
+    if isinstance(item_row_ids, str):
+        item_row_ids = json.loads(item_row_ids)
+    return printing_uc.route_kitchen_tickets(invoice_id, frappe.local.device, item_row_ids)
+
+
+@frappe.whitelist(methods=["POST"])
+@device_protected
+def print_kitchen_tickets(invoice_id: str, item_row_ids: Optional[List[str]] = None):
+    """
+    Route an invoice's lines (or only `item_row_ids`) to the device's preparation
+    printers and queue one Print Job per printer. Returns immediately; poll
+    `print_job_status` with the returned job names. Repeating the call for the
+    same lines never prints twice, but resends jobs that ended as Failed.
+    """
+    if isinstance(item_row_ids, str):
+        item_row_ids = json.loads(item_row_ids)
+    routed = printing_uc.route_kitchen_tickets(invoice_id, frappe.local.device, item_row_ids)
+    return {
+        "invoice": invoice_id,
+        "jobs": print_spooler_uc.queue_jobs(routed, retry_failed=True),
+        "unrouted": routed["unrouted"],
+    }
+
+
+@frappe.whitelist()
+def print_job_status(job_names: List[str]):
+    """Status, printer used, attempts and last error of each Print Job."""
+    if isinstance(job_names, str):
+        job_names = json.loads(job_names)
+    return print_spooler_uc.statuses(job_names)
+
+
+@frappe.whitelist()
+def printer_status():
+    """
+    Circuit state of every Preparation Printer for the manager screen:
+    closed (healthy), open (skipped in favour of its fallback) or half_open
+    (being retried), with consecutive failures and the last error.
+    """
+    return printer_health_uc.status()
@@ -0,0 +1,44 @@
+import time
+import frappe
+from frappe import _
+
+THROTTLE_KEY = "abc_pos:throttle:"
+
+# Token bucket kept in one Redis hash so concurrent workers share it atomically
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_sec = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_sec)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_per_sec) + 1)
+return allowed
+"""
+
+
+class ThrottledError(frappe.ValidationError):
+    http_status_code = 429
+
+
+def take_token(bucket: str, capacity: int, refill_per_sec: float) -> bool:
+    """Take one token from `bucket`; False when it is empty."""
+    cache = frappe.cache()
+    key = cache.make_key(THROTTLE_KEY + bucket)
+    return bool(cache.eval(TOKEN_BUCKET_LUA, 1, key, capacity, refill_per_sec, time.time()))
+
+
+def throttle(bucket: str, capacity: int, refill_per_sec: float):
+    if not take_token(bucket, capacity, refill_per_sec):
+        frappe.throw(_("Too many attempts, try again shortly."), ThrottledError)
+
+
+def reset(bucket: str):
+    frappe.cache().delete_value(THROTTLE_KEY + bucket)
@@ -0,0 +1,8 @@
+// Copyright (c) 2025, darwishde and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("POS Catalog Tombstone", {
+// 	refresh(frm) {
+
+// 	},
+// });
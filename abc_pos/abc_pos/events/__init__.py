@@ -0,0 +1,10 @@
+import frappe
+from functools import partial
+
+
+def after_commit(fn, *args):
+    """
+    Run `fn(*args)` once the current transaction commits. Evicting a cache
+    before that lets a concurrent request refill it from the old committed row.
+    """
+    frappe.db.after_commit.add(partial(fn, *args))
@@ -0,0 +1,12 @@
+from ..api.device_auth import device_registry
+from . import after_commit
+
+
+def invalidate_device(doc, method=None):
+    """doc_events handler for Cashier Device: drop the cached registry entry."""
+    after_commit(device_registry.invalidate, doc.name)
+
+
+def invalidate_renamed_device(doc, method=None, old=None, new=None, merge=False):
+    after_commit(device_registry.invalidate, old)
+    after_commit(device_registry.invalidate, new)
@@ -0,0 +1,62 @@
+from ..api import catalog_uc
+from . import after_commit
+
+
+def invalidate_catalog(doc, method=None, *args):
+    """
+    doc_events handler for Item, Item Group, Item Price and POS Profile.
+    An item or group can appear in several profiles, so every snapshot is dropped;
+    a POS Profile change only drops its own snapshot.
+    """
+    if doc.doctype == "POS Profile":
+        after_commit(catalog_uc.invalidate, doc.name)
+    else:
+        after_commit(catalog_uc.invalidate)
+
+
+def record_item_tombstone(doc, method=None):
+    """
+    Record Item deletions, disables and group moves so delta syncs can remove them.
+    """
+    if method == "on_trash":
+        catalog_uc.record_tombstone("Item", doc.name, "Deleted", doc.item_group)
+        return
+
+    previous = doc.get_doc_before_save()
+    if not previous:
+        return
+    if doc.disabled and not previous.disabled:
+        catalog_uc.record_tombstone("Item", doc.name, "Disabled", doc.item_group)
+    elif doc.item_group != previous.item_group:
+        catalog_uc.record_tombstone("Item", doc.name, "Moved", previous.item_group)
+
+
+def record_item_group_tombstone(doc, method=None):
+    if method == "on_trash":
+        catalog_uc.record_tombstone("Item Group", doc.name, "Deleted", doc.parent_item_group)
+        return
+
+    previous = doc.get_doc_before_save()
+    if previous and doc.parent_item_group != previous.parent_item_group:
+        catalog_uc.record_tombstone("Item Group", doc.name, "Moved", previous.parent_item_group)
+
+
+def record_item_price_tombstone(doc, method=None):
+    """
+    A deleted price leaves nothing for the delta query to find, so record it;
+    the next delta re-sends the item with the price it falls back to.
+    """
+    catalog_uc.record_tombstone("Item Price", doc.item_code, "Deleted")
+
+
+def record_renamed_item_tombstone(doc, method=None, old=None, new=None, merge=False):
+    """after_rename handler for Item: tablets drop the old code and receive the new one."""
+    catalog_uc.record_rename("Item", old, new, doc.item_group)
+
+
+def record_renamed_item_group_tombstone(doc, method=None, old=None, new=None, merge=False):
+    catalog_uc.record_rename("Item Group", old, new, doc.parent_item_group)
+
+
+def purge_catalog_tombstones():
+    catalog_uc.purge_tombstones()
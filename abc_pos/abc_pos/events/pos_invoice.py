@@ -0,0 +1,20 @@
+from ..api import report_uc, session_summary_uc
+from . import after_commit
+
+
+def add_to_session_summary(doc, method=None):
+    """doc_events handler for POS Invoice on_submit."""
+    session_summary_uc.apply_invoice(doc, 1)
+
+
+def remove_from_session_summary(doc, method=None):
+    """doc_events handler for POS Invoice on_cancel."""
+    session_summary_uc.apply_invoice(doc, -1)
+    # A cancellation after close changes the session's final report
+    if doc.get("pos_session"):
+        after_commit(report_uc.invalidate_z_report, doc.pos_session)
+
+
+def reconcile_session_summaries():
+    """Scheduled check of open and recently closed session summaries against the raw tables."""
+    session_summary_uc.reconcile_recent()
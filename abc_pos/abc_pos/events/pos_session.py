@@ -0,0 +1,14 @@
+from ..api import session_uc
+from . import after_commit
+
+
+def evict_active_session(doc, method=None):
+    """
+    doc_events handler for POS Session: drop the cached active session of its
+    user, covering changes made outside `session_open` / `sesison_close`.
+    """
+    if doc.created_by:
+        after_commit(session_uc.evict, doc.created_by)
+    previous = doc.get_doc_before_save()
+    if previous and previous.created_by and previous.created_by != doc.created_by:
+        after_commit(session_uc.evict, previous.created_by)
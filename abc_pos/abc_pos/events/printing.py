@@ -0,0 +1,22 @@
+from ..api import print_spooler_uc, printer_health_uc, printing_uc
+from . import after_commit
+
+
+def invalidate_printer_maps(doc, method=None, *args):
+    """doc_events handler for Preparation Printer, Production Area and Cashier Device."""
+    after_commit(printing_uc.invalidate_printer_maps)
+
+
+def process_print_queue():
+    """Background job started when Print Jobs are queued."""
+    print_spooler_uc.process()
+
+
+def sweep_print_queue():
+    """Scheduled every minute: requeue stuck jobs and deliver anything left queued."""
+    print_spooler_uc.sweep()
+
+
+def probe_printers():
+    """Scheduled every minute: update printer circuits from a TCP probe."""
+    printer_health_uc.probe_all()
@@ -0,0 +1,21 @@
+from ..api.auth import evict_bootstrap, evict_cashier_token, evict_currencies
+from . import after_commit
+
+
+def evict_user_caches(doc, method=None):
+    """
+    doc_events handler for User: credentials, profile or roles may have changed,
+    drop the cached login token and bootstrap.
+    """
+    after_commit(evict_cashier_token, doc.name)
+    after_commit(evict_bootstrap, doc.name)
+
+
+def evict_all_bootstraps(doc, method=None):
+    """doc_events handler for System Settings: time zone and defaults are in every bootstrap."""
+    after_commit(evict_bootstrap)
+
+
+def evict_currency_list(doc, method=None):
+    """doc_events handler for Currency Exchange."""
+    after_commit(evict_currencies)
@@ -0,0 +1,99 @@
+import frappe
+from typing import Dict, List, Optional
+from frappe.utils import now_datetime
+
+
+class CatalogRepository:
+    def pos_profile_catalog_rows(self, pos_profile: str) -> List[Dict]:
+        try:
+            return frappe.db.sql(
+                """
+                SELECT
+                    pos_profile,
+                    item_group_id,
+                    item_group_name,
+                    parent_group,
+                    item_code,
+                    item_name,
+                    description,
+                    stock_uom,
+                    standard_rate,
+                    disabled
+                FROM v_pos_profile_catalog
+                WHERE pos_profile = %s
+                ORDER BY item_group_name, item_code
+                """,
+                (pos_profile,),
+                as_dict=True,
+            )
+        except Exception as e:
+            frappe.log_error(f"Error fetching catalog rows for POS Profile {pos_profile}: {str(e)}")
+            raise
+
+    def items_changed_since(self, group_ids: List[str], since) -> List[Dict]:
+        """
+        Enabled items in the given groups whose Item or Item Price changed at or
+        after `since`, or that lost an Item Price since then.
+        """
+        if not group_ids:
+            return []
+        try:
+            return frappe.db.sql(
+                """
+                SELECT
+                    i.name AS item_code,
+                    i.item_name,
+                    i.description,
+                    i.item_group,
+                    i.stock_uom,
+                    i.standard_rate,
+                    i.disabled
+                FROM `tabItem` i
+                WHERE i.item_group IN %(groups)s
+                  AND i.disabled = 0
+                  AND (
+                    i.modified >= %(since)s
+                    OR EXISTS (
+                        SELECT 1 FROM `tabItem Price` ip
+                        WHERE ip.item_code = i.name AND ip.modified >= %(since)s
+                    )
+                    OR EXISTS (
+                        SELECT 1 FROM `tabPOS Catalog Tombstone` t
+                        WHERE t.ref_doctype = 'Item Price' AND t.ref_name = i.name AND t.creation >= %(since)s
+                    )
+                  )
+                ORDER BY i.item_group, i.name
+                """,
+                {"groups": tuple(group_ids), "since": since},
+                as_dict=True,
+            )
+        except Exception as e:
+            frappe.log_error(f"Error fetching catalog item changes: {str(e)}")
+            raise
+
+    def tombstones_since(self, since) -> List[Dict]:
+        try:
+            return frappe.db.get_all(
+                "POS Catalog Tombstone",
+                filters={"creation": [">=", since]},
+                fields=["ref_doctype", "ref_name", "reason", "item_group", "creation"],
+                order_by="creation asc",
+            )
+        except Exception as e:
+            frappe.log_error(f"Error fetching catalog tombstones: {str(e)}")
+            raise
+
+    def add_tombstone(self, ref_doctype: str, ref_name: str, reason: str, item_group: Optional[str] = None) -> None:
+        frappe.get_doc({
+            "doctype": "POS Catalog Tombstone",
+            "ref_doctype": ref_doctype,
+            "ref_name": ref_name,
+            "reason": reason,
+            "item_group": item_group,
+        }).insert(ignore_permissions=True)
+
+    def touch(self, doctype: str, name: str) -> None:
+        frappe.db.set_value(doctype, name, "modified", now_datetime(), update_modified=False)
+
+    def purge_tombstones(self, before) -> None:
+        frappe.db.delete("POS Catalog Tombstone", {"creation": ["<", before]})
@@ -0,0 +1,127 @@
+import frappe
+from typing import Dict, List
+
+
+class ItemGroupRepository:
+    def load_subtree_groups(self, root_group_ids: List[str]) -> List[Dict]:
+        """
+        Load the root groups and every descendant in one query using the
+        `lft`/`rgt` nested-set columns of Item Group, in tree order.
+        """
+        if not root_group_ids:
+            return []
+        try:
+            return frappe.db.sql(
+                """
+                SELECT DISTINCT
+                    child.name,
+                    child.item_group_name,
+                    child.parent_item_group,
+                    child.is_group,
+                    child.lft,
+                    child.rgt,
+                    child.modified
+                FROM `tabItem Group` root
+                JOIN `tabItem Group` child
+                    ON child.lft >= root.lft AND child.rgt <= root.rgt
+                WHERE root.name IN %(roots)s
+                ORDER BY child.lft
+                """,
+                {"roots": tuple(root_group_ids)},
+                as_dict=True,
+            )
+        except Exception as e:
+            frappe.log_error(f"Error loading item group subtree: {str(e)}")
+            raise
+
+    def load_items_for_groups(self, group_ids: List[str]) -> List[Dict]:
+        if not group_ids:
+            return []
+        try:
+            return frappe.db.get_all(
+                "Item",
+                filters={
+                    "item_group": ["in", group_ids],
+                    "disabled": 0
+                },
+                fields=[
+                    "name", "item_name", "description", "item_group",
+                    "stock_uom", "standard_rate", "disabled"
+                ]
+            )
+        except Exception as e:
+            frappe.log_error(f"Error loading items for item groups: {str(e)}")
+            raise
+
+    def load_profile_catalog(self, pos_profile: str) -> List[Dict]:
+        """
+        Every group under the POS Profile's item groups, at any depth, joined with
+        its enabled items in a single recursive query. Group-only rows have a NULL item_code.
+        """
+        return self._load_catalog(
+            """
+            SELECT ppg.idx AS root_idx, ig.name, ig.item_group_name, ig.parent_item_group, ig.is_group, ig.lft
+            FROM `tabPOS Item Group` ppg
+            JOIN `tabPOS Profile` pp ON pp.name = ppg.parent
+            JOIN `tabItem Group` ig ON ig.name = ppg.item_group
+            WHERE ppg.parent = %(pos_profile)s
+              AND ppg.parenttype = 'POS Profile'
+              AND pp.disabled = 0
+            """,
+            {"pos_profile": pos_profile},
+        )
+
+    def load_group_catalog(self, root_group_ids: List[str]) -> List[Dict]:
+        """Same as `load_profile_catalog`, starting from explicit root groups."""
+        if not root_group_ids:
+            return []
+        return self._load_catalog(
+            """
+            SELECT 0 AS root_idx, ig.name, ig.item_group_name, ig.parent_item_group, ig.is_group, ig.lft
+            FROM `tabItem Group` ig
+            WHERE ig.name IN %(roots)s
+            """,
+            {"roots": tuple(root_group_ids)},
+        )
+
+    def _load_catalog(self, roots_sql: str, values: Dict) -> List[Dict]:
+        try:
+            return frappe.db.sql(
+                f"""
+                WITH RECURSIVE roots AS ({roots_sql}),
+                menu AS (
+                    SELECT root_idx, name, item_group_name, parent_item_group, is_group, lft, 1 AS level
+                    FROM roots
+
+                    UNION ALL
+
+                    SELECT menu.root_idx, ig.name, ig.item_group_name, ig.parent_item_group, ig.is_group, ig.lft, menu.level + 1
+                    FROM menu
+                    JOIN `tabItem Group` ig ON ig.parent_item_group = menu.name
+                    WHERE menu.is_group = 1 AND menu.level < 64
+                )
+                SELECT
+                    m.root_idx,
+                    m.level,
+                    m.name                  AS item_group_id,
+                    m.item_group_name,
+                    m.parent_item_group     AS parent_group,
+                    m.is_group,
+                    i.name                  AS item_code,
+                    i.item_name,
+                    i.description,
+                    i.stock_uom,
+                    i.standard_rate,
+                    i.disabled
+                FROM menu m
+                LEFT JOIN `tabItem` i
+                    ON i.item_group = m.name
+                    AND i.disabled = 0
+                ORDER BY m.root_idx, m.lft, i.name
+                """,
+                values,
+                as_dict=True,
+            )
+        except Exception as e:
+            frappe.log_error(f"Error loading item group catalog: {str(e)}")
+            raise
@@ -0,0 +1,260 @@
+import json
+import time
+import frappe
+import pymysql.cursors
+from decimal import Decimal
+from typing import Dict, List, Optional
+from frappe.utils import now_datetime
+
+ENGINE_PROCEDURE = "procedure"
+ENGINE_EXECUTEMANY = "executemany"
+ITEM_UPSERT_ENGINES = (ENGINE_PROCEDURE, ENGINE_EXECUTEMANY)
+
+INVOICE_ITEM_COLUMNS = (
+    "name", "parent", "item_code", "item_name", "description", "uom", "qty", "rate",
+    "base_amount", "income_account", "cost_center", "folio_window",
+    "creation", "modified", "owner", "modified_by",
+)
+
+
+BENCHMARK_ITEM_COUNTS = (10, 60, 200)
+BENCHMARK_INVOICE = "_abc_pos_engine_benchmark"
+
+
+def get_item_upsert_engine() -> str:
+    """
+    Engine used by `pos_invoice_item_bulk_upsert`, from site config
+    `abc_pos_item_upsert_engine` ("procedure" or "executemany").
+
+    `bench abc-pos-benchmark-upsert-engines` times both engines on the site's
+    own database and stores the faster one there; "procedure" is only the
+    fallback for sites where it has not run.
+    """
+    engine = frappe.conf.get("abc_pos_item_upsert_engine") or ENGINE_PROCEDURE
+    if engine not in ITEM_UPSERT_ENGINES:
+        frappe.throw(f"Unknown abc_pos_item_upsert_engine '{engine}', expected one of {ITEM_UPSERT_ENGINES}")
+    return engine
+
+
+def _text(value) -> Optional[str]:
+    """Mirror NULLIF(value, '') of the procedure's unnest step."""
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _coalesce(*values):
+    """First value that is not None, like SQL COALESCE."""
+    for value in values:
+        if value is not None:
+            return value
+    return None
+
+
+def _decimal(value) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    return Decimal(str(value))
+
+
+class PosInvoiceItemRepository:
+    def bulk_upsert(
+        self, cursor, engine: str, invoice_id: str, user: str, items: List[Dict], full_listing: bool = True
+    ) -> List[Dict]:
+        """
+        Upsert items and return the invoice's rows: all of them, or only the
+        rows written by this call when `full_listing` is False.
+        """
+        if engine == ENGINE_EXECUTEMANY:
+            return self.bulk_upsert_executemany(cursor, invoice_id, user, items, full_listing)
+        return self.bulk_upsert_procedure(cursor, invoice_id, user, items, full_listing)
+
+    def bulk_upsert_procedure(
+        self, cursor, invoice_id: str, user: str, items: List[Dict], full_listing: bool = True
+    ) -> List[Dict]:
+        # Convert items to the row format expected by the stored procedure;
+        # missing values are sent as null so Item master defaults apply
+        json_data = {
+            "items": [
+                {
+                    "name":         i.get("name"),
+                    "item_code":    i.get("item_code"),
+                    "item_name":    i.get("item_name"),
+                    "description":  i.get("description"),
+                    "uom":          i.get("uom"),
+                    "qty":          float(i.get("qty") or 0),
+                    "rate":         float(i["rate"]) if i.get("rate") is not None else None,
+                    "amount":       float(i["amount"]) if i.get("amount") is not None else None,
+                    "folio_window": i.get("folio_window"),
+                }
+                for i in items
+            ]
+        }
+        cursor.execute(
+            "CALL pos_invoice_item_bulk_upsert(%s,%s,%s,%s)",
+            (invoice_id, user, json.dumps(json_data), 1 if full_listing else 0),
+        )
+        result = cursor.fetchall()
+        # Drain the procedure's status result so the connection can be reused
+        while cursor.nextset():
+            pass
+        return list(result)
+
+    def bulk_upsert_executemany(
+        self, cursor, invoice_id: str, user: str, items: List[Dict], full_listing: bool = True,
+        defaults: Optional[Dict[str, Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Same result as the stored procedure: defaults for every item code are
+        resolved in one query, then all rows are written with one multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE through executemany.
+
+        `defaults` (from `item_defaults`) skips the lookup when the caller
+        already resolved them, e.g. once for a whole batch of invoices.
+        """
+        if defaults is None:
+            defaults = self.item_defaults(cursor, [i.get("item_code") for i in items])
+        timestamp = now_datetime()
+
+        values = []
+        for idx, item in enumerate(items, start=1):
+            item_code = _text(item.get("item_code"))
+            d = defaults.get(item_code) or {}
+            qty = _coalesce(_decimal(item.get("qty")), Decimal(0))
+            rate = _coalesce(_decimal(item.get("rate")), _decimal(d.get("standard_rate")), Decimal(0))
+            amount = _decimal(item.get("amount"))
+
+            values.append((
+                # LPAD(idx, 3, '0') as in the procedure
+                _coalesce(_text(item.get("name")), f"{invoice_id}-{item_code or 'ITEM'}-{str(idx).rjust(3, '0')[:3]}"),
+                invoice_id,
+                "POS Invoice",
+                "items",
+                item_code or "",
+                _coalesce(_text(item.get("item_name")), d.get("item_name"), item_code, ""),
+                _coalesce(_text(item.get("description")), d.get("description"), d.get("item_name"), item_code, ""),
+                _coalesce(_text(item.get("uom")), d.get("stock_uom"), "Unit"),
+                qty,
+                rate,
+                _coalesce(amount, qty * rate),
+                _coalesce(d.get("income_account"), ""),
+                _coalesce(d.get("cost_center"), ""),
+                _coalesce(_text(item.get("folio_window")), ""),
+                timestamp,
+                timestamp,
+                user,
+                user,
+            ))
+
+        cursor.executemany(
+            """
+            INSERT INTO `tabPOS Invoice Item`
+            (name, parent, parenttype, parentfield,
+             item_code, item_name, description, uom, qty, rate, base_amount,
+             income_account, cost_center, folio_window, creation, modified, owner, modified_by)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                item_code     = VALUES(item_code),
+                item_name     = VALUES(item_name),
+                description   = VALUES(description),
+                uom           = VALUES(uom),
+                qty           = VALUES(qty),
+                rate          = VALUES(rate),
+                base_amount   = VALUES(base_amount),
+                income_account= VALUES(income_account),
+                cost_center   = VALUES(cost_center),
+                folio_window  = VALUES(folio_window),
+                modified      = VALUES(modified),
+                modified_by   = VALUES(modified_by)
+            """,
+            values,
+        )
+        if full_listing:
+            return self.invoice_items(cursor, invoice_id)
+        return self.invoice_items(cursor, invoice_id, names=[row[0] for row in values])
+
+    def item_defaults(self, cursor, item_codes: List[str]) -> Dict[str, Dict]:
+        codes = tuple({code for code in item_codes if code})
+        if not codes:
+            return {}
+        cursor.execute(
+            """
+            SELECT item_code, item_name, description, stock_uom, standard_rate, income_account, cost_center
+            FROM v_item_defaults
+            WHERE item_code IN %s
+            """,
+            (codes,),
+        )
+        return {row["item_code"]: row for row in cursor.fetchall()}
+
+    def invoice_items(self, cursor, invoice_id: str, names: Optional[List[str]] = None) -> List[Dict]:
+        condition, values = "pii.parent = %s", [invoice_id]
+        if names is not None:
+            condition += " AND pii.name IN %s"
+            values.append(tuple(names))
+        cursor.execute(
+            f"""
+            SELECT {", ".join(f"pii.{column}" for column in INVOICE_ITEM_COLUMNS)}
+            FROM `tabPOS Invoice Item` pii
+            WHERE {condition}
+            ORDER BY pii.creation, pii.name
+            """,
+            values,
+        )
+        return list(cursor.fetchall())
+
+    def invoice_item_totals(self, cursor, invoice_id: str) -> Dict:
+        cursor.execute(
+            """
+            SELECT
+                COUNT(*)                        AS count,
+                COALESCE(SUM(base_amount), 0)   AS total_amount,
+                COALESCE(SUM(qty), 0)           AS total_qty
+            FROM `tabPOS Invoice Item`
+            WHERE parent = %s
+            """,
+            (invoice_id,),
+        )
+        return cursor.fetchone()
+
+
+def benchmark_item_upsert_engines(
+    counts=BENCHMARK_ITEM_COUNTS, rounds: int = 10, item_codes: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Time both engines writing `counts` items to a scratch invoice, `rounds`
+    calls each, rolling every call back. Returns one row per count with the
+    mean milliseconds per call of each engine.
+    """
+    repo = PosInvoiceItemRepository()
+    conn = frappe.db.get_connection()
+    cur = conn.cursor(pymysql.cursors.DictCursor)
+    try:
+        if not item_codes:
+            cur.execute("SELECT item_code FROM v_item_defaults LIMIT 7")
+            item_codes = [row["item_code"] for row in cur.fetchall()]
+        if not item_codes:
+            frappe.throw("No items in v_item_defaults to benchmark with")
+        results = []
+        for count in counts:
+            items = [{"item_code": item_codes[n % len(item_codes)], "qty": 1 + n % 3} for n in range(count)]
+            row = {"items": count}
+            for engine in ITEM_UPSERT_ENGINES:
+                elapsed = 0.0
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    repo.bulk_upsert(cur, engine, BENCHMARK_INVOICE, "Administrator", items)
+                    elapsed += time.perf_counter() - start
+                    conn.rollback()
+                row[engine] = elapsed / rounds * 1000
+            results.append(row)
+        return results
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+
+def fastest_engine(results: List[Dict]) -> str:
+    """Engine with the lowest total time over every item count of a benchmark."""
+    return min(ITEM_UPSERT_ENGINES, key=lambda engine: sum(row[engine] for row in results))
@@ -1,5 +1,11 @@
 import frappe
-from typing import  Dict
+from frappe.utils import flt
+from typing import  Dict, List, Optional, Tuple
+
+SESSION_INVOICE_FIELDS = (
+    "name", "customer", "grand_total", "paid_amount", "status",
+    "table_number", "room_number", "posting_date", "creation",
+)
 
 
 class PosSessionRepository:
@@ -18,3 +24,78 @@ class PosSessionRepository:
         except Exception as e:
             frappe.log_error(f"Error fetching active pos session: {str(e)}")
             raise
+
+    def opening_balances(self, opening_entry: str) -> Dict[str, float]:
+        """Opening amount per mode of payment of a POS Opening Entry."""
+        rows = frappe.get_all(
+            "POS Opening Entry Detail",
+            filters={"parent": opening_entry, "parenttype": "POS Opening Entry"},
+            fields=["mode_of_payment", "opening_amount"],
+        )
+        balances: Dict[str, float] = {}
+        for row in rows:
+            balances[row.mode_of_payment] = balances.get(row.mode_of_payment, 0) + flt(row.opening_amount)
+        return balances
+
+    def session_invoices(
+        self,
+        session_id: str,
+        statuses: Optional[List[str]] = None,
+        table_number: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """
+        One page of a session's invoices, newest first. `after` is the
+        (creation, name) of the last row of the previous page.
+        """
+        conditions, values = self._invoice_conditions(session_id, statuses, table_number)
+        if after:
+            conditions.append("(creation < %(after_creation)s OR (creation = %(after_creation)s AND name < %(after_name)s))")
+            values.update(after_creation=after[0], after_name=after[1])
+        values["limit"] = limit
+
+        return frappe.db.sql(
+            f"""
+            SELECT {", ".join(SESSION_INVOICE_FIELDS)}
+            FROM `tabPOS Invoice`
+            WHERE {" AND ".join(conditions)}
+            ORDER BY creation DESC, name DESC
+            LIMIT %(limit)s
+            """,
+            values,
+            as_dict=True,
+        )
+
+    def session_invoice_summary(
+        self, session_id: str, statuses: Optional[List[str]] = None, table_number: Optional[str] = None
+    ) -> List[Dict]:
+        conditions, values = self._invoice_conditions(session_id, statuses, table_number)
+        return frappe.db.sql(
+            f"""
+            SELECT
+                status,
+                COUNT(*)                                AS count,
+                COALESCE(SUM(grand_total), 0)           AS grand_total,
+                COALESCE(SUM(paid_amount), 0)           AS paid_amount,
+                COALESCE(SUM(outstanding_amount), 0)    AS outstanding
+            FROM `tabPOS Invoice`
+            WHERE {" AND ".join(conditions)}
+            GROUP BY status
+            ORDER BY status
+            """,
+            values,
+            as_dict=True,
+        )
+
+    def _invoice_conditions(
+        self, session_id: str, statuses: Optional[List[str]], table_number: Optional[str]
+    ) -> Tuple[List[str], Dict]:
+        conditions, values = ["pos_session = %(session_id)s"], {"session_id": session_id}
+        if statuses:
+            conditions.append("status IN %(statuses)s")
+            values["statuses"] = tuple(statuses)
+        if table_number:
+            conditions.append("table_number = %(table_number)s")
+            values["table_number"] = table_number
+        return conditions, values
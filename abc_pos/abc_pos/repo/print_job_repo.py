@@ -0,0 +1,172 @@
+import json
+import frappe
+from typing import Dict, List, Optional
+from frappe.utils import now_datetime
+from frappe.utils.background_jobs import get_redis_conn
+
+PRINT_JOURNAL_KEY = "abc_pos:print_journal"
+
+# Drop the first len(ARGV) entries only while they are still the entries a flush
+# read. When another flush already dropped them the head differs and nothing is
+# removed, so entries appended in the meantime can never be lost.
+ACK_JOURNAL_LUA = """
+local n = #ARGV
+local head = redis.call('LRANGE', KEYS[1], 0, n - 1)
+if #head < n then
+    return 0
+end
+for i = 1, n do
+    if head[i] ~= ARGV[i] then
+        return 0
+    end
+end
+redis.call('LTRIM', KEYS[1], n, -1)
+return n
+"""
+
+PRINT_JOB_FIELDS = ("name", "pos_invoice", "cashier_device", "preparation_printer", "job_data")
+PRINT_JOB_STATUS_FIELDS = (
+    "name", "pos_invoice", "preparation_printer", "status", "printed_on", "printed_at", "attempts", "error", "modified",
+)
+
+
+class PrintJobRepository:
+    """
+    The journal buffer lives in the queue Redis, which is persisted and never
+    evicts keys, unlike the LRU cache Redis behind frappe.cache().
+    """
+
+    def buffer_jobs(self, jobs: List[Dict]) -> None:
+        """Append jobs to the journal buffer; `flush` moves them to Print Job."""
+        get_redis_conn().rpush(_journal_key(), *(json.dumps(job, default=str) for job in jobs))
+
+    def buffered_entries(self, limit: int) -> List[bytes]:
+        """The oldest `limit` buffer entries, as stored; decode with `json.loads`."""
+        return get_redis_conn().lrange(_journal_key(), 0, limit - 1)
+
+    def drop_buffered(self, entries: List[bytes]) -> int:
+        """
+        Remove `entries` from the head of the buffer once they are in Print Job.
+        Returns how many were removed: 0 when a concurrent flush got there first.
+        """
+        return get_redis_conn().eval(ACK_JOURNAL_LUA, 1, _journal_key(), *entries)
+
+    def buffered_count(self) -> int:
+        return get_redis_conn().llen(_journal_key())
+
+    def insert_jobs(self, jobs: List[Dict]) -> None:
+        """
+        Insert queued Print Jobs with one multi-row INSERT. Names are the jobs'
+        dedupe keys, so a job that is already journaled is skipped, not re-queued.
+        """
+        timestamp = now_datetime()
+        frappe.db.bulk_insert(
+            "Print Job",
+            fields=[
+                "name", "pos_invoice", "cashier_device", "preparation_printer", "job_data",
+                "status", "attempts", "creation", "modified", "owner", "modified_by", "docstatus",
+            ],
+            values=[
+                (
+                    job["name"], job["pos_invoice"], job.get("cashier_device"), job["preparation_printer"],
+                    job["job_data"], "Queued", 0, job.get("queued_at") or timestamp, timestamp,
+                    job.get("owner") or "Administrator", job.get("owner") or "Administrator", 0,
+                )
+                for job in jobs
+            ],
+            ignore_duplicates=True,
+        )
+
+    def claim(self, limit: int, names: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Move up to `limit` queued jobs to Printing and return them. SKIP LOCKED
+        lets several workers claim from the queue without waiting on each other.
+        """
+        condition, values = "status = 'Queued'", {"limit": limit}
+        if names is not None:
+            condition += " AND name IN %(names)s"
+            values["names"] = tuple(names) or ("",)
+        jobs = frappe.db.sql(
+            f"""
+            SELECT {", ".join(PRINT_JOB_FIELDS)}
+            FROM `tabPrint Job`
+            WHERE {condition}
+            ORDER BY creation
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+            """,
+            values,
+            as_dict=True,
+        )
+        if jobs:
+            frappe.db.sql(
+                "UPDATE `tabPrint Job` SET status = 'Printing', modified = %s WHERE name IN %s",
+                (now_datetime(), tuple(job.name for job in jobs)),
+            )
+        return jobs
+
+    def printer_targets(self, printers: List[str]) -> Dict[str, Dict]:
+        """Address of each printer and of its fallback printer, in one query."""
+        if not printers:
+            return {}
+        rows = frappe.db.sql(
+            """
+            SELECT
+                p.name, p.ip_adress, p.port_number,
+                b.name AS backup_printer, b.ip_adress AS backup_ip, b.port_number AS backup_port
+            FROM `tabPreparation Printer` p
+            LEFT JOIN `tabPreparation Printer` b ON b.name = p.fallback_printer
+            WHERE p.name IN %s
+            """,
+            (tuple(set(printers)),),
+            as_dict=True,
+        )
+        return {row.name: row for row in rows}
+
+    def save_result(self, name: str, status: str, printed_on: Optional[str], attempts: int, error: Optional[str]) -> None:
+        timestamp = now_datetime()
+        frappe.db.sql(
+            """
+            UPDATE `tabPrint Job`
+            SET status = %s, printed_on = %s, printed_at = %s,
+                attempts = attempts + %s, error = %s, modified = %s
+            WHERE name = %s AND status = 'Printing'
+            """,
+            (status, printed_on, timestamp if status == "Printed" else None, attempts, error, timestamp, name),
+        )
+
+    def requeue_stale(self, older_than=None, include_failed: bool = False) -> None:
+        """
+        Return jobs left in Printing by a worker that died back to the queue:
+        those claimed before `older_than`, or all of them when it is None, plus
+        every Failed job with `include_failed`. Printed jobs are acknowledged
+        and never requeued.
+        """
+        printing, values = "status = 'Printing'", {}
+        if older_than is not None:
+            printing += " AND modified < %(older_than)s"
+            values["older_than"] = older_than
+        condition = f"({printing}) OR status = 'Failed'" if include_failed else printing
+        frappe.db.sql(f"UPDATE `tabPrint Job` SET status = 'Queued' WHERE {condition}", values)
+
+    def requeue_failed(self, names: List[str]) -> None:
+        frappe.db.sql(
+            "UPDATE `tabPrint Job` SET status = 'Queued', modified = %s WHERE name IN %s AND status = 'Failed'",
+            (now_datetime(), tuple(names)),
+        )
+
+    def has_queued(self) -> bool:
+        return bool(frappe.db.sql("SELECT 1 FROM `tabPrint Job` WHERE status = 'Queued' LIMIT 1"))
+
+    def statuses(self, names: List[str]) -> List[Dict]:
+        return frappe.get_all(
+            "Print Job",
+            filters={"name": ["in", names]},
+            fields=list(PRINT_JOB_STATUS_FIELDS),
+            order_by="creation",
+        )
+
+
+def _journal_key() -> str:
+    # Site prefix as frappe.cache().make_key builds it; the queue Redis is shared by all sites
+    return f"{frappe.conf.db_name}|{PRINT_JOURNAL_KEY}"
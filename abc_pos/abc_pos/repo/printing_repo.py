@@ -27,3 +27,37 @@ class PrintingRepository:
         except Exception as e:
             frappe.log_error(f"Error fetching cashier device printers map: {str(e)}")
             raise
+
+    def invoice_print_header(self, invoice_id: str) -> Optional[Dict]:
+        return frappe.db.get_value(
+            "POS Invoice", invoice_id,
+            ["name as invoice", "table_number", "room_number", "pos_session", "owner as cashier"],
+            as_dict=True,
+        )
+
+    def invoice_lines_for_printing(self, invoice_id: str, item_row_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Invoice lines with their print_class resolved in the same query: the
+        line's own value, then the Item's, then its Item Group's.
+        """
+        condition, values = "ii.parent = %(invoice_id)s", {"invoice_id": invoice_id}
+        if item_row_ids is not None:
+            condition += " AND ii.name IN %(item_row_ids)s"
+            values["item_row_ids"] = tuple(item_row_ids) or ("",)
+        return frappe.db.sql(f"""
+            SELECT
+                ii.name, ii.parent, ii.item_code, ii.item_name, ii.qty, ii.uom,
+                COALESCE(NULLIF(ii.print_class, ''), NULLIF(it.print_class, ''), ig.print_class) AS print_class
+            FROM `tabPOS Invoice Item` ii
+            LEFT JOIN `tabItem` it ON it.name = ii.item_code
+            LEFT JOIN `tabItem Group` ig ON ig.name = COALESCE(NULLIF(ii.item_group, ''), it.item_group)
+            WHERE {condition}
+            ORDER BY ii.idx, ii.creation, ii.name
+        """, values, as_dict=True)
+
+    def preparation_printers(self) -> List[Dict]:
+        return frappe.get_all(
+            "Preparation Printer",
+            fields=["name", "ip_adress", "port_number", "fallback_printer"],
+            order_by="name",
+        )
@@ -0,0 +1,62 @@
+import frappe
+from typing import Dict, List
+
+# Item-level sections read only invoice items and payment sections only payments,
+# so neither is multiplied by the other as rows of pos_invoice_view are.
+ITEM_SECTION_KEYS = {
+    "item": ("ii.item_code", "MAX(ii.item_name)"),
+    "item_group": ("ii.item_group", "ii.item_group"),
+    "print_class": (
+        "COALESCE(NULLIF(it.print_class, ''), ig.print_class)",
+        "COALESCE(NULLIF(it.print_class, ''), ig.print_class)",
+    ),
+}
+
+
+class ReportRepository:
+    def item_section(self, session: str, section: str) -> List[Dict]:
+        key, label = ITEM_SECTION_KEYS[section]
+        joins = ""
+        if section == "print_class":
+            joins = """
+            LEFT JOIN `tabItem` it ON it.name = ii.item_code
+            LEFT JOIN `tabItem Group` ig ON ig.name = ii.item_group
+            """
+        return frappe.db.sql(
+            f"""
+            SELECT
+                {key}                           AS `key`,
+                {label}                         AS label,
+                COUNT(*)                        AS line_count,
+                COUNT(DISTINCT ii.parent)       AS invoice_count,
+                COALESCE(SUM(ii.qty), 0)        AS qty,
+                COALESCE(SUM(ii.amount), 0)     AS amount,
+                COALESCE(SUM(ii.discount_amount * ii.qty), 0) AS discount_amount
+            FROM `tabPOS Invoice Item` ii
+            JOIN `tabPOS Invoice` i ON i.name = ii.parent
+            {joins}
+            WHERE i.pos_session = %(session)s AND i.docstatus = 1 AND ii.parenttype = 'POS Invoice'
+            GROUP BY {key}
+            ORDER BY amount DESC
+            """,
+            {"session": session},
+            as_dict=True,
+        )
+
+    def payment_section(self, session: str) -> List[Dict]:
+        return frappe.db.sql(
+            """
+            SELECT
+                p.mode_of_payment               AS `key`,
+                p.mode_of_payment               AS label,
+                COUNT(DISTINCT p.parent)        AS invoice_count,
+                COALESCE(SUM(p.amount), 0)      AS amount
+            FROM `tabSales Invoice Payment` p
+            JOIN `tabPOS Invoice` i ON i.name = p.parent
+            WHERE i.pos_session = %(session)s AND i.docstatus = 1 AND p.parenttype = 'POS Invoice'
+            GROUP BY p.mode_of_payment
+            ORDER BY amount DESC
+            """,
+            {"session": session},
+            as_dict=True,
+        )
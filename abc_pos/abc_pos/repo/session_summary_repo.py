@@ -0,0 +1,154 @@
+import frappe
+from typing import Dict, List, Optional
+from frappe.utils import now_datetime
+
+SUMMARY_TOTAL_FIELDS = (
+    "invoice_count", "item_lines", "item_qty", "grand_total", "paid_amount",
+    "change_amount", "void_count", "void_qty",
+)
+
+
+class SessionSummaryRepository:
+    def apply_delta(self, session: str, totals: Dict, payments: Optional[Dict[str, float]] = None) -> None:
+        """
+        Add `totals` (keyed by SUMMARY_TOTAL_FIELDS) and per mode of payment
+        amounts to a session's summary, creating it on first use. Each write is a
+        single INSERT ... ON DUPLICATE KEY UPDATE, so concurrent invoices in the
+        same session add up instead of overwriting each other.
+        """
+        timestamp, user = now_datetime(), frappe.session.user
+        values = {field: totals.get(field) or 0 for field in SUMMARY_TOTAL_FIELDS}
+        values.update(session=session, now=timestamp, user=user)
+        frappe.db.sql(
+            f"""
+            INSERT INTO `tabPOS Session Summary`
+                (name, pos_session, {", ".join(SUMMARY_TOTAL_FIELDS)},
+                 creation, modified, owner, modified_by, docstatus, idx)
+            VALUES
+                (%(session)s, %(session)s, {", ".join(f"%({field})s" for field in SUMMARY_TOTAL_FIELDS)},
+                 %(now)s, %(now)s, %(user)s, %(user)s, 0, 0)
+            ON DUPLICATE KEY UPDATE
+                {", ".join(f"{field} = {field} + VALUES({field})" for field in SUMMARY_TOTAL_FIELDS)},
+                modified = VALUES(modified),
+                modified_by = VALUES(modified_by)
+            """,
+            values,
+        )
+
+        rows = [
+            (f"{session}-{mode_of_payment}", session, mode_of_payment, amount, timestamp, timestamp, user, user)
+            for mode_of_payment, amount in (payments or {}).items()
+            if amount
+        ]
+        if rows:
+            frappe.db.sql(
+                """
+                INSERT INTO `tabPOS Session Summary Payment`
+                    (name, parent, parenttype, parentfield, mode_of_payment, amount,
+                     creation, modified, owner, modified_by, docstatus, idx)
+                VALUES {}
+                ON DUPLICATE KEY UPDATE
+                    amount = amount + VALUES(amount),
+                    modified = VALUES(modified)
+                """.format(", ".join(
+                    "(%s, %s, 'POS Session Summary', 'payments', %s, %s, %s, %s, %s, %s, 0, 0)" for _ in rows
+                )),
+                [value for row in rows for value in row],
+            )
+
+    def get(self, session: str) -> Optional[Dict]:
+        summary = frappe.db.get_value(
+            "POS Session Summary", session,
+            ["pos_session", *SUMMARY_TOTAL_FIELDS, "reconciled_at", "reconciliation_status", "modified"],
+            as_dict=True,
+        )
+        if not summary:
+            return None
+        summary.payments = self.payments(session)
+        return summary
+
+    def payments(self, session: str) -> Dict[str, float]:
+        rows = frappe.db.sql(
+            """
+            SELECT mode_of_payment, amount
+            FROM `tabPOS Session Summary Payment`
+            WHERE parent = %s AND parenttype = 'POS Session Summary'
+            ORDER BY mode_of_payment
+            """,
+            (session,),
+        )
+        return {mode_of_payment: amount for mode_of_payment, amount in rows}
+
+    def compute_from_invoices(self, session: str) -> Dict:
+        """Recompute a session's totals from the invoice, item, payment and void tables."""
+        totals = frappe.db.sql(
+            """
+            SELECT
+                COUNT(*)                        AS invoice_count,
+                COALESCE(SUM(grand_total), 0)   AS grand_total,
+                COALESCE(SUM(paid_amount), 0)   AS paid_amount,
+                COALESCE(SUM(change_amount), 0) AS change_amount
+            FROM `tabPOS Invoice`
+            WHERE pos_session = %(session)s AND docstatus = 1
+            """,
+            {"session": session},
+            as_dict=True,
+        )[0]
+        totals.update(frappe.db.sql(
+            """
+            SELECT COUNT(*) AS item_lines, COALESCE(SUM(ii.qty), 0) AS item_qty
+            FROM `tabPOS Invoice Item` ii
+            JOIN `tabPOS Invoice` i ON i.name = ii.parent
+            WHERE i.pos_session = %(session)s AND i.docstatus = 1 AND ii.parenttype = 'POS Invoice'
+            """,
+            {"session": session},
+            as_dict=True,
+        )[0])
+        totals.update(frappe.db.sql(
+            """
+            SELECT COUNT(*) AS void_count, COALESCE(SUM(v.quanitity), 0) AS void_qty
+            FROM `tabPOS Invoice Voide Bin` v
+            JOIN `tabPOS Invoice` i ON i.name = v.pos_invoice
+            WHERE i.pos_session = %(session)s
+            """,
+            {"session": session},
+            as_dict=True,
+        )[0])
+        payments = frappe.db.sql(
+            """
+            SELECT p.mode_of_payment, SUM(p.amount)
+            FROM `tabSales Invoice Payment` p
+            JOIN `tabPOS Invoice` i ON i.name = p.parent
+            WHERE i.pos_session = %(session)s AND i.docstatus = 1 AND p.parenttype = 'POS Invoice'
+            GROUP BY p.mode_of_payment
+            """,
+            {"session": session},
+        )
+        totals.payments = {mode_of_payment: amount for mode_of_payment, amount in payments}
+        return totals
+
+    def mark_reconciled(self, session: str, status: str) -> None:
+        frappe.db.set_value(
+            "POS Session Summary", session,
+            {"reconciled_at": now_datetime(), "reconciliation_status": status},
+            update_modified=False,
+        )
+
+    def invoice_sessions(self, invoice_ids: List[str]) -> Dict[str, str]:
+        if not invoice_ids:
+            return {}
+        rows = frappe.db.sql(
+            "SELECT name, pos_session FROM `tabPOS Invoice` WHERE name IN %s AND pos_session IS NOT NULL",
+            (tuple(set(invoice_ids)),),
+        )
+        return dict(rows)
+
+    def sessions_to_reconcile(self, closed_since) -> List[str]:
+        """Open sessions plus sessions changed (e.g. closed) since `closed_since`."""
+        return frappe.db.sql_list(
+            """
+            SELECT name FROM `tabPOS Session`
+            WHERE session_status = 'Open' OR modified >= %s
+            """,
+            (closed_since,),
+        )
@@ -3,80 +3,97 @@ DELIMITER $$
 
 DROP PROCEDURE IF EXISTS unnest_json_silent $$
 
+-- Procedure: unnest_json_silent
+-- Purpose: Flatten a JSON object of equal-length arrays into tmp_unnested (idx + one column per key).
+-- Keys are enumerated with JSON_TABLE (no key limit) and each array is read by its own JSON_TABLE
+-- joined on ordinality, so the table is built by one set-based statement instead of row inserts.
 CREATE PROCEDURE unnest_json_silent(
     IN p_json_object JSON
 )
 BEGIN
-    DECLARE done INT DEFAULT FALSE;
-    DECLARE key_name VARCHAR(255);
-    DECLARE array_length INT;
-    DECLARE i INT DEFAULT 0;
-    DECLARE create_sql TEXT DEFAULT 'CREATE TEMPORARY TABLE tmp_unnested (idx INT';
-    DECLARE insert_columns TEXT DEFAULT 'idx';
-    DECLARE insert_values TEXT DEFAULT '';
-
-    DECLARE key_cursor CURSOR FOR
-        SELECT JSON_UNQUOTE(JSON_EXTRACT(JSON_KEYS(p_json_object), CONCAT('$[', n, ']'))) as key_val
-        FROM (SELECT 0 as n UNION SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4
-              UNION SELECT 5 UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9) nums
-        WHERE n < JSON_LENGTH(JSON_KEYS(p_json_object));
-
-    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
-
-    -- Drop if exists
+    DECLARE first_path TEXT;
+    DECLARE select_columns LONGTEXT;
+    DECLARE join_tables LONGTEXT;
+
     DROP TEMPORARY TABLE IF EXISTS tmp_unnested;
 
-    -- Build CREATE TABLE statement
-    OPEN key_cursor;
-    read_loop: LOOP
-        FETCH key_cursor INTO key_name;
-        IF done THEN
-            LEAVE read_loop;
-        END IF;
-
-        SET create_sql = CONCAT(create_sql, ', ', key_name, ' VARCHAR(255)');
-        SET insert_columns = CONCAT(insert_columns, ', ', key_name);
-    END LOOP;
-    CLOSE key_cursor;
-
-    SET create_sql = CONCAT(create_sql, ') ENGINE=MEMORY');
-
-    -- Create the table
-    SET @sql = create_sql;
-    PREPARE stmt FROM @sql;
-    EXECUTE stmt;
-    DEALLOCATE PREPARE stmt;
-
-    -- Get array length from first key
-    SET array_length = JSON_LENGTH(JSON_EXTRACT(p_json_object, CONCAT('$.', JSON_UNQUOTE(JSON_EXTRACT(JSON_KEYS(p_json_object), '$[0]')))));
-
-    -- Insert data row by row
-    SET i = 0;
-    WHILE i < array_length DO
-        SET insert_values = CONCAT(i + 1); -- idx value
-
-        -- Reset cursor
-        SET done = FALSE;
-        OPEN key_cursor;
-        read_loop2: LOOP
-            FETCH key_cursor INTO key_name;
-            IF done THEN
-                LEAVE read_loop2;
-            END IF;
-
-            SET insert_values = CONCAT(insert_values, ', ',
-                QUOTE(COALESCE(JSON_UNQUOTE(JSON_EXTRACT(p_json_object, CONCAT('$.', key_name, '[', i, ']'))), '')));
-        END LOOP;
-        CLOSE key_cursor;
-
-        -- Insert the row
-        SET @sql = CONCAT('INSERT INTO tmp_unnested (', insert_columns, ') VALUES (', insert_values, ')');
+    SET SESSION group_concat_max_len = 1048576;
+    SET @unnest_json = p_json_object;
+
+    SELECT
+        MAX(IF(k.ord = 1, QUOTE(CONCAT('$.', JSON_QUOTE(k.key_name), '[*]')), NULL)),
+        GROUP_CONCAT(
+            CONCAT(', k', k.ord, '.v AS `', REPLACE(k.key_name, '`', '``'), '`')
+            ORDER BY k.ord SEPARATOR ''
+        ),
+        GROUP_CONCAT(
+            IF(k.ord = 1, '', CONCAT(
+                ' LEFT JOIN JSON_TABLE(@unnest_json, ', QUOTE(CONCAT('$.', JSON_QUOTE(k.key_name), '[*]')),
+                ' COLUMNS (idx FOR ORDINALITY, v LONGTEXT PATH ''$'')) k', k.ord,
+                ' ON k', k.ord, '.idx = k1.idx'
+            ))
+            ORDER BY k.ord SEPARATOR ''
+        )
+    INTO first_path, select_columns, join_tables
+    FROM JSON_TABLE(JSON_KEYS(p_json_object), '$[*]' COLUMNS (
+        ord       FOR ORDINALITY,
+        key_name  VARCHAR(255) PATH '$'
+    )) k;
+
+    IF first_path IS NULL THEN
+        CREATE TEMPORARY TABLE tmp_unnested (idx INT);
+    ELSE
+        SET @sql = CONCAT(
+            'CREATE TEMPORARY TABLE tmp_unnested AS SELECT k1.idx', select_columns,
+            ' FROM JSON_TABLE(@unnest_json, ', first_path,
+            ' COLUMNS (idx FOR ORDINALITY, v LONGTEXT PATH ''$'')) k1', join_tables
+        );
         PREPARE stmt FROM @sql;
         EXECUTE stmt;
         DEALLOCATE PREPARE stmt;
+    END IF;
 
-        SET i = i + 1;
-    END WHILE;
+    SET @unnest_json = NULL;
+END$$
+
+DROP PROCEDURE IF EXISTS pos_invoice_item_unnest $$
+-- Procedure: pos_invoice_item_unnest
+-- Purpose: Typed, set-based flattening of invoice item rows into tmp_unnested in one JSON_TABLE pass.
+-- Input: {"items": [{"name", "item_code", "item_name", "description", "uom", "qty", "rate", "amount", "folio_window"}, ...]}
+--   Missing keys, JSON null and empty strings become NULL so the v_item_defaults fallbacks apply.
+-- Change from the unnest_json_silent path it replaces: that stored every missing value as '' in
+--   VARCHAR(255) columns, so a missing rate or amount was cast to 0 and rate never fell back to
+--   Item.standard_rate nor amount to qty * rate. They are now NULL and both fallbacks apply.
+CREATE PROCEDURE pos_invoice_item_unnest(
+    IN p_json_data JSON
+)
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS tmp_unnested;
+
+    CREATE TEMPORARY TABLE tmp_unnested AS
+    SELECT
+        jt.idx,
+        NULLIF(jt.name, '')          AS name,
+        NULLIF(jt.item_code, '')     AS item_code,
+        NULLIF(jt.item_name, '')     AS item_name,
+        NULLIF(jt.description, '')   AS description,
+        NULLIF(jt.uom, '')           AS uom,
+        jt.qty,
+        jt.rate,
+        jt.amount,
+        NULLIF(jt.folio_window, '')  AS folio_window
+    FROM JSON_TABLE(p_json_data, '$.items[*]' COLUMNS (
+        idx           FOR ORDINALITY,
+        name          VARCHAR(140)   PATH '$.name',
+        item_code     VARCHAR(140)   PATH '$.item_code',
+        item_name     VARCHAR(140)   PATH '$.item_name',
+        description   LONGTEXT       PATH '$.description',
+        uom           VARCHAR(140)   PATH '$.uom',
+        qty           DECIMAL(21,9)  PATH '$.qty',
+        rate          DECIMAL(21,9)  PATH '$.rate',
+        amount        DECIMAL(21,9)  PATH '$.amount',
+        folio_window  VARCHAR(140)   PATH '$.folio_window'
+    )) jt;
 END$$
 DROP PROCEDURE IF EXISTS unnest_json;
 CREATE PROCEDURE unnest_json(
@@ -92,29 +109,35 @@ DROP PROCEDURE IF EXISTS pos_invoice_item_bulk_upsert $$
 -- Inputs:
 --   p_invoice_id : Target POS Invoice (parent id).
 --   p_user       : User performing the operation (sets owner/modified_by).
---   p_json_data  : JSON object with arrays (names, item_codes, item_names, descriptions, uoms, qtys, rates, amounts, folio_windows).
+--   p_json_data  : JSON object with an "items" array of row objects.
+--   p_full_listing : 1 returns every item of the invoice, 0 only the rows written by this call.
 -- {
---   "names":        ["row1","row2",...],               -- optional (autogenerated if blank)
---   "item_codes":   ["ITEM-001","ITEM-002",...],       -- required
---   "item_names":   ["Item 1","Item 2",...],           -- optional (fallback to Item master)
---   "descriptions": ["Desc 1","Desc 2",...],           -- optional (fallback to Item master)
---   "uoms":         ["Unit","Kg",...],                 -- optional (fallback to Item master)
---   "qtys":         [1.0,2.5,...],                     -- optional (default 0)
---   "rates":        [100.0,150.0,...],                 -- optional (fallback to Item.standard_rate)
---   "amounts":      [100.0,375.0,...],                 -- optional (auto-calculated if missing)
---   "folio_windows":["FOLIO-A","FOLIO-B",...]          -- optional
+--   "items": [
+--     {
+--       "name":         "row1",        -- optional (autogenerated if blank)
+--       "item_code":    "ITEM-001",    -- required
+--       "item_name":    "Item 1",      -- optional (fallback to Item master)
+--       "description":  "Desc 1",      -- optional (fallback to Item master)
+--       "uom":          "Unit",        -- optional (fallback to Item master)
+--       "qty":          1.0,           -- optional (default 0)
+--       "rate":         100.0,         -- optional (NULL falls back to Item.standard_rate, not 0)
+--       "amount":       100.0,         -- optional (NULL becomes qty * rate, not 0)
+--       "folio_window": "FOLIO-A"      -- optional
+--     }, ...
+--   ]
 -- }
 -- Behavior:
---   1. Flattens JSON arrays into rows via unnest_json_silent.
+--   1. Flattens JSON rows into typed columns via pos_invoice_item_unnest (one JSON_TABLE pass).
 --   2. Enriches items by joining with v_item_defaults for accounts and defaults.
 --   3. Prepares staged rows in tmp_prepared, ensuring required fields are filled.
 --   4. Inserts/updates tabPOS Invoice Item in bulk (ON DUPLICATE KEY UPDATE).
---   5. Returns all items for the invoice after operation.
+--   5. Returns all items for the invoice, or only the affected rows when p_full_listing = 0.
 -- Notes: Cleans up temp tables at the end. Safe and idempotent.
 CREATE PROCEDURE pos_invoice_item_bulk_upsert(
     IN p_invoice_id VARCHAR(140),
     IN p_user VARCHAR(140),
-    IN p_json_data JSON
+    IN p_json_data JSON,
+    IN p_full_listing TINYINT
 )
 BEGIN
     -- Drop staging tables if they exist
@@ -122,7 +145,7 @@ BEGIN
     DROP TEMPORARY TABLE IF EXISTS tmp_prepared;
 
     -- 1) Flatten JSON into tmp_unnested
-    CALL unnest_json_silent(p_json_data);
+    CALL pos_invoice_item_unnest(p_json_data);
 
     -- 2) Safety check
     SET @row_count = 0;
@@ -134,34 +157,28 @@ BEGIN
     -- 3) Prepare merged data into tmp_prepared
     CREATE TEMPORARY TABLE tmp_prepared AS
     SELECT
-        IF(COALESCE(u.names,'')='',
-           CONCAT(p_invoice_id,'-',COALESCE(u.item_codes,'ITEM'),'-',LPAD(u.idx,3,'0')),
-           u.names) AS name,
+        IF(u.name IS NULL,
+           CONCAT(p_invoice_id,'-',COALESCE(u.item_code,'ITEM'),'-',LPAD(u.idx,3,'0')),
+           u.name) AS name,
         p_invoice_id                                AS parent,
         'POS Invoice'                               AS parenttype,
         'items'                                     AS parentfield,
-        COALESCE(u.item_codes,'')                   AS item_code,
-        COALESCE(u.item_names, d.item_name, u.item_codes,'') AS item_name,
-        COALESCE(u.descriptions, d.description, d.item_name, u.item_codes,'') AS description,
-        COALESCE(u.uoms, d.stock_uom,'Unit')        AS uom,
-        CAST(COALESCE(u.qtys,'0') AS DECIMAL(12,2)) AS qty,
-        CAST(COALESCE(u.rates, d.standard_rate,'0') AS DECIMAL(12,2)) AS rate,
-        CAST(
-            COALESCE(
-                u.amounts,
-                CAST(COALESCE(u.qtys,'0') AS DECIMAL(12,2)) *
-                CAST(COALESCE(u.rates, d.standard_rate,'0') AS DECIMAL(12,2))
-            ,'0')
-        AS DECIMAL(12,2))                           AS base_amount,
+        COALESCE(u.item_code,'')                    AS item_code,
+        COALESCE(u.item_name, d.item_name, u.item_code,'') AS item_name,
+        COALESCE(u.description, d.description, d.item_name, u.item_code,'') AS description,
+        COALESCE(u.uom, d.stock_uom,'Unit')         AS uom,
+        COALESCE(u.qty, 0)                          AS qty,
+        COALESCE(u.rate, d.standard_rate, 0)        AS rate,
+        COALESCE(u.amount, COALESCE(u.qty, 0) * COALESCE(u.rate, d.standard_rate, 0)) AS base_amount,
         COALESCE(d.income_account,'')               AS income_account,
         COALESCE(d.cost_center,'')                  AS cost_center,
-        COALESCE(u.folio_windows,'')                AS folio_window,
+        COALESCE(u.folio_window,'')                 AS folio_window,
         NOW()                                       AS creation,
         NOW()                                       AS modified,
         p_user                                      AS owner,
         p_user                                      AS modified_by
     FROM tmp_unnested u
-    LEFT JOIN v_item_defaults d ON d.item_code = u.item_codes;
+    LEFT JOIN v_item_defaults d ON d.item_code = u.item_code;
 
     -- 4) Flat insert/upsert from tmp_prepared
     INSERT INTO `tabPOS Invoice Item`
@@ -202,7 +219,7 @@ BEGIN
         modified      = NOW(),
         modified_by   = p_user;
 
-    -- 5) Return updated invoice items
+    -- 5) Return updated invoice items (whole invoice or only this call's rows)
     SELECT
         pii.name,
         pii.parent,
@@ -222,6 +239,7 @@ BEGIN
         pii.modified_by
     FROM `tabPOS Invoice Item` pii
     WHERE pii.parent = p_invoice_id
+      AND (p_full_listing = 1 OR pii.name IN (SELECT name FROM tmp_prepared))
     ORDER BY pii.creation, pii.name;
 
     -- Cleanup
@@ -0,0 +1,147 @@
+def build_group_tree(rows, parent=None):
+    """
+    Build a nested tree structure from flat SQL rows in a single pass.
+
+    Rows are indexed once by (parent_group, item_group_name) and by parent, then
+    nodes are linked to their children from those indexes, so the cost is linear
+    in the number of rows instead of rescanning them for every group.
+
+    Args:
+        rows: List of dictionaries from SQL query
+        parent: Parent group name (None for root level, which will be "All Item Groups")
+
+    Returns:
+        List of nested group dictionaries with items and sub-groups
+    """
+    nodes = {}
+    children = {}
+    parent_counts = {}
+
+    for row in rows:
+        group_name = row['item_group_name']
+        parent_group = row['parent_group']
+
+        if parent_group:
+            parent_counts[parent_group] = parent_counts.get(parent_group, 0) + 1
+
+        key = (parent_group, group_name)
+        node = nodes.get(key)
+        if node is None:
+            node = {
+                'item_group_id': row['item_group_id'],
+                'item_group_name': group_name,
+                'parent_group': parent_group,
+                'items': [],
+                'sub_groups': []
+            }
+            nodes[key] = node
+            children.setdefault(parent_group, []).append(group_name)
+
+        # Add item to this group if it exists (item_code is not NULL)
+        if row['item_code'] is not None:
+            node['items'].append({
+                'item_code': row['item_code'],
+                'item_name': row['item_name'],
+                'description': row['description'],
+                'stock_uom': row['stock_uom'],
+                'standard_rate': float(row['standard_rate']) if row['standard_rate'] else 0.0,
+                'disabled': row['disabled']
+            })
+
+    # Use the most common parent as root when none is given
+    if parent is None and parent_counts:
+        parent = max(parent_counts, key=parent_counts.get)
+
+    for (_, group_name), node in nodes.items():
+        node['sub_groups'] = [nodes[(group_name, child)] for child in children.get(group_name, ())]
+
+    return [nodes[(parent, group_name)] for group_name in children.get(parent, ())]
+
+
+def build_nested_group_tree(root_group_ids, groups, items):
+    """
+    Assemble nested groups and items for `item.item_list` from rows loaded up front.
+
+    Args:
+        root_group_ids: Item Group names to start from (the POS Profile groups)
+        groups: Item Group rows covering every root and its descendants
+        items: Item rows for all of those groups
+
+    Returns:
+        List of group dictionaries with child_groups and items, one per root found
+    """
+    groups_by_name = {group['name']: group for group in groups}
+    children = {}
+    for group in groups:
+        children.setdefault(group['parent_item_group'], []).append(group['name'])
+
+    items_by_group = {}
+    for item in items:
+        items_by_group.setdefault(item['item_group'], []).append({
+            "item_code": item['name'],
+            "item_name": item['item_name'],
+            "description": item['description'],
+            "uom": item['stock_uom'],
+            "rate": float(item['standard_rate']) if item['standard_rate'] else 0.0,
+            "disabled": item['disabled']
+        })
+
+    def build(group_name, visited):
+        # Prevent infinite recursion
+        if group_name in visited or group_name not in groups_by_name:
+            return None
+        visited.add(group_name)
+
+        group = groups_by_name[group_name]
+        group_tree = {
+            "item_group_id": group['name'],
+            "item_group_name": group['item_group_name'],
+            "is_group": group['is_group'],
+            "child_groups": [],
+            "items": items_by_group.get(group_name, [])
+        }
+        if group['is_group']:
+            for child_name in children.get(group_name, ()):
+                child_tree = build(child_name, visited)
+                if child_tree:
+                    group_tree["child_groups"].append(child_tree)
+        return group_tree
+
+    hierarchy = []
+    for group_name in root_group_ids:
+        group_tree = build(group_name, set())
+        if group_tree:
+            hierarchy.append(group_tree)
+    return hierarchy
+
+
+def split_catalog_rows(rows):
+    """
+    Split flat group/item rows from a recursive catalog query into the
+    (root_group_ids, groups, items) inputs of `build_nested_group_tree`.
+    """
+    root_group_ids = []
+    groups = {}
+    items = {}
+    for row in rows:
+        group_name = row['item_group_id']
+        if group_name not in groups:
+            groups[group_name] = {
+                'name': group_name,
+                'item_group_name': row['item_group_name'],
+                'parent_item_group': row['parent_group'],
+                'is_group': row['is_group'],
+            }
+        if row['level'] == 1 and group_name not in root_group_ids:
+            root_group_ids.append(group_name)
+        if row['item_code'] is not None and (group_name, row['item_code']) not in items:
+            items[(group_name, row['item_code'])] = {
+                'name': row['item_code'],
+                'item_name': row['item_name'],
+                'description': row['description'],
+                'item_group': group_name,
+                'stock_uom': row['stock_uom'],
+                'standard_rate': row['standard_rate'],
+                'disabled': row['disabled'],
+            }
+    return root_group_ids, list(groups.values()), list(items.values())
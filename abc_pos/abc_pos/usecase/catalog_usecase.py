@@ -0,0 +1,175 @@
+import hashlib
+import json
+import time
+import frappe
+from datetime import timedelta
+from typing import Dict, Optional
+from frappe.utils import add_days, get_datetime, now, now_datetime
+from ..repo.catalog_repo import CatalogRepository
+from ..repo.item_group_repo import ItemGroupRepository
+from .catalog_tree import build_group_tree
+
+SNAPSHOT_KEY = "abc_pos:catalog_snapshot:"
+SNAPSHOT_LOCK_KEY = "abc_pos:catalog_snapshot_lock:"
+SNAPSHOT_TTL = 24 * 60 * 60
+BUILD_LOCK_TTL = 30
+BUILD_WAIT_SECONDS = 5.0
+# Changes committed shortly before a sync may carry an earlier `modified` than the
+# returned version, so each delta re-sends this window; upserts are idempotent.
+CHANGES_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION_DAYS = 30
+
+
+class CatalogUseCase:
+    def __init__(self, repo: CatalogRepository, group_repo: ItemGroupRepository) -> None:
+        self.repo = repo
+        self.group_repo = group_repo
+
+    def get_snapshot(self, pos_profile: str) -> Optional[Dict]:
+        """
+        Return the cached catalog snapshot for a POS Profile, building it on miss.
+        Only one worker builds a missing snapshot; concurrent callers wait for it.
+        """
+        snapshot = frappe.cache().get_value(SNAPSHOT_KEY + pos_profile)
+        if snapshot is not None:
+            return snapshot
+
+        if self._acquire_build_lock(pos_profile):
+            try:
+                return self._build_snapshot(pos_profile)
+            finally:
+                self._release_build_lock(pos_profile)
+
+        # Another worker is building it: wait for the result instead of re-running the view
+        deadline = time.monotonic() + BUILD_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            snapshot = frappe.cache().get_value(SNAPSHOT_KEY + pos_profile)
+            if snapshot is not None:
+                return snapshot
+
+        return self._build_snapshot(pos_profile)
+
+    def invalidate(self, pos_profile: Optional[str] = None) -> None:
+        if pos_profile:
+            frappe.cache().delete_value(SNAPSHOT_KEY + pos_profile)
+        else:
+            frappe.cache().delete_keys(SNAPSHOT_KEY)
+
+    def changes_since(self, pos_profile: str, since: Optional[str] = None) -> Dict:
+        """
+        Items and groups of a POS Profile changed since a previous sync version.
+        The version is the server timestamp taken before reading, so passing it back
+        as `since` on the next call never skips a change.
+        """
+        version = now()
+        since_dt = get_datetime(since) - CHANGES_OVERLAP if since else None
+        profile = frappe.db.get_value("POS Profile", pos_profile, ["name", "modified"], as_dict=True)
+        if not profile:
+            frappe.throw(f"POS Profile {pos_profile} not found")
+
+        if (
+            since_dt is None
+            or profile.modified >= since_dt
+            or since_dt < get_datetime(add_days(version, -TOMBSTONE_RETENTION_DAYS))
+        ):
+            # Unknown starting point, profile groups changed, or tombstones already purged
+            return {"full_resync": True, "version": version}
+
+        root_group_ids = frappe.get_all(
+            "POS Item Group",
+            filters={"parent": pos_profile, "parenttype": "POS Profile"},
+            pluck="item_group",
+        )
+        groups = self.group_repo.load_subtree_groups(root_group_ids)
+        group_ids = [group.name for group in groups]
+
+        upserted_groups = [
+            {
+                "item_group_id": group.name,
+                "item_group_name": group.item_group_name,
+                "parent_group": group.parent_item_group,
+                "is_group": group.is_group,
+            }
+            for group in groups
+            if group.modified >= since_dt
+        ]
+        upserted_items = [
+            {
+                "item_code": item.item_code,
+                "item_name": item.item_name,
+                "description": item.description,
+                "item_group": item.item_group,
+                "uom": item.stock_uom,
+                "rate": float(item.standard_rate) if item.standard_rate else 0.0,
+                "disabled": item.disabled,
+            }
+            for item in self.repo.items_changed_since(group_ids, since_dt)
+        ]
+
+        current_groups = set(group_ids)
+        current_items = {item["item_code"] for item in upserted_items}
+        removed_items, removed_groups = [], []
+        for tombstone in self.repo.tombstones_since(since_dt):
+            # Only removals from this profile's groups concern its tablets
+            if tombstone.item_group not in current_groups and tombstone.ref_name not in current_groups:
+                continue
+            if tombstone.ref_doctype == "Item" and tombstone.ref_name not in current_items:
+                removed_items.append(tombstone.ref_name)
+            elif tombstone.ref_doctype == "Item Group":
+                if tombstone.reason == "Renamed" or (
+                    tombstone.reason == "Moved" and tombstone.ref_name in current_groups
+                ):
+                    # A group moved or renamed within or into the profile drags unchanged items along
+                    return {"full_resync": True, "version": version}
+                if tombstone.ref_name not in current_groups:
+                    removed_groups.append(tombstone.ref_name)
+
+        return {
+            "full_resync": False,
+            "version": version,
+            "upserted_groups": upserted_groups,
+            "removed_groups": list(dict.fromkeys(removed_groups)),
+            "upserted_items": upserted_items,
+            "removed_items": list(dict.fromkeys(removed_items)),
+        }
+
+    def record_tombstone(self, ref_doctype: str, ref_name: str, reason: str, item_group: Optional[str] = None) -> None:
+        self.repo.add_tombstone(ref_doctype, ref_name, reason, item_group)
+
+    def record_rename(self, ref_doctype: str, old: str, new: str, item_group: Optional[str] = None) -> None:
+        """
+        Tombstone the old name and bump the renamed document's `modified`, which
+        a rename leaves untouched, so the next delta sends it under its new name.
+        """
+        self.repo.add_tombstone(ref_doctype, old, "Renamed", item_group)
+        self.repo.touch(ref_doctype, new)
+
+    def purge_tombstones(self) -> None:
+        self.repo.purge_tombstones(add_days(now(), -TOMBSTONE_RETENTION_DAYS))
+
+    def _build_snapshot(self, pos_profile: str) -> Optional[Dict]:
+        rows = self.repo.pos_profile_catalog_rows(pos_profile)
+        if not rows:
+            return None
+
+        catalog = build_group_tree(rows, parent=None)
+        snapshot = {
+            "pos_profile": pos_profile,
+            "version": self._version(catalog),
+            "built_at": str(now_datetime()),
+            "catalog": catalog,
+        }
+        frappe.cache().set_value(SNAPSHOT_KEY + pos_profile, snapshot, expires_in_sec=SNAPSHOT_TTL)
+        return snapshot
+
+    def _version(self, catalog) -> str:
+        payload = json.dumps(catalog, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _acquire_build_lock(self, pos_profile: str) -> bool:
+        key = frappe.cache().make_key(SNAPSHOT_LOCK_KEY + pos_profile)
+        return bool(frappe.cache().set(key, 1, ex=BUILD_LOCK_TTL, nx=True))
+
+    def _release_build_lock(self, pos_profile: str) -> None:
+        frappe.cache().delete(frappe.cache().make_key(SNAPSHOT_LOCK_KEY + pos_profile))
@@ -0,0 +1,50 @@
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Per-name circuit state over a pluggable store.
+
+    A circuit opens after `failure_threshold` consecutive failures. Once
+    `reset_timeout` seconds have passed it reads as half-open, letting traffic
+    through again: the next success closes it, the next failure reopens it.
+
+    `store` needs get(name) -> dict or None and set(name, dict); the state is
+    kept there so every worker sees the same circuits.
+    """
+
+    def __init__(self, store, failure_threshold=3, reset_timeout=30.0, clock=time.time):
+        self.store = store
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+    def state(self, name):
+        state = self.store.get(name) or {'state': CLOSED, 'failures': 0, 'opened_at': None, 'last_error': None}
+        if state['state'] == OPEN and self.clock() - state['opened_at'] >= self.reset_timeout:
+            state = dict(state, state=HALF_OPEN)
+        return state
+
+    def allow(self, name):
+        return self.state(name)['state'] != OPEN
+
+    def record_success(self, name):
+        state = self.store.get(name)
+        if state and state['state'] == CLOSED and not state['failures']:
+            return
+        self.store.set(name, {'state': CLOSED, 'failures': 0, 'opened_at': None, 'last_error': None})
+
+    def record_failure(self, name, error=None):
+        state = self.state(name)
+        failures = state['failures'] + 1
+        opened = state['state'] == HALF_OPEN or failures >= self.failure_threshold
+        self.store.set(name, {
+            'state': OPEN if opened else CLOSED,
+            'failures': failures,
+            'opened_at': self.clock() if opened else None,
+            'last_error': error,
+        })
@@ -0,0 +1,81 @@
+import hashlib
+import json
+
+
+def parse_print_classes(printer_map_rows):
+    """
+    Merge the `print_classes` of printer map rows into one
+    {print_class: printer info} dict. The view returns them as JSON text.
+    """
+    print_classes = {}
+    for row in printer_map_rows:
+        classes = row['print_classes']
+        if isinstance(classes, str):
+            classes = json.loads(classes) if classes else {}
+        print_classes.update(classes or {})
+    return print_classes
+
+
+def route_lines(lines, print_classes, header=None):
+    """
+    Group invoice lines into one print job per preparation printer.
+
+    Each line is looked up once in `print_classes` (from `parse_print_classes`),
+    so routing is linear in the number of lines whatever the number of printers.
+
+    Args:
+        lines: Rows with name, parent, item_code, item_name, qty, uom and a
+            resolved print_class, in print order
+        print_classes: {print_class: {preparation_printer, connection_info,
+            backup_printer, backup_connection_info}}
+        header: Invoice fields copied onto every job (table_number, room_number, ...)
+
+    Returns:
+        (jobs, unrouted): jobs ordered by first appearance of their printer, and
+        lines whose print_class is empty or has no printer on this device.
+    """
+    jobs = {}
+    unrouted = []
+
+    for line in lines:
+        printer = print_classes.get(line['print_class']) if line['print_class'] else None
+        if not printer:
+            unrouted.append(line)
+            continue
+
+        job = jobs.get(printer['preparation_printer'])
+        if job is None:
+            job = {
+                **(header or {}),
+                'preparation_printer': printer['preparation_printer'],
+                'connection_info': printer['connection_info'],
+                'backup_printer': printer.get('backup_printer'),
+                'backup_connection_info': printer.get('backup_connection_info'),
+                'print_classes': [],
+                'lines': [],
+            }
+            jobs[printer['preparation_printer']] = job
+
+        if line['print_class'] not in job['print_classes']:
+            job['print_classes'].append(line['print_class'])
+        job['lines'].append({
+            'item_row': line['name'],
+            'item_code': line['item_code'],
+            'item_name': line['item_name'],
+            'qty': line['qty'],
+            'uom': line['uom'],
+            'print_class': line['print_class'],
+        })
+
+    return list(jobs.values()), unrouted
+
+
+def job_key(invoice, lines, printer):
+    """
+    Identity of a print job, used to collapse retries: the invoice, printer and
+    each line's row, item_code and qty, in any order. Sending the same lines
+    again gives the same key; a changed qty on the same row gives a new one.
+    """
+    rows = sorted(f"{line['item_row']}:{line['item_code']}:{line['qty']}" for line in lines)
+    raw = "\x1f".join([invoice, printer, *rows])
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
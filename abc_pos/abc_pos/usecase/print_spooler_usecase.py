@@ -0,0 +1,175 @@
+import json
+import frappe
+from datetime import timedelta
+from typing import Dict, List, Optional
+from frappe.utils import cint, flt, now_datetime
+from ..repo.print_job_repo import PrintJobRepository
+from .kitchen_routing import job_key
+from .print_transport import DEFAULT_PORT, PrintSpooler, render_ticket
+from .printer_health_usecase import PrinterHealthUseCase
+
+JOURNAL_BATCH_SIZE = 500
+# Slack on top of the longest possible delivery round before a Printing job counts as abandoned
+STALE_PRINTING_MARGIN = timedelta(seconds=30)
+
+
+class PrintSpoolerUseCase:
+    def __init__(self, repo: PrintJobRepository, health: PrinterHealthUseCase) -> None:
+        self.repo = repo
+        self.health = health
+
+    def queue_jobs(self, routed: Dict, retry_failed: bool = False) -> List[Dict]:
+        """
+        Journal the jobs of a `route_kitchen_tickets` result and start a worker.
+
+        Jobs are only appended to a Redis buffer here; the worker writes them to
+        Print Job in batches, keeping database writes off the ordering path. Each
+        job is named by its dedupe key (`job_key`), so sending the same lines
+        again returns the same names and never prints twice. `retry_failed`
+        (an explicit reprint) puts jobs that already ended as Failed back in the queue.
+        """
+        queued_at, owner = now_datetime(), frappe.session.user
+        jobs = [
+            {
+                "name": job_key(routed["invoice"], job["lines"], job["preparation_printer"]),
+                "pos_invoice": routed["invoice"],
+                "cashier_device": routed.get("cashier_device"),
+                "preparation_printer": job["preparation_printer"],
+                "job_data": json.dumps(job, default=str),
+                "queued_at": queued_at,
+                "owner": owner,
+            }
+            for job in routed["jobs"]
+        ]
+        if not jobs:
+            return []
+
+        self.repo.buffer_jobs(jobs)
+        if retry_failed:
+            self.repo.requeue_failed([job["name"] for job in jobs])
+        frappe.enqueue(
+            "abc_pos.abc_pos.events.printing.process_print_queue",
+            queue="short",
+            enqueue_after_commit=True,
+        )
+        return [
+            {"name": job["name"], "preparation_printer": job["preparation_printer"], "status": "Queued"}
+            for job in jobs
+        ]
+
+    def flush(self) -> int:
+        """
+        Move buffered jobs into Print Job, JOURNAL_BATCH_SIZE rows per INSERT.
+        Entries leave the buffer only after their batch is committed, and
+        re-inserting a batch is harmless, so a crash here loses nothing.
+        Flushes run concurrently (every queue worker and the sweep flush):
+        each only drops the entries it read, and only if no other flush
+        dropped them first. Returns the number of entries this call dropped.
+        """
+        flushed = 0
+        while True:
+            entries = self.repo.buffered_entries(JOURNAL_BATCH_SIZE)
+            if not entries:
+                return flushed
+            self.repo.insert_jobs([json.loads(entry) for entry in entries])
+            frappe.db.commit()
+            dropped = self.repo.drop_buffered(entries)
+            if not dropped:
+                # Another flush moved this batch first; the rest is its job
+                return flushed
+            flushed += dropped
+
+    def process(self, names: Optional[List[str]] = None) -> int:
+        """
+        Claim queued jobs (only `names` when given), deliver them in parallel and
+        record each outcome. Returns the number of jobs handled.
+
+        Each round claims one job per delivery thread, so a claimed job is sent
+        within `stale_after` of its claim and `sweep` never takes it back while
+        it is still being delivered.
+        """
+        spooler = self.spooler()
+        self.flush()
+        handled = 0
+        while True:
+            jobs = self.repo.claim(spooler.max_workers, names)
+            # Commit the claim before the slow network part so other workers skip these jobs
+            frappe.db.commit()
+            if not jobs:
+                return handled
+
+            printers = self.repo.printer_targets([job.preparation_printer for job in jobs])
+            deliveries = {}
+            for job in jobs:
+                # A malformed job fails on its own instead of stranding the whole claim in Printing
+                try:
+                    payload = render_ticket(json.loads(job.job_data))
+                except Exception as e:
+                    self.repo.save_result(job.name, "Failed", None, 0, f"Could not render ticket: {e}")
+                    continue
+                deliveries[job.name] = (payload, self.targets(printers.get(job.preparation_printer)))
+
+            results = spooler.deliver_all(deliveries)
+            for name, result in results.items():
+                self.repo.save_result(
+                    name, "Printed" if result.ok else "Failed", result.printer, result.attempts, result.error
+                )
+                self.health.record_delivery(result.printer, result.failed_printers, result.error)
+            frappe.db.commit()
+            handled += len(jobs)
+
+    def spooler(self) -> PrintSpooler:
+        return PrintSpooler(
+            max_workers=cint(frappe.conf.get("abc_pos_print_workers")) or 8,
+            retries=cint(frappe.conf.get("abc_pos_print_retries") or 2),
+            connect_timeout=flt(frappe.conf.get("abc_pos_print_connect_timeout")) or 2.0,
+            write_timeout=flt(frappe.conf.get("abc_pos_print_write_timeout")) or 5.0,
+        )
+
+    def stale_after(self) -> timedelta:
+        """
+        How long a job may stay in Printing: one full delivery round with every
+        attempt on primary and backup timing out, plus a margin.
+        """
+        spooler = self.spooler()
+        return timedelta(seconds=spooler.max_seconds(spooler.max_workers)) + STALE_PRINTING_MARGIN
+
+    def targets(self, printer: Optional[Dict]) -> List[tuple]:
+        """
+        Primary then fallback printer as (name, host, port) for `deliver`,
+        without printers whose circuit is open.
+        """
+        if not printer:
+            return []
+        targets = [(printer.name, printer.ip_adress, cint(printer.port_number) or DEFAULT_PORT)]
+        if printer.backup_printer:
+            targets.append((printer.backup_printer, printer.backup_ip, cint(printer.backup_port) or DEFAULT_PORT))
+        return self.health.available(targets)
+
+    def sweep(self) -> None:
+        """Requeue jobs stuck in Printing and deliver anything still queued."""
+        self.flush()
+        self.repo.requeue_stale(now_datetime() - self.stale_after())
+        frappe.db.commit()
+        if self.repo.has_queued():
+            self.process()
+
+    def replay(self, include_failed: bool = False, force: bool = False) -> int:
+        """
+        Resend every unacknowledged job after a restart: buffered jobs, jobs a
+        dead worker left in Printing and, optionally, failed jobs. Printed jobs
+        are acknowledged and are not sent again.
+
+        Only jobs in Printing for longer than `stale_after` are taken back, so
+        jobs a live worker is sending are not printed twice; `force` takes back
+        all of them, for when no worker is running.
+        """
+        self.flush()
+        self.repo.requeue_stale(None if force else now_datetime() - self.stale_after(), include_failed)
+        frappe.db.commit()
+        return self.process()
+
+    def statuses(self, names: List[str]) -> List[Dict]:
+        """Status of each job; jobs still in the journal buffer read as Queued."""
+        found = {row.name: row for row in self.repo.statuses(names)}
+        return [found.get(name) or {"name": name, "status": "Queued"} for name in names]
@@ -0,0 +1,133 @@
+import math
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ESC_INIT = b'\x1b@'
+ESC_BOLD_ON = b'\x1bE\x01'
+ESC_BOLD_OFF = b'\x1bE\x00'
+ESC_DOUBLE_ON = b'\x1d!\x11'
+ESC_DOUBLE_OFF = b'\x1d!\x00'
+ESC_FEED_CUT = b'\n\n\n\x1dV\x00'
+
+DEFAULT_PORT = 9100
+
+
+def render_ticket(job, encoding='utf-8'):
+    """
+    Raw ESC/POS bytes for a kitchen ticket built by `route_lines`:
+    a header with printer, table and invoice, one line per item, then a cut.
+    """
+    def text(value):
+        return str(value).encode(encoding, errors='replace')
+
+    out = [ESC_INIT, ESC_DOUBLE_ON, text(job.get('preparation_printer') or ''), b'\n', ESC_DOUBLE_OFF]
+    for label, key in (('Table', 'table_number'), ('Room', 'room_number'), ('Invoice', 'invoice')):
+        if job.get(key):
+            out += [text(f'{label}: {job[key]}'), b'\n']
+    out.append(b'-' * 32 + b'\n')
+    for line in job.get('lines') or []:
+        qty = line['qty']
+        qty = int(qty) if float(qty).is_integer() else qty
+        out += [ESC_BOLD_ON, text(f'{qty} x '), ESC_BOLD_OFF, text(line.get('item_name') or line['item_code']), b'\n']
+    out.append(ESC_FEED_CUT)
+    return b''.join(out)
+
+
+def send_raw(host, port, payload, connect_timeout=2.0, write_timeout=5.0):
+    """Write `payload` to a raw TCP printer port (JetDirect / 9100)."""
+    with socket.create_connection((host, port), timeout=connect_timeout) as conn:
+        conn.settimeout(write_timeout)
+        conn.sendall(payload)
+        conn.shutdown(socket.SHUT_WR)
+
+
+def probe(host, port, timeout=1.0):
+    """True when the printer port accepts a TCP connection; nothing is printed."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class DeliveryResult:
+    __slots__ = ('ok', 'printer', 'attempts', 'error', 'failed_printers')
+
+    def __init__(self, ok, printer, attempts, error=None, failed_printers=()):
+        self.ok = ok
+        self.printer = printer
+        self.attempts = attempts
+        self.error = error
+        self.failed_printers = list(failed_printers)
+
+    def __repr__(self):
+        return f'DeliveryResult(ok={self.ok}, printer={self.printer!r}, attempts={self.attempts}, error={self.error!r})'
+
+
+def deliver(payload, targets, retries=2, backoff=0.2, connect_timeout=2.0, write_timeout=5.0, send=send_raw):
+    """
+    Send `payload` to the first target that accepts it.
+
+    Args:
+        targets: [(printer_name, host, port), ...], primary first then backups;
+            targets without a host are skipped
+        retries: extra attempts per target after the first, `backoff` seconds apart
+
+    Returns:
+        DeliveryResult with the printer that printed (or the last error), and
+        the printers that failed every attempt on the way.
+    """
+    attempts = 0
+    errors = []
+    failed = []
+    for name, host, port in targets:
+        if not host:
+            continue
+        for attempt in range(retries + 1):
+            attempts += 1
+            try:
+                send(host, port, payload, connect_timeout, write_timeout)
+                return DeliveryResult(True, name, attempts, failed_printers=failed)
+            except OSError as e:
+                errors.append(f'{name}: {e}')
+                if attempt < retries:
+                    time.sleep(backoff)
+        failed.append(name)
+    return DeliveryResult(
+        False, None, attempts, '; '.join(errors) or 'No printer address configured', failed_printers=failed
+    )
+
+
+class PrintSpooler:
+    """
+    Thread pool delivering tickets concurrently, so one slow printer does not
+    hold up tickets for the others.
+    """
+
+    def __init__(self, max_workers=8, **deliver_options):
+        self.max_workers = max_workers
+        self.deliver_options = deliver_options
+
+    def deliver_all(self, jobs):
+        """
+        Deliver {job_id: (payload, targets)} and return {job_id: DeliveryResult}.
+        """
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = {
+                job_id: pool.submit(deliver, payload, targets, **self.deliver_options)
+                for job_id, (payload, targets) in jobs.items()
+            }
+            return {job_id: future.result() for job_id, future in futures.items()}
+
+    def max_seconds(self, jobs, targets=2):
+        """
+        Upper bound on how long `deliver_all` runs for `jobs` jobs of up to
+        `targets` printers each, when every attempt times out.
+        """
+        options = self.deliver_options
+        attempt = options.get('connect_timeout', 2.0) + options.get('write_timeout', 5.0) + options.get('backoff', 0.2)
+        per_job = targets * (options.get('retries', 2) + 1) * attempt
+        return math.ceil(jobs / self.max_workers) * per_job
@@ -0,0 +1,84 @@
+import frappe
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from frappe.utils import cint, flt, now
+from ..repo.printing_repo import PrintingRepository
+from .circuit_breaker import CircuitBreaker
+from .print_transport import probe
+
+CIRCUIT_KEY = "abc_pos:printer_circuit:"
+PROBED_AT_KEY = "abc_pos:printer_probed_at"
+PROBE_TIMEOUT = 1.0
+
+
+class RedisCircuitStore:
+    def get(self, name: str) -> Optional[Dict]:
+        return frappe.cache().get_value(CIRCUIT_KEY + name)
+
+    def set(self, name: str, state: Dict) -> None:
+        frappe.cache().set_value(CIRCUIT_KEY + name, state)
+
+
+class PrinterHealthUseCase:
+    def __init__(self, repo: PrintingRepository) -> None:
+        self.repo = repo
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return CircuitBreaker(
+            RedisCircuitStore(),
+            failure_threshold=cint(frappe.conf.get("abc_pos_printer_failure_threshold")) or 3,
+            reset_timeout=flt(frappe.conf.get("abc_pos_printer_reset_timeout")) or 30.0,
+        )
+
+    def probe_all(self) -> None:
+        """
+        Open a TCP connection to every Preparation Printer in parallel and feed
+        the outcome to its circuit, so a dead printer is skipped before any
+        ticket has to time out on it.
+        """
+        printers = [printer for printer in self.repo.preparation_printers() if printer.ip_adress]
+        if not printers:
+            return
+        with ThreadPoolExecutor(max_workers=min(16, len(printers))) as pool:
+            reachable = list(pool.map(
+                lambda printer: probe(printer.ip_adress, cint(printer.port_number) or 9100, PROBE_TIMEOUT),
+                printers,
+            ))
+
+        breaker = self.breaker
+        for printer, ok in zip(printers, reachable):
+            if ok:
+                breaker.record_success(printer.name)
+            else:
+                breaker.record_failure(printer.name, f"{printer.ip_adress}:{printer.port_number} unreachable")
+        frappe.cache().set_value(PROBED_AT_KEY, now())
+
+    def record_delivery(self, printed_on: Optional[str], failed_printers: List[str], error: Optional[str]) -> None:
+        breaker = self.breaker
+        for name in failed_printers:
+            breaker.record_failure(name, error)
+        if printed_on:
+            breaker.record_success(printed_on)
+
+    def available(self, targets: List[tuple]) -> List[tuple]:
+        """
+        Drop targets whose circuit is open, so delivery goes straight to the
+        fallback printer. If every target is open, try them all anyway.
+        """
+        breaker = self.breaker
+        return [target for target in targets if breaker.allow(target[0])] or targets
+
+    def status(self) -> List[Dict]:
+        breaker = self.breaker
+        probed_at = frappe.cache().get_value(PROBED_AT_KEY)
+        return [
+            {
+                "printer": printer.name,
+                "address": f"{printer.ip_adress}:{printer.port_number}",
+                "fallback_printer": printer.fallback_printer,
+                "probed_at": probed_at,
+                **breaker.state(printer.name),
+            }
+            for printer in self.repo.preparation_printers()
+        ]
@@ -1,18 +1,61 @@
 import frappe
-from typing import List, Optional
+from typing import Dict, List, Optional
 from ..repo.printing_repo import PrintingRepository, CashierDevicePrintersMap
+from .kitchen_routing import parse_print_classes, route_lines
+from .two_tier_cache import TwoTierCache
+
+ALL_DEVICES = "__all__"
+# Printer changes reach other workers within PRINTER_MAP_LOCAL_TTL seconds
+PRINTER_MAP_LOCAL_TTL = 30
 
 
 class PrintingUseCase:
     def __init__(self, repo: PrintingRepository) -> None:
         self.repo = repo
+        self.printer_maps = TwoTierCache("abc_pos:printer_map", local_ttl=PRINTER_MAP_LOCAL_TTL)
 
     def get_cashier_printers_cache(
         self, cashier_device_name: Optional[str] = None
     ) -> List[CashierDevicePrintersMap]:
-        if cashier_device_name and not self._validate_cashier_device(cashier_device_name):
-            return []
-        return self.repo.get_cashier_device_printers_map(cashier_device_name)
+        return self.get_cashier_printers_entry(cashier_device_name)["value"]
+
+    def get_cashier_printers_entry(self, cashier_device_name: Optional[str] = None) -> Dict:
+        """
+        {"version", "value"} of a device's printer map (all devices when no name
+        is given), precomputed from `cashier_device_printers_map` on first use.
+        An unknown device maps to [] since the view has no row for it.
+        """
+        return self.printer_maps.get_entry(
+            cashier_device_name or ALL_DEVICES,
+            lambda: self.repo.get_cashier_device_printers_map(cashier_device_name),
+        )
+
+    def route_kitchen_tickets(
+        self, invoice_id: str, cashier_device_name: str, item_row_ids: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Turn an invoice's lines (or only `item_row_ids`, e.g. rows just added)
+        into one print job per preparation printer of the device. Lines are
+        loaded with their print_class in one query and routed against the
+        cached printer map, so the cost does not grow with queries per line.
+        """
+        header = self.repo.invoice_print_header(invoice_id)
+        if not header:
+            frappe.throw(f"POS Invoice {invoice_id} not found", frappe.DoesNotExistError)
+
+        lines = self.repo.invoice_lines_for_printing(invoice_id, item_row_ids)
+        print_classes = parse_print_classes(self.get_cashier_printers_cache(cashier_device_name))
+        jobs, unrouted = route_lines(lines, print_classes, header)
+        return {
+            "invoice": invoice_id,
+            "cashier_device": cashier_device_name,
+            "jobs": jobs,
+            "unrouted": [
+                {"item_row": line["name"], "item_code": line["item_code"], "print_class": line["print_class"]}
+                for line in unrouted
+            ],
+        }
 
-    def _validate_cashier_device(self, cashier_device_name: str) -> bool:
-        return bool(frappe.db.exists("Cashier Device", cashier_device_name))
+    def invalidate_printer_maps(self) -> None:
+        # A printer or production area can be shared by many devices, so drop every map
+        self.printer_maps.invalidate()
@@ -0,0 +1,44 @@
+import frappe
+from typing import Dict, List, Optional
+from ..repo.report_repo import ITEM_SECTION_KEYS, ReportRepository
+
+REPORT_SECTIONS = (*ITEM_SECTION_KEYS, "mode_of_payment")
+Z_REPORT_KEY = "abc_pos:z_report:"
+Z_REPORT_TTL = 7 * 24 * 60 * 60
+
+
+class ReportUseCase:
+    def __init__(self, repo: ReportRepository) -> None:
+        self.repo = repo
+
+    def x_report(self, session: str, sections: Optional[List[str]] = None) -> Dict:
+        """Live totals of a session grouped by each requested section."""
+        sections = list(sections or REPORT_SECTIONS)
+        unknown = set(sections) - set(REPORT_SECTIONS)
+        if unknown:
+            frappe.throw(f"Unknown report sections {sorted(unknown)}, expected some of {REPORT_SECTIONS}")
+
+        report = {"session": session, "sections": {}}
+        for section in sections:
+            if section == "mode_of_payment":
+                report["sections"][section] = self.repo.payment_section(session)
+            else:
+                report["sections"][section] = self.repo.item_section(session, section)
+        return report
+
+    def z_report(self, session: str) -> Dict:
+        """
+        Final report of a closed session with every section. Closed sessions
+        no longer change, so the report is built once and then served from Redis.
+        """
+        if frappe.db.get_value("POS Session", session, "session_status") != "Closed":
+            frappe.throw(f"POS Session {session} is not closed, run an X report instead")
+
+        report = frappe.cache().get_value(Z_REPORT_KEY + session)
+        if report is None:
+            report = self.x_report(session)
+            frappe.cache().set_value(Z_REPORT_KEY + session, report, expires_in_sec=Z_REPORT_TTL)
+        return report
+
+    def invalidate_z_report(self, session: str) -> None:
+        frappe.cache().delete_value(Z_REPORT_KEY + session)
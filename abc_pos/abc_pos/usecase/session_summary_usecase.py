@@ -0,0 +1,139 @@
+import frappe
+from typing import Dict, Iterable, List, Tuple
+from frappe.utils import add_days, flt, now_datetime
+from ..repo.session_summary_repo import SUMMARY_TOTAL_FIELDS, SessionSummaryRepository
+
+COUNT_FIELDS = ("invoice_count", "item_lines", "void_count")
+RECONCILE_LOOKBACK_DAYS = 1
+
+
+class SessionSummaryUseCase:
+    def __init__(self, repo: SessionSummaryRepository) -> None:
+        self.repo = repo
+
+    def apply_invoice(self, doc, sign: int) -> None:
+        """
+        Add (sign=1, on submit) or remove (sign=-1, on cancel) an invoice's
+        contribution to its session summary, inside the invoice's transaction.
+        """
+        session = doc.get("pos_session")
+        if not session:
+            return
+
+        items = doc.get("items") or []
+        totals = {
+            "invoice_count": sign,
+            "item_lines": sign * len(items),
+            "item_qty": sign * sum(flt(item.qty) for item in items),
+            "grand_total": sign * flt(doc.grand_total),
+            "paid_amount": sign * flt(doc.paid_amount),
+            "change_amount": sign * flt(doc.get("change_amount")),
+        }
+        payments: Dict[str, float] = {}
+        for pay in doc.get("payments") or []:
+            payments[pay.mode_of_payment] = payments.get(pay.mode_of_payment, 0) + sign * flt(pay.amount)
+
+        self.repo.apply_delta(session, totals, payments)
+
+    def record_voids(self, voided: Iterable[Tuple[str, float]]) -> None:
+        """Count voided (invoice, qty) lines against their invoices' sessions."""
+        voided = list(voided)
+        sessions = self.repo.invoice_sessions([invoice for invoice, _ in voided])
+
+        per_session: Dict[str, Dict] = {}
+        for invoice, qty in voided:
+            session = sessions.get(invoice)
+            if not session:
+                continue
+            totals = per_session.setdefault(session, {"void_count": 0, "void_qty": 0})
+            totals["void_count"] += 1
+            # The void bin stores whole quantities
+            totals["void_qty"] += int(flt(qty))
+
+        for session, totals in per_session.items():
+            self.repo.apply_delta(session, totals)
+
+    def summary(self, session: str) -> Dict:
+        summary = self.repo.get(session)
+        if summary:
+            return summary
+        empty = frappe._dict({field: 0 for field in SUMMARY_TOTAL_FIELDS}, pos_session=session)
+        empty.payments = {}
+        return empty
+
+    def closing_reconciliation(
+        self, summary: Dict, opening: Dict[str, float], counted: Dict[str, float], closing_cash: float = 0.0
+    ) -> List[Dict]:
+        """
+        payment_reconciliation rows for the session's POS Closing Entry.
+
+        Expected is the opening balance plus the session's payments, less the
+        change handed back for cash modes. Closing is what the cashier counted:
+        `counted[mode]`, else `closing_cash` for cash modes. A shortage or
+        overage therefore shows up as a difference; only modes nobody counted
+        (card, voucher, ...) close at their expected amount.
+        """
+        rows = []
+        for mode in dict.fromkeys([*opening, *summary.payments]):
+            expected = flt(opening.get(mode)) + flt(summary.payments.get(mode))
+            is_cash = _is_cash(mode)
+            if is_cash:
+                expected -= flt(summary.change_amount)
+            if mode in counted:
+                closing = flt(counted[mode])
+            elif is_cash:
+                closing = flt(closing_cash)
+            else:
+                closing = expected
+            rows.append({
+                "mode_of_payment": mode,
+                "opening_amount": flt(opening.get(mode)),
+                "expected_amount": expected,
+                "closing_amount": closing,
+                "difference": closing - expected,
+            })
+        return rows
+
+    def reconcile(self, session: str) -> Dict:
+        """
+        Compare the stored summary with totals recomputed from the raw tables,
+        and correct any drift by applying the difference as one more delta.
+        """
+        stored = self.summary(session)
+        actual = self.repo.compute_from_invoices(session)
+
+        totals = {field: flt(actual[field]) - flt(stored[field]) for field in SUMMARY_TOTAL_FIELDS}
+        payments = {
+            mode: flt(actual.payments.get(mode)) - flt(stored.payments.get(mode))
+            for mode in set(actual.payments) | set(stored.payments)
+        }
+        totals = {field: diff for field, diff in totals.items() if not _is_zero(field, diff)}
+        payments = {mode: diff for mode, diff in payments.items() if not _is_zero("amount", diff)}
+
+        status = "Matched"
+        if totals or payments:
+            status = "Corrected"
+            self.repo.apply_delta(session, totals, payments)
+            frappe.log_error(
+                f"POS Session Summary {session} drifted and was corrected: {totals} payments {payments}",
+                "POS Session Summary Reconciliation",
+            )
+        self.repo.mark_reconciled(session, status)
+        return {"session": session, "status": status, "differences": totals, "payment_differences": payments}
+
+    def reconcile_recent(self) -> List[Dict]:
+        results = []
+        for session in self.repo.sessions_to_reconcile(add_days(now_datetime(), -RECONCILE_LOOKBACK_DAYS)):
+            results.append(self.reconcile(session))
+            frappe.db.commit()
+        return results
+
+
+def _is_cash(mode_of_payment: str) -> bool:
+    return frappe.get_cached_value("Mode of Payment", mode_of_payment, "type") == "Cash"
+
+
+def _is_zero(field: str, diff: float) -> bool:
+    if field in COUNT_FIELDS:
+        return diff == 0
+    return abs(diff) < 0.005
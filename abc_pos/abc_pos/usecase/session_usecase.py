@@ -0,0 +1,34 @@
+import frappe
+from typing import Dict, Optional
+from ..repo.pos_session_repo import PosSessionRepository
+
+ACTIVE_SESSION_KEY = "abc_pos:active_session:"
+ACTIVE_SESSION_TTL = 12 * 60 * 60
+
+
+class SessionUseCase:
+    def __init__(self, repo: PosSessionRepository) -> None:
+        self.repo = repo
+
+    def get_active(self, user: str) -> Optional[Dict]:
+        """
+        Return the user's open POS Session, from Redis when cached.
+        "No open session" is cached too, so only a miss queries the database.
+        """
+        cached = frappe.cache().get_value(ACTIVE_SESSION_KEY + user)
+        if cached is not None:
+            return frappe._dict(cached["session"]) if cached["session"] else None
+
+        session = self.repo.session_find_active({"session_status": "Open", "created_by": user})
+        self.set_active(user, session)
+        return session
+
+    def set_active(self, user: str, session: Optional[Dict]) -> None:
+        frappe.cache().set_value(
+            ACTIVE_SESSION_KEY + user,
+            {"session": dict(session) if session else None},
+            expires_in_sec=ACTIVE_SESSION_TTL,
+        )
+
+    def evict(self, user: str) -> None:
+        frappe.cache().delete_value(ACTIVE_SESSION_KEY + user)
@@ -0,0 +1,75 @@
+import threading
+import time
+import frappe
+from typing import Any, Callable, Dict, Optional
+
+
+class TwoTierCache:
+    """
+    Process-local TTL cache in front of Redis.
+
+    Reads within `local_ttl` seconds never leave the process; after that the
+    entry is re-read from Redis, and only a Redis miss calls the loader.
+    `invalidate` drops the Redis entry and this process's copy, so other
+    processes serve the old value for at most `local_ttl` seconds.
+
+    Every entry carries a version that changes whenever it is reloaded, for
+    use as an ETag. With `cache_missing=False` a loader returning None is not
+    stored, so lookups of arbitrary unknown keys cannot fill Redis.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local_ttl: float = 5.0,
+        redis_ttl: int = 60 * 60,
+        max_local_entries: int = 1024,
+        cache_missing: bool = True,
+    ):
+        self.namespace = namespace
+        self.cache_missing = cache_missing
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.max_local_entries = max_local_entries
+        self._local: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        return self.get_entry(key, loader)["value"]
+
+    def get_entry(self, key: str, loader: Callable[[], Any]) -> Dict:
+        """Return {"version", "value"} for `key`, loading it on a miss in both tiers."""
+        local_key = (frappe.local.site, key)
+        now = time.monotonic()
+        hit = self._local.get(local_key)
+        if hit and hit[0] > now:
+            return hit[1]
+
+        entry = frappe.cache().get_value(self._redis_key(key))
+        if entry is None:
+            entry = {"version": frappe.generate_hash(length=12), "value": loader()}
+            if entry["value"] is None and not self.cache_missing:
+                return entry
+            frappe.cache().set_value(self._redis_key(key), entry, expires_in_sec=self.redis_ttl)
+
+        with self._lock:
+            if len(self._local) >= self.max_local_entries:
+                self._local.clear()
+            self._local[local_key] = (now + self.local_ttl, entry)
+        return entry
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key, or the whole namespace when `key` is None."""
+        site = frappe.local.site
+        if key is None:
+            frappe.cache().delete_keys(f"{self.namespace}:")
+            with self._lock:
+                for local_key in [k for k in self._local if k[0] == site]:
+                    self._local.pop(local_key, None)
+        else:
+            frappe.cache().delete_value(self._redis_key(key))
+            with self._lock:
+                self._local.pop((site, key), None)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
@@ -0,0 +1,62 @@
+import click
+import frappe
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
+
+
+@click.command("abc-pos-replay-print-jobs")
+@click.option("--include-failed", is_flag=True, default=False, help="Also resend jobs that ended as Failed")
+@click.option(
+	"--force",
+	is_flag=True,
+	default=False,
+	help="Also resend jobs claimed moments ago; only safe when no worker is running",
+)
+@pass_context
+def replay_print_jobs(context, include_failed=False, force=False):
+	"""Resend kitchen tickets that were never acknowledged, e.g. after a crash or restart."""
+	from abc_pos.abc_pos.api import print_spooler_uc
+
+	for site in context.sites:
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			handled = print_spooler_uc.replay(include_failed=include_failed, force=force)
+			click.echo(f"{site}: replayed {handled} print job(s)")
+		finally:
+			frappe.destroy()
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+@click.command("abc-pos-benchmark-upsert-engines")
+@click.option("--rounds", default=10, type=int, help="Calls per engine and item count")
+@click.option("--dry-run", is_flag=True, default=False, help="Print the timings without changing site config")
+@pass_context
+def benchmark_upsert_engines(context, rounds=10, dry_run=False):
+	"""Time both invoice item upsert engines and make the faster one the site's engine."""
+	from frappe.installer import update_site_config
+
+	from abc_pos.abc_pos.repo.pos_invoice_repo import benchmark_item_upsert_engines, fastest_engine
+
+	for site in context.sites:
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			results = benchmark_item_upsert_engines(rounds=rounds)
+			click.echo(f"{site}\nitems  procedure(ms)  executemany(ms)")
+			for row in results:
+				click.echo(f"{row['items']:<6} {row['procedure']:<14.2f} {row['executemany']:.2f}")
+			engine = fastest_engine(results)
+			if not dry_run:
+				update_site_config("abc_pos_item_upsert_engine", engine)
+			click.echo(f"{site}: abc_pos_item_upsert_engine = {engine}")
+		finally:
+			frappe.destroy()
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+commands = [replay_print_jobs, benchmark_upsert_engines]
@@ -8,6 +8,116 @@ app_license = "mit"
 after_install = "abc_pos.setup.installer.after_install"
 after_migrate = "abc_pos.setup.installer.after_migrate"
 
+doc_events = {
+	"Item": {
+		"on_update": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_item_tombstone",
+		],
+		"on_trash": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_item_tombstone",
+		],
+		"after_rename": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_renamed_item_tombstone",
+		],
+	},
+	"Item Group": {
+		"on_update": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_item_group_tombstone",
+		],
+		"on_trash": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_item_group_tombstone",
+		],
+		"after_rename": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_renamed_item_group_tombstone",
+		],
+	},
+	"Item Price": {
+		"on_update": "abc_pos.abc_pos.events.catalog.invalidate_catalog",
+		"on_trash": [
+			"abc_pos.abc_pos.events.catalog.invalidate_catalog",
+			"abc_pos.abc_pos.events.catalog.record_item_price_tombstone",
+		],
+	},
+	"POS Profile": {
+		"on_update": "abc_pos.abc_pos.events.catalog.invalidate_catalog",
+		"on_trash": "abc_pos.abc_pos.events.catalog.invalidate_catalog",
+	},
+	"POS Session": {
+		"on_update": "abc_pos.abc_pos.events.pos_session.evict_active_session",
+		"on_trash": "abc_pos.abc_pos.events.pos_session.evict_active_session",
+	},
+	"Cashier Device": {
+		"on_update": [
+			"abc_pos.abc_pos.events.cashier_device.invalidate_device",
+			"abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		],
+		"on_trash": [
+			"abc_pos.abc_pos.events.cashier_device.invalidate_device",
+			"abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		],
+		"after_rename": [
+			"abc_pos.abc_pos.events.cashier_device.invalidate_renamed_device",
+			"abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		],
+	},
+	"Preparation Printer": {
+		"on_update": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		"on_trash": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		"after_rename": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+	},
+	"Production Area": {
+		"on_update": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		"on_trash": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+		"after_rename": "abc_pos.abc_pos.events.printing.invalidate_printer_maps",
+	},
+	"User": {
+		"on_update": "abc_pos.abc_pos.events.user.evict_user_caches",
+		"on_trash": "abc_pos.abc_pos.events.user.evict_user_caches",
+	},
+	"System Settings": {
+		"on_update": "abc_pos.abc_pos.events.user.evict_all_bootstraps",
+	},
+	"Currency Exchange": {
+		"on_update": "abc_pos.abc_pos.events.user.evict_currency_list",
+		"on_trash": "abc_pos.abc_pos.events.user.evict_currency_list",
+	},
+	"POS Invoice": {
+		"on_submit": "abc_pos.abc_pos.events.pos_invoice.add_to_session_summary",
+		"on_cancel": "abc_pos.abc_pos.events.pos_invoice.remove_from_session_summary",
+	},
+}
+
+# Background queues
+# -----------------
+# Invoices saved with pos_invoice_upsert(async_submit=1) are submitted on the
+# dedicated "abc_pos_finalize" queue, so checkout never waits behind reports or
+# imports on "default". Declare its worker in common_site_config.json:
+#   "workers": {"abc_pos_finalize": {"timeout": 300}}
+# then `bench setup supervisor` (or `bench worker --queue abc_pos_finalize`).
+# Until then finalisation runs on "default"; site config `abc_pos_finalize_queue`
+# picks another queue.
+
+scheduler_events = {
+	"cron": {
+		"* * * * *": [
+			"abc_pos.abc_pos.events.printing.probe_printers",
+			"abc_pos.abc_pos.events.printing.sweep_print_queue",
+		],
+	},
+	"hourly": [
+		"abc_pos.abc_pos.events.pos_invoice.reconcile_session_summaries",
+	],
+	"daily": [
+		"abc_pos.abc_pos.events.catalog.purge_catalog_tombstones",
+	],
+}
+
 fixtures = [
 	{
 		"doctype": "POS Profile",
@@ -17,5 +17,15 @@ def after_install():
 def after_migrate():
     install_custom_fields(CUSTOMFIELDS_PATH)
     run_sql(SQL_DIR)
+    add_indexes()
+
+
+def add_indexes():
+    # Active-session lookups filter on both columns; add_index skips existing indexes
+    frappe.db.add_index("POS Session", ["created_by", "session_status"], "created_by_session_status")
+    # Session invoice pages are read newest first by (creation, name) within a session
+    frappe.db.add_index("POS Invoice", ["pos_session", "creation", "name"], "pos_session_creation_name")
+    # cashier_login looks users up by code among enabled users
+    frappe.db.add_index("User", ["cashier_code", "enabled"], "cashier_code_enabled")
 
 
@@ -0,0 +1,25 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api.auth import BOOTSTRAP_KEY, bootstrap, evict_bootstrap
+
+
+class TestBootstrap(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        evict_bootstrap("Administrator")
+
+    def test_bundle(self):
+        result = bootstrap()
+
+        self.assertEqual(result["user"]["name"], "Administrator")
+        self.assertIn("System Manager", result["roles"])
+        self.assertIn("catalog_version", result)
+        self.assertIsInstance(result["currencies"], list)
+
+    def test_user_part_cached_until_user_changes(self):
+        bootstrap()
+        self.assertIsNotNone(frappe.cache().get_value(BOOTSTRAP_KEY + "Administrator"))
+
+        frappe.get_doc("User", "Administrator").save(ignore_permissions=True)
+        self.assertIsNone(frappe.cache().get_value(BOOTSTRAP_KEY + "Administrator"))
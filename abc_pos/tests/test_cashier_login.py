@@ -0,0 +1,94 @@
+import os
+import statistics
+import threading
+import time
+import unittest
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api import throttle
+from abc_pos.abc_pos.api.auth import LOGIN_BURST, cashier_login, evict_cashier_token
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+CASHIER_CODE = 987654
+CASHIER_PASSWORD = "4321"
+
+
+def make_cashier(email, code, password):
+    if not frappe.db.exists("User", email):
+        frappe.get_doc({
+            "doctype": "User",
+            "email": email,
+            "first_name": "Test Cashier",
+            "send_welcome_email": 0,
+            "cashier_code": code,
+            "cashier_password": password,
+        }).insert(ignore_permissions=True)
+    evict_cashier_token(email)
+    throttle.reset(f"cashier_login:{code}")
+
+
+class TestCashierLogin(FrappeTestCase):
+    email = "_test_cashier_login@example.com"
+
+    def setUp(self):
+        make_cashier(self.email, CASHIER_CODE, CASHIER_PASSWORD)
+
+    def test_login_issues_cached_token_without_saving_user(self):
+        modified = frappe.db.get_value("User", self.email, "modified")
+        first = cashier_login(CASHIER_CODE, CASHIER_PASSWORD)
+        second = cashier_login(CASHIER_CODE, CASHIER_PASSWORD)
+
+        self.assertTrue(first["success"])
+        self.assertEqual(first["authorization"], second["authorization"])
+        self.assertEqual(frappe.db.get_value("User", self.email, "modified"), modified)
+
+    def test_wrong_password(self):
+        self.assertFalse(cashier_login(CASHIER_CODE, "0000")["success"])
+
+    def test_throttled_after_burst(self):
+        for _ in range(LOGIN_BURST):
+            cashier_login(CASHIER_CODE, "0000")
+        result = cashier_login(CASHIER_CODE, CASHIER_PASSWORD)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(frappe.local.response["http_status_code"], 429)
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkCashierLogin(FrappeTestCase):
+    cashiers = 30
+    rounds = 5
+
+    def setUp(self):
+        for n in range(self.cashiers):
+            make_cashier(f"_test_bench_cashier_{n}@example.com", 900000 + n, CASHIER_PASSWORD)
+        frappe.db.commit()
+
+    def _login_worker(self, site, code, latencies):
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                cashier_login(code, CASHIER_PASSWORD)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            frappe.destroy()
+
+    def test_shift_change_latency(self):
+        # Every cashier logs in at once, rounds times; bursts above LOGIN_BURST are throttled
+        latencies = []
+        threads = [
+            threading.Thread(target=self._login_worker, args=(frappe.local.site, 900000 + n, latencies))
+            for n in range(self.cashiers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"\n{len(latencies)} logins  p50 {statistics.median(latencies) * 1000:.2f}ms  p99 {p99 * 1000:.2f}ms")
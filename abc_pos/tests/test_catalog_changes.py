@@ -0,0 +1,100 @@
+import frappe
+from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now, now_datetime
+
+from abc_pos.abc_pos.repo.catalog_repo import CatalogRepository
+from abc_pos.abc_pos.repo.item_group_repo import ItemGroupRepository
+from abc_pos.abc_pos.usecase.catalog_usecase import CatalogUseCase
+
+ROOT = "_Test Catalog Root"
+OTHER = "_Test Catalog Other"
+
+
+def make_group(name):
+    if not frappe.db.exists("Item Group", name):
+        frappe.get_doc({
+            "doctype": "Item Group", "item_group_name": name, "parent_item_group": "All Item Groups", "is_group": 1,
+        }).insert()
+    return name
+
+
+def backdate(doctype, name, minutes=10):
+    frappe.db.set_value(doctype, name, "modified", add_to_date(now_datetime(), minutes=-minutes), update_modified=False)
+
+
+class TestCatalogChanges(FrappeTestCase):
+    def setUp(self):
+        self.uc = CatalogUseCase(repo=CatalogRepository(), group_repo=ItemGroupRepository())
+        make_group(ROOT)
+        make_group(OTHER)
+        profile = make_pos_profile(do_not_insert=1)
+        profile.append("item_groups", {"item_group": ROOT})
+        profile.insert()
+        self.profile = profile.name
+        backdate("POS Profile", self.profile)
+        backdate("Item Group", ROOT)
+
+    def item(self, code, group=ROOT):
+        make_item(code, {"item_group": group})
+        backdate("Item", code)
+        return code
+
+    def test_upsert_after_since_only(self):
+        self.item("_Test Catalog Old")
+        changed = self.item("_Test Catalog Changed")
+        since = now()
+        frappe.db.set_value("Item", changed, "item_name", "Changed")
+
+        changes = self.uc.changes_since(self.profile, since)
+
+        self.assertFalse(changes["full_resync"])
+        self.assertEqual([item["item_code"] for item in changes["upserted_items"]], [changed])
+
+    def test_since_boundary(self):
+        code = self.item("_Test Catalog Boundary")
+        since = now()
+        # Committed just before the version was handed out: still inside the overlap window
+        backdate("Item", code, minutes=0)
+        self.assertIn(code, [item["item_code"] for item in self.uc.changes_since(self.profile, since)["upserted_items"]])
+        # Older than the overlap window: already synced
+        backdate("Item", code, minutes=1)
+        self.assertNotIn(code, [item["item_code"] for item in self.uc.changes_since(self.profile, since)["upserted_items"]])
+        # Older than tombstone retention: start over
+        self.assertTrue(self.uc.changes_since(self.profile, add_to_date(since, days=-60))["full_resync"])
+
+    def test_delete_is_tombstoned_for_own_profile_only(self):
+        mine = self.item("_Test Catalog Deleted")
+        other = self.item("_Test Catalog Elsewhere", OTHER)
+        since = now()
+        frappe.delete_doc("Item", mine)
+        frappe.delete_doc("Item", other)
+
+        changes = self.uc.changes_since(self.profile, since)
+
+        self.assertEqual(changes["removed_items"], [mine])
+
+    def test_deleted_price_resends_item(self):
+        code = self.item("_Test Catalog Priced")
+        price = frappe.get_doc({
+            "doctype": "Item Price", "item_code": code, "price_list": "Standard Selling", "price_list_rate": 10,
+        }).insert()
+        backdate("Item Price", price.name)
+        since = now()
+        price.delete()
+
+        changes = self.uc.changes_since(self.profile, since)
+
+        self.assertIn(code, [item["item_code"] for item in changes["upserted_items"]])
+
+    def test_rename_removes_old_code(self):
+        code = self.item("_Test Catalog Before")
+        frappe.delete_doc_if_exists("Item", "_Test Catalog After")
+        since = now()
+        frappe.rename_doc("Item", code, "_Test Catalog After")
+
+        changes = self.uc.changes_since(self.profile, since)
+
+        self.assertEqual(changes["removed_items"], [code])
+        self.assertIn("_Test Catalog After", [item["item_code"] for item in changes["upserted_items"]])
@@ -0,0 +1,185 @@
+import os
+import time
+import unittest
+
+from abc_pos.abc_pos.usecase.catalog_tree import build_group_tree, build_nested_group_tree, split_catalog_rows
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+
+
+def legacy_build_group_tree(rows, parent=None):
+    """Previous recursive implementation, kept here as the reference for equality and timing."""
+    tree = []
+    if parent is None:
+        parent_counts = {}
+        for row in rows:
+            if row['parent_group']:
+                parent_counts[row['parent_group']] = parent_counts.get(row['parent_group'], 0) + 1
+        if parent_counts:
+            parent = max(parent_counts, key=parent_counts.get)
+
+    groups_at_level = {}
+    items_by_group = {}
+    for row in rows:
+        group_name = row['item_group_name']
+        parent_group = row['parent_group']
+        if parent_group == parent:
+            if group_name not in groups_at_level:
+                groups_at_level[group_name] = {
+                    'item_group_id': row['item_group_id'],
+                    'item_group_name': group_name,
+                    'parent_group': parent_group,
+                    'items': [],
+                    'sub_groups': []
+                }
+                items_by_group[group_name] = []
+            if row['item_code'] is not None:
+                items_by_group[group_name].append({
+                    'item_code': row['item_code'],
+                    'item_name': row['item_name'],
+                    'description': row['description'],
+                    'stock_uom': row['stock_uom'],
+                    'standard_rate': float(row['standard_rate']) if row['standard_rate'] else 0.0,
+                    'disabled': row['disabled']
+                })
+
+    for group_name, group_data in groups_at_level.items():
+        group_data['items'] = items_by_group[group_name]
+        group_data['sub_groups'] = legacy_build_group_tree(rows, parent=group_name)
+        tree.append(group_data)
+
+    return tree
+
+
+def make_catalog_rows(item_count, items_per_group=20, fan_out=5):
+    """
+    Synthetic v_pos_profile_catalog rows: top level groups under "All Item Groups",
+    each followed by `fan_out - 1` sub groups, with `items_per_group` items per group.
+    """
+    rows = []
+    group_count = max(1, item_count // items_per_group)
+    for index in range(group_count):
+        group = f"Group {index}"
+        top = index - index % fan_out
+        parent = "All Item Groups" if top == index else f"Group {top}"
+
+        for n in range(items_per_group):
+            code = f"ITEM-{index}-{n}"
+            rows.append({
+                'item_group_id': group,
+                'item_group_name': group,
+                'parent_group': parent,
+                'item_code': code,
+                'item_name': code,
+                'description': code,
+                'stock_uom': "Unit",
+                'standard_rate': 10 + n,
+                'disabled': 0,
+            })
+    return rows
+
+
+class TestBuildGroupTree(unittest.TestCase):
+    def test_matches_legacy_builder(self):
+        rows = make_catalog_rows(1000)
+        self.assertEqual(build_group_tree(rows), legacy_build_group_tree(rows))
+
+    def test_explicit_parent(self):
+        rows = make_catalog_rows(200)
+        self.assertEqual(
+            build_group_tree(rows, parent="Group 0"),
+            legacy_build_group_tree(rows, parent="Group 0"),
+        )
+
+    def test_items_and_nesting(self):
+        rows = make_catalog_rows(400, items_per_group=20, fan_out=5)
+        tree = build_group_tree(rows)
+
+        self.assertEqual([g['item_group_name'] for g in tree], ["Group 0", "Group 5", "Group 10", "Group 15"])
+        sub_groups = tree[0]['sub_groups']
+        self.assertEqual([g['item_group_name'] for g in sub_groups], ["Group 1", "Group 2", "Group 3", "Group 4"])
+        self.assertEqual(len(sub_groups[0]['items']), 20)
+        self.assertEqual(sub_groups[0]['items'][1]['standard_rate'], 11.0)
+
+    def test_group_without_items(self):
+        rows = make_catalog_rows(400)
+        rows.append({
+            'item_group_id': "Empty", 'item_group_name': "Empty", 'parent_group': "All Item Groups",
+            'item_code': None, 'item_name': None, 'description': None,
+            'stock_uom': None, 'standard_rate': None, 'disabled': None,
+        })
+        tree = build_group_tree(rows)
+        self.assertEqual(tree[-1]['item_group_name'], "Empty")
+        self.assertEqual(tree[-1]['items'], [])
+
+    def test_empty_rows(self):
+        self.assertEqual(build_group_tree([]), [])
+
+
+class TestBuildNestedGroupTree(unittest.TestCase):
+    groups = [
+        {'name': "Food", 'item_group_name': "Food", 'parent_item_group': "All Item Groups", 'is_group': 1},
+        {'name': "Mains", 'item_group_name': "Mains", 'parent_item_group': "Food", 'is_group': 1},
+        {'name': "Burgers", 'item_group_name': "Burgers", 'parent_item_group': "Mains", 'is_group': 0},
+        {'name': "Drinks", 'item_group_name': "Drinks", 'parent_item_group': "All Item Groups", 'is_group': 0},
+    ]
+    items = [
+        {'name': "Burger", 'item_name': "Burger", 'description': "", 'item_group': "Burgers",
+         'stock_uom': "Unit", 'standard_rate': 50, 'disabled': 0},
+        {'name': "Cola", 'item_name': "Cola", 'description': "", 'item_group': "Drinks",
+         'stock_uom': "Unit", 'standard_rate': None, 'disabled': 0},
+    ]
+
+    def test_nesting_follows_parent_links(self):
+        tree = build_nested_group_tree(["Food", "Drinks"], self.groups, self.items)
+
+        self.assertEqual([g['item_group_id'] for g in tree], ["Food", "Drinks"])
+        burgers = tree[0]['child_groups'][0]['child_groups'][0]
+        self.assertEqual(burgers['item_group_id'], "Burgers")
+        self.assertEqual(burgers['items'][0]['rate'], 50.0)
+        self.assertEqual(tree[1]['items'][0]['rate'], 0.0)
+
+    def test_unknown_root_skipped(self):
+        tree = build_nested_group_tree(["Missing", "Drinks"], self.groups, self.items)
+        self.assertEqual([g['item_group_id'] for g in tree], ["Drinks"])
+
+
+    def test_split_catalog_rows(self):
+        def row(group, parent, level, item_code=None, is_group=1):
+            return {
+                'item_group_id': group, 'item_group_name': group, 'parent_group': parent,
+                'is_group': is_group, 'level': level, 'item_code': item_code, 'item_name': item_code,
+                'description': "", 'stock_uom': "Unit", 'standard_rate': 5, 'disabled': 0,
+            }
+
+        rows = [
+            row("Food", "All Item Groups", 1),
+            row("Mains", "Food", 2),
+            row("Burgers", "Mains", 3, "Burger", 0),
+            row("Burgers", "Mains", 3, "Cheese Burger", 0),
+            row("Drinks", "All Item Groups", 1, "Cola", 0),
+        ]
+        tree = build_nested_group_tree(*split_catalog_rows(rows))
+
+        self.assertEqual([g['item_group_id'] for g in tree], ["Food", "Drinks"])
+        burgers = tree[0]['child_groups'][0]['child_groups'][0]
+        self.assertEqual([i['item_code'] for i in burgers['items']], ["Burger", "Cheese Burger"])
+        self.assertEqual(tree[0]['items'], [])
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkBuildGroupTree(unittest.TestCase):
+    sizes = (1_000, 10_000, 50_000)
+
+    def _time(self, fn, rows):
+        start = time.perf_counter()
+        fn(rows)
+        return time.perf_counter() - start
+
+    def test_build_time_by_catalog_size(self):
+        print("\nrows      linear(s)   legacy(s)   speedup")
+        for size in self.sizes:
+            rows = make_catalog_rows(size)
+            linear = self._time(build_group_tree, rows)
+            legacy = self._time(legacy_build_group_tree, rows)
+            print(f"{len(rows):<9} {linear:<11.4f} {legacy:<11.4f} {legacy / linear:.1f}x")
+            self.assertLess(linear, legacy)
@@ -0,0 +1,59 @@
+import unittest
+
+from abc_pos.abc_pos.usecase.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class DictStore(dict):
+    def set(self, name, state):
+        self[name] = state
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(DictStore(), failure_threshold=3, reset_timeout=30, clock=self.clock)
+
+    def test_opens_after_threshold(self):
+        for _ in range(2):
+            self.breaker.record_failure("Hot Kitchen", "refused")
+        self.assertTrue(self.breaker.allow("Hot Kitchen"))
+
+        self.breaker.record_failure("Hot Kitchen", "refused")
+        self.assertEqual(self.breaker.state("Hot Kitchen")["state"], OPEN)
+        self.assertFalse(self.breaker.allow("Hot Kitchen"))
+
+    def test_half_open_after_timeout(self):
+        for _ in range(3):
+            self.breaker.record_failure("Hot Kitchen")
+        self.clock.now += 30
+
+        self.assertEqual(self.breaker.state("Hot Kitchen")["state"], HALF_OPEN)
+        self.assertTrue(self.breaker.allow("Hot Kitchen"))
+
+    def test_half_open_failure_reopens_and_success_closes(self):
+        for _ in range(3):
+            self.breaker.record_failure("Hot Kitchen")
+        self.clock.now += 30
+        self.breaker.record_failure("Hot Kitchen")
+        self.assertFalse(self.breaker.allow("Hot Kitchen"))
+
+        self.clock.now += 30
+        self.breaker.record_success("Hot Kitchen")
+        self.assertEqual(self.breaker.state("Hot Kitchen"), {
+            "state": CLOSED, "failures": 0, "opened_at": None, "last_error": None,
+        })
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure("Bar")
+        self.breaker.record_failure("Bar")
+        self.breaker.record_success("Bar")
+        self.breaker.record_failure("Bar")
+        self.assertEqual(self.breaker.state("Bar")["failures"], 1)
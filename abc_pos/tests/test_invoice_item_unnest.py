@@ -0,0 +1,168 @@
+import json
+import os
+import time
+import unittest
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+ROW_KEYS = ("name", "item_code", "item_name", "description", "uom", "qty", "rate", "amount", "folio_window")
+
+# The row-by-row unnest_json_silent that pos_invoice_item_unnest replaced, as it
+# shipped, recreated under another name so the benchmark can compare against it.
+BASELINE_UNNEST = """
+CREATE PROCEDURE _abc_pos_baseline_unnest(
+    IN p_json_object JSON
+)
+BEGIN
+    DECLARE done INT DEFAULT FALSE;
+    DECLARE key_name VARCHAR(255);
+    DECLARE array_length INT;
+    DECLARE i INT DEFAULT 0;
+    DECLARE create_sql TEXT DEFAULT 'CREATE TEMPORARY TABLE tmp_unnested (idx INT';
+    DECLARE insert_columns TEXT DEFAULT 'idx';
+    DECLARE insert_values TEXT DEFAULT '';
+
+    DECLARE key_cursor CURSOR FOR
+        SELECT JSON_UNQUOTE(JSON_EXTRACT(JSON_KEYS(p_json_object), CONCAT('$[', n, ']'))) as key_val
+        FROM (SELECT 0 as n UNION SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4
+              UNION SELECT 5 UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9) nums
+        WHERE n < JSON_LENGTH(JSON_KEYS(p_json_object));
+
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+    -- Drop if exists
+    DROP TEMPORARY TABLE IF EXISTS tmp_unnested;
+
+    -- Build CREATE TABLE statement
+    OPEN key_cursor;
+    read_loop: LOOP
+        FETCH key_cursor INTO key_name;
+        IF done THEN
+            LEAVE read_loop;
+        END IF;
+
+        SET create_sql = CONCAT(create_sql, ', ', key_name, ' VARCHAR(255)');
+        SET insert_columns = CONCAT(insert_columns, ', ', key_name);
+    END LOOP;
+    CLOSE key_cursor;
+
+    SET create_sql = CONCAT(create_sql, ') ENGINE=MEMORY');
+
+    -- Create the table
+    SET @sql = create_sql;
+    PREPARE stmt FROM @sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    -- Get array length from first key
+    SET array_length = JSON_LENGTH(JSON_EXTRACT(p_json_object, CONCAT('$.', JSON_UNQUOTE(JSON_EXTRACT(JSON_KEYS(p_json_object), '$[0]')))));
+
+    -- Insert data row by row
+    SET i = 0;
+    WHILE i < array_length DO
+        SET insert_values = CONCAT(i + 1); -- idx value
+
+        -- Reset cursor
+        SET done = FALSE;
+        OPEN key_cursor;
+        read_loop2: LOOP
+            FETCH key_cursor INTO key_name;
+            IF done THEN
+                LEAVE read_loop2;
+            END IF;
+
+            SET insert_values = CONCAT(insert_values, ', ',
+                QUOTE(COALESCE(JSON_UNQUOTE(JSON_EXTRACT(p_json_object, CONCAT('$.', key_name, '[', i, ']'))), '')));
+        END LOOP;
+        CLOSE key_cursor;
+
+        -- Insert the row
+        SET @sql = CONCAT('INSERT INTO tmp_unnested (', insert_columns, ') VALUES (', insert_values, ')');
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SET i = i + 1;
+    END WHILE;
+END
+"""
+
+
+def make_rows(count):
+    return [
+        {
+            "name": f"ROW-{n}",
+            "item_code": f"ITEM-{n}",
+            "item_name": f"Item {n}",
+            "description": "Banquet line " * 40,
+            "uom": "Unit",
+            "qty": 1.125,
+            "rate": 10.5,
+            "amount": None,
+            "folio_window": "",
+        }
+        for n in range(count)
+    ]
+
+
+def make_columns(count, keys=12):
+    return {f"key_{k}": [f"value {k}-{n}" for n in range(count)] for k in range(keys)}
+
+
+class TestInvoiceItemUnnest(FrappeTestCase):
+    def test_typed_rows(self):
+        frappe.db.sql("CALL pos_invoice_item_unnest(%s)", (json.dumps({"items": make_rows(3)}),))
+        rows = frappe.db.sql("SELECT * FROM tmp_unnested ORDER BY idx", as_dict=True)
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0].idx, 1)
+        self.assertEqual(float(rows[0].qty), 1.125)
+        self.assertGreater(len(rows[0].description), 255)
+        self.assertIsNone(rows[0].amount)
+        self.assertIsNone(rows[0].folio_window)
+
+    def test_generic_unnest_has_no_key_limit(self):
+        frappe.db.sql("CALL unnest_json_silent(%s)", (json.dumps(make_columns(4, keys=12)),))
+        rows = frappe.db.sql("SELECT * FROM tmp_unnested ORDER BY idx", as_dict=True)
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[3]["key_11"], "value 11-3")
+
+
+def as_columns(rows):
+    """The column-array payload ({"names": [...], "item_codes": [...]}) the baseline took."""
+    return {f"{key}s": [row[key] for row in rows] for key in ROW_KEYS}
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkInvoiceItemUnnest(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        frappe.db.sql("DROP PROCEDURE IF EXISTS _abc_pos_baseline_unnest")
+        frappe.db.sql(BASELINE_UNNEST)
+
+    @classmethod
+    def tearDownClass(cls):
+        frappe.db.sql("DROP PROCEDURE IF EXISTS _abc_pos_baseline_unnest")
+        super().tearDownClass()
+
+    def _per_call(self, query, payload, rounds=20):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            frappe.db.sql(query, (payload,))
+        return (time.perf_counter() - start) / rounds
+
+    def test_latency_by_item_count(self):
+        print("\nitems  baseline row-by-row(ms)  pos_invoice_item_unnest(ms)  unnest_json_silent(ms)")
+        for count in (10, 100, 1000):
+            # The baseline keeps every value in VARCHAR(255), so give all three the same fitting payload
+            rows = [dict(row, description=row["description"][:255]) for row in make_rows(count)]
+            baseline = self._per_call(
+                "CALL _abc_pos_baseline_unnest(%s)", json.dumps(as_columns(rows)), rounds=3
+            )
+            typed = self._per_call("CALL pos_invoice_item_unnest(%s)", json.dumps({"items": rows}))
+            generic = self._per_call("CALL unnest_json_silent(%s)", json.dumps(as_columns(rows)))
+            print(f"{count:<6} {baseline * 1000:<24.2f} {typed * 1000:<28.2f} {generic * 1000:.2f}")
@@ -0,0 +1,107 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api.item import build_complete_hierarchy, item_group_repo
+from abc_pos.abc_pos.usecase.catalog_tree import build_nested_group_tree, split_catalog_rows
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+
+
+def sort_tree(groups):
+    for group in groups:
+        group["items"] = sorted(group["items"], key=lambda item: item["item_code"])
+        sort_tree(group["child_groups"])
+    return groups
+
+
+def build_cte_hierarchy(root_group_ids):
+    rows = item_group_repo.load_group_catalog(root_group_ids)
+    return build_nested_group_tree(*split_catalog_rows(rows))
+
+
+class MenuTestCase(FrappeTestCase):
+    def make_menu(self, root, depth, items_per_group=2):
+        """Create a chain of `depth` nested Item Groups under `root`, each with a few items."""
+        parent = "All Item Groups"
+        names = []
+        for level in range(depth):
+            name = f"{root} L{level}"
+            if not frappe.db.exists("Item Group", name):
+                frappe.get_doc({
+                    "doctype": "Item Group",
+                    "item_group_name": name,
+                    "parent_item_group": parent,
+                    "is_group": 1,
+                }).insert()
+            for n in range(items_per_group):
+                item_code = f"{name} Item {n}"
+                if not frappe.db.exists("Item", item_code):
+                    frappe.get_doc({
+                        "doctype": "Item",
+                        "item_code": item_code,
+                        "item_name": item_code,
+                        "item_group": name,
+                        "stock_uom": "Nos",
+                        "is_stock_item": 0,
+                    }).insert()
+            names.append(name)
+            parent = name
+        return names
+
+
+class TestItemListQueryCount(MenuTestCase):
+    def count_queries(self, root_group_ids):
+        with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+            hierarchy = build_complete_hierarchy(root_group_ids)
+        return sql.call_count, hierarchy
+
+    def test_query_count_constant_as_tree_grows(self):
+        shallow = self.make_menu("_Test POS Shallow", depth=2)
+        deep = self.make_menu("_Test POS Deep", depth=8)
+
+        shallow_count, shallow_tree = self.count_queries([shallow[0]])
+        deep_count, deep_tree = self.count_queries([deep[0]])
+
+        self.assertEqual(shallow_count, deep_count)
+        self.assertLessEqual(deep_count, 2)
+
+        level, node = 0, deep_tree[0]
+        while node["child_groups"]:
+            self.assertEqual(len(node["items"]), 2)
+            node = node["child_groups"][0]
+            level += 1
+        self.assertEqual(level, 7)
+        self.assertEqual(node["item_group_id"], deep[-1])
+
+
+class TestRecursiveCatalogQuery(MenuTestCase):
+    def test_matches_item_list_at_any_depth(self):
+        deep = self.make_menu("_Test POS CTE", depth=10)
+
+        with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+            cte_tree = build_cte_hierarchy([deep[0]])
+        self.assertEqual(sql.call_count, 1)
+
+        self.assertEqual(sort_tree(cte_tree), sort_tree(build_complete_hierarchy([deep[0]])))
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkRecursiveCatalogQuery(MenuTestCase):
+    def _time(self, fn, root_group_ids, rounds=20):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn(root_group_ids)
+        return (time.perf_counter() - start) / rounds
+
+    def test_cte_against_item_list(self):
+        print("\ndepth  item_list(ms)  cte(ms)")
+        for depth in (2, 5, 10):
+            groups = self.make_menu(f"_Test POS Bench {depth}", depth=depth, items_per_group=25)
+            nested = self._time(build_complete_hierarchy, [groups[0]])
+            cte = self._time(build_cte_hierarchy, [groups[0]])
+            print(f"{depth:<6} {nested * 1000:<14.2f} {cte * 1000:.2f}")
@@ -0,0 +1,105 @@
+import json
+import os
+import time
+import unittest
+
+from abc_pos.abc_pos.usecase.kitchen_routing import job_key, parse_print_classes, route_lines
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+
+
+def printer(name):
+    return {
+        'preparation_printer': name,
+        'connection_info': f'10.0.0.{len(name)}:9100',
+        'backup_printer': f'{name} Backup',
+        'backup_connection_info': '10.0.1.1:9100',
+    }
+
+
+PRINTER_MAP = [{
+    'cashier_device_name': 'Tablet 1',
+    'print_classes': json.dumps({
+        'Grill': printer('Hot Kitchen'),
+        'Fryer': printer('Hot Kitchen'),
+        'Salad': printer('Cold Kitchen'),
+        'Drinks': printer('Bar'),
+    }),
+}]
+
+
+def make_lines(count, classes=('Grill', 'Salad', 'Drinks', 'Fryer', None, 'Pastry')):
+    return [
+        {
+            'name': f'ROW-{n}',
+            'parent': 'INV-1',
+            'item_code': f'ITEM-{n}',
+            'item_name': f'Item {n}',
+            'qty': 1 + n % 4,
+            'uom': 'Unit',
+            'print_class': classes[n % len(classes)],
+        }
+        for n in range(count)
+    ]
+
+
+class TestKitchenRouting(unittest.TestCase):
+    def setUp(self):
+        self.print_classes = parse_print_classes(PRINTER_MAP)
+
+    def test_one_job_per_printer(self):
+        jobs, unrouted = route_lines(make_lines(12), self.print_classes, {'invoice': 'INV-1', 'table_number': 'T4'})
+
+        self.assertEqual([job['preparation_printer'] for job in jobs], ['Hot Kitchen', 'Cold Kitchen', 'Bar'])
+        self.assertEqual(jobs[0]['print_classes'], ['Grill', 'Fryer'])
+        self.assertEqual(len(jobs[0]['lines']), 4)
+        self.assertEqual(jobs[1]['table_number'], 'T4')
+        # No print class, and a class with no printer on this device
+        self.assertEqual([line['name'] for line in unrouted], ['ROW-4', 'ROW-5', 'ROW-10', 'ROW-11'])
+
+    def test_lines_keep_order_within_job(self):
+        jobs, _ = route_lines(make_lines(12), self.print_classes)
+        self.assertEqual([line['item_row'] for line in jobs[2]['lines']], ['ROW-2', 'ROW-8'])
+
+    def test_parse_accepts_dicts(self):
+        merged = parse_print_classes([{'print_classes': {'Grill': printer('A')}}, {'print_classes': None}])
+        self.assertEqual(list(merged), ['Grill'])
+
+    def test_job_key_ignores_row_order(self):
+        lines = [{'item_row': 'ROW-1', 'item_code': 'TEA', 'qty': 1}, {'item_row': 'ROW-2', 'item_code': 'CAKE', 'qty': 2}]
+        self.assertEqual(job_key('INV-1', lines, 'A'), job_key('INV-1', lines[::-1], 'A'))
+        self.assertNotEqual(job_key('INV-1', lines, 'A'), job_key('INV-1', lines, 'B'))
+
+    def test_job_key_changes_with_line_content(self):
+        line = {'item_row': 'ROW-1', 'item_code': 'TEA', 'qty': 1}
+        self.assertEqual(job_key('INV-1', [line], 'A'), job_key('INV-1', [dict(line)], 'A'))
+        self.assertNotEqual(job_key('INV-1', [line], 'A'), job_key('INV-1', [{**line, 'qty': 3}], 'A'))
+
+
+def per_line_route(lines, printer_map_rows):
+    """Per-line lookup as tablets do it client-side: re-read the map for every line."""
+    jobs = {}
+    for line in lines:
+        for row in printer_map_rows:
+            info = json.loads(row['print_classes']).get(line['print_class'])
+            if info:
+                jobs.setdefault(info['preparation_printer'], []).append(line)
+                break
+    return jobs
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkKitchenRouting(unittest.TestCase):
+    def _per_call(self, fn, rounds=200):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds
+
+    def test_banquet_order(self):
+        print("\nlines  route_lines(ms)  per_line(ms)")
+        for count in (20, 200, 2000):
+            lines = make_lines(count)
+            routed = self._per_call(lambda: route_lines(lines, parse_print_classes(PRINTER_MAP)))
+            per_line = self._per_call(lambda: per_line_route(lines, PRINTER_MAP))
+            print(f"{count:<6} {routed * 1000:<16.3f} {per_line * 1000:.3f}")
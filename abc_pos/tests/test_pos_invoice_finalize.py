@@ -0,0 +1,33 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api.pos_invoice import FINALIZE_KEY, finalize_invoice_job, pos_invoice_status
+
+INVOICE = "_Test Finalize Invoice"
+
+
+class TestInvoiceFinalize(FrappeTestCase):
+    def setUp(self):
+        frappe.db.delete("POS Invoice", {"name": INVOICE})
+        # A draft saved the way async_submit saves it: unvalidated, here with no items or profile
+        doc = frappe.new_doc("POS Invoice")
+        doc.name = INVOICE
+        doc.update({"customer": "_Test Customer", "company": "_Test Company"})
+        doc.flags.ignore_validate = True
+        doc.flags.ignore_mandatory = True
+        doc.insert()
+        # The job rolls back on failure, so the draft has to be committed like a real request's
+        frappe.db.commit()
+
+    def tearDown(self):
+        frappe.db.delete("POS Invoice", {"name": INVOICE})
+        frappe.db.commit()
+        frappe.cache().delete_value(FINALIZE_KEY + INVOICE)
+
+    def test_failed_finalize_is_reported(self):
+        finalize_invoice_job(INVOICE, "Administrator")
+
+        status = pos_invoice_status(INVOICE)
+        self.assertEqual(status["status"], "failed")
+        self.assertTrue(status["error"])
+        self.assertEqual(status["docstatus"], 0)
@@ -0,0 +1,159 @@
+import os
+import unittest
+
+import frappe
+import pymysql.cursors
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.repo.pos_invoice_repo import (
+    ENGINE_EXECUTEMANY,
+    ENGINE_PROCEDURE,
+    PosInvoiceItemRepository,
+    benchmark_item_upsert_engines,
+    fastest_engine,
+)
+
+RUN_BENCHMARKS = os.environ.get("ABC_POS_BENCHMARK", "").lower() in {"1", "true", "yes"}
+COMPARED_COLUMNS = (
+    "item_code", "item_name", "description", "uom", "qty", "rate", "base_amount",
+    "income_account", "cost_center", "folio_window", "owner", "modified_by",
+)
+ENGINE_GROUP = "_Test Engine Group"
+ENGINE_ITEMS = [f"_Test Engine Item {n}" for n in range(7)]
+INCOME_ACCOUNT = "Sales - _TC"
+COST_CENTER = "_Test Cost Center - _TC"
+
+
+def make_engine_items():
+    """
+    Real Items under an Item Group with selling defaults, committed because
+    the engines write through their own connection. Lines that leave out
+    item_name, description, uom or rate fall back to these records.
+    """
+    if not frappe.db.exists("Item Group", ENGINE_GROUP):
+        frappe.get_doc({
+            "doctype": "Item Group", "item_group_name": ENGINE_GROUP, "parent_item_group": "All Item Groups",
+            "item_group_defaults": [{
+                "company": "_Test Company", "income_account": INCOME_ACCOUNT, "selling_cost_center": COST_CENTER,
+            }],
+        }).insert()
+    for n, code in enumerate(ENGINE_ITEMS):
+        make_item(code, {
+            "item_group": ENGINE_GROUP, "item_name": f"Engine Item {n}", "description": f"Engine item {n}",
+            "stock_uom": "Nos", "standard_rate": 10 + n,
+        })
+    frappe.db.commit()
+
+
+def make_items(count):
+    items = []
+    for n in range(count):
+        item = {"item_code": ENGINE_ITEMS[n % 7], "qty": 1 + n % 3}
+        if n % 2:
+            item.update({"rate": 12.5, "item_name": f"Line {n}", "folio_window": "1"})
+        if n % 5 == 0:
+            item.update({"amount": 99, "description": "", "uom": "Kg"})
+        items.append(item)
+    return items
+
+
+class EngineTestCase(FrappeTestCase):
+    invoices = ("_Test Engine Invoice procedure", "_Test Engine Invoice executemany")
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        make_engine_items()
+
+    def setUp(self):
+        self.repo = PosInvoiceItemRepository()
+        self.conn = frappe.db.get_connection()
+        self.cur = self.conn.cursor(pymysql.cursors.DictCursor)
+
+    def tearDown(self):
+        self.cur.execute("DELETE FROM `tabPOS Invoice Item` WHERE parent IN %s", (self.invoices,))
+        self.conn.commit()
+        self.cur.close()
+        self.conn.close()
+
+    def upsert(self, engine, items, full_listing=True):
+        return self.repo.bulk_upsert(
+            self.cur, engine, f"_Test Engine Invoice {engine}", "Administrator", items, full_listing
+        )
+
+
+class TestItemUpsertEngines(EngineTestCase):
+    def normalise(self, rows):
+        return [
+            {column: str(row[column]) for column in COMPARED_COLUMNS}
+            for row in sorted(rows, key=lambda row: row["name"].rsplit("-", 1)[-1])
+        ]
+
+    def test_engines_write_identical_rows(self):
+        items = make_items(12)
+        procedure_rows = self.upsert(ENGINE_PROCEDURE, items)
+        executemany_rows = self.upsert(ENGINE_EXECUTEMANY, items)
+
+        self.assertEqual(len(procedure_rows), 12)
+        self.assertEqual(self.normalise(procedure_rows), self.normalise(executemany_rows))
+
+    def test_engines_fill_defaults_from_item_and_group(self):
+        # Even lines send only item_code and qty, so every other column is a fallback
+        items = make_items(6)
+        for engine in (ENGINE_PROCEDURE, ENGINE_EXECUTEMANY):
+            row = next(row for row in self.upsert(engine, items) if row["item_code"] == ENGINE_ITEMS[2])
+
+            self.assertEqual(row["item_name"], "Engine Item 2")
+            self.assertEqual(row["uom"], "Nos")
+            self.assertEqual(float(row["rate"]), 12)
+            self.assertEqual(row["income_account"], INCOME_ACCOUNT)
+            self.assertEqual(row["cost_center"], COST_CENTER)
+
+    def test_engines_update_identically(self):
+        items = make_items(4)
+        for row in items:
+            row["name"] = f"{row['item_code']}-{row['qty']}"
+        self.upsert(ENGINE_PROCEDURE, items)
+        self.upsert(ENGINE_EXECUTEMANY, [dict(row, name=f"x{row['name']}") for row in items])
+
+        for row in items:
+            row["qty"] = 10
+        procedure_rows = self.upsert(ENGINE_PROCEDURE, items)
+        executemany_rows = self.upsert(ENGINE_EXECUTEMANY, [dict(row, name=f"x{row['name']}") for row in items])
+
+        self.assertEqual(
+            sorted(float(row["qty"]) for row in procedure_rows),
+            sorted(float(row["qty"]) for row in executemany_rows),
+        )
+
+    def test_affected_rows_only(self):
+        for engine in (ENGINE_PROCEDURE, ENGINE_EXECUTEMANY):
+            self.upsert(engine, make_items(10))
+            added = self.upsert(engine, [{"item_code": ENGINE_ITEMS[1], "qty": 1, "name": f"new-{engine}"}], False)
+            totals = self.repo.invoice_item_totals(self.cur, f"_Test Engine Invoice {engine}")
+
+            self.assertEqual([row["name"] for row in added], [f"new-{engine}"])
+            self.assertEqual(totals["count"], 11)
+
+    def test_shared_defaults_match_lookup(self):
+        items = make_items(6)
+        defaults = self.repo.item_defaults(self.cur, [row["item_code"] for row in items])
+        looked_up = self.repo.bulk_upsert_executemany(self.cur, self.invoices[0], "Administrator", items)
+        shared = self.repo.bulk_upsert_executemany(
+            self.cur, self.invoices[1], "Administrator", items, defaults=defaults
+        )
+
+        self.assertEqual(self.normalise(looked_up), self.normalise(shared))
+
+
+@unittest.skipUnless(RUN_BENCHMARKS, "set ABC_POS_BENCHMARK=1 to run benchmarks")
+class BenchmarkItemUpsertEngines(FrappeTestCase):
+    def test_latency_by_item_count(self):
+        make_engine_items()
+        results = benchmark_item_upsert_engines(item_codes=ENGINE_ITEMS)
+
+        print("\nitems  procedure(ms)  executemany(ms)")
+        for row in results:
+            print(f"{row['items']:<6} {row['procedure']:<14.2f} {row['executemany']:.2f}")
+        print(f"fastest: {fastest_engine(results)}")
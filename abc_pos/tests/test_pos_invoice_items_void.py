@@ -0,0 +1,47 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api.pos_invoice import pos_invoice_items_void
+
+INVOICE = "_Test Void Invoice"
+
+
+class TestPosInvoiceItemsVoid(FrappeTestCase):
+    def setUp(self):
+        self.row_ids = [f"_Test Void Row {n}" for n in range(3)]
+        for n, name in enumerate(self.row_ids):
+            frappe.db.sql(
+                """
+                INSERT INTO `tabPOS Invoice Item`
+                    (name, parent, parenttype, parentfield, item_code, item_name, qty, rate, creation, modified)
+                VALUES (%s, %s, 'POS Invoice', 'items', %s, %s, %s, 10, NOW(), NOW())
+                """,
+                (name, INVOICE, f"_Test Void Item {n}", f"Item {n}", n + 1),
+            )
+
+    def tearDown(self):
+        frappe.db.sql("DELETE FROM `tabPOS Invoice Item` WHERE parent = %s", INVOICE)
+        frappe.db.sql("DELETE FROM `tabPOS Invoice Voide Bin` WHERE pos_invoice = %s", INVOICE)
+        frappe.db.commit()
+
+    def test_voids_rows_into_bin(self):
+        result = pos_invoice_items_void(self.row_ids[:2], "Table cancelled")
+
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(frappe.db.count("POS Invoice Item", {"parent": INVOICE}), 1)
+        voided = frappe.get_all(
+            "POS Invoice Voide Bin",
+            filters={"pos_invoice": INVOICE},
+            fields=["item", "quanitity", "cause", "created_by", "owner", "creation"],
+            order_by="item",
+        )
+        self.assertEqual([row.item for row in voided], ["_Test Void Item 0", "_Test Void Item 1"])
+        self.assertEqual([row.quanitity for row in voided], [1, 2])
+        self.assertTrue(all(row.created_by == row.owner == frappe.session.user for row in voided))
+        self.assertTrue(all(row.creation for row in voided))
+
+    def test_missing_row_voids_nothing(self):
+        with self.assertRaises(frappe.ValidationError):
+            pos_invoice_items_void([self.row_ids[0], "_Test Void Missing"], "Wrong table")
+
+        self.assertEqual(frappe.db.count("POS Invoice Voide Bin", {"pos_invoice": INVOICE}), 0)
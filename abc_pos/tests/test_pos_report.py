@@ -0,0 +1,23 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.repo.report_repo import ReportRepository
+from abc_pos.abc_pos.usecase.report_usecase import REPORT_SECTIONS, ReportUseCase
+
+
+class TestPosReport(FrappeTestCase):
+    def setUp(self):
+        self.uc = ReportUseCase(repo=ReportRepository())
+
+    def test_empty_session_has_every_section(self):
+        report = self.uc.x_report("_Test Report Session")
+        self.assertEqual(set(report["sections"]), set(REPORT_SECTIONS))
+        self.assertTrue(all(rows == [] for rows in report["sections"].values()))
+
+    def test_unknown_section(self):
+        with self.assertRaises(frappe.ValidationError):
+            self.uc.x_report("_Test Report Session", ["table"])
+
+    def test_z_report_needs_closed_session(self):
+        with self.assertRaises(frappe.ValidationError):
+            self.uc.z_report("_Test Report Session")
@@ -0,0 +1,62 @@
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+from frappe.utils.background_jobs import get_redis_conn
+
+from abc_pos.abc_pos.repo.print_job_repo import PrintJobRepository, _journal_key
+from abc_pos.abc_pos.usecase.print_spooler_usecase import PrintSpoolerUseCase
+
+
+def job(name):
+    return {
+        "name": f"_test-journal-{name}",
+        "pos_invoice": "_Test Journal Invoice",
+        "cashier_device": None,
+        "preparation_printer": "_Test Journal Printer",
+        "job_data": json.dumps({"lines": []}),
+        "queued_at": str(now_datetime()),
+        "owner": "Administrator",
+    }
+
+
+class TestPrintJournal(FrappeTestCase):
+    def setUp(self):
+        self.repo = PrintJobRepository()
+        self.uc = PrintSpoolerUseCase(repo=self.repo, health=None)
+        get_redis_conn().delete(_journal_key())
+        frappe.db.delete("Print Job", {"name": ["like", "_test-journal-%"]})
+
+    def tearDown(self):
+        get_redis_conn().delete(_journal_key())
+
+    def journaled(self):
+        return set(frappe.get_all("Print Job", filters={"name": ["like", "_test-journal-%"]}, pluck="name"))
+
+    def test_overlapping_flushes_drop_nothing(self):
+        self.repo.buffer_jobs([job(i) for i in range(3)])
+
+        # Two workers read the same head of the buffer before either acknowledges it
+        first = self.repo.buffered_entries(10)
+        second = self.repo.buffered_entries(10)
+        # A ticket is ordered while both are writing their batch
+        self.repo.buffer_jobs([job(3)])
+
+        for entries in (first, second):
+            self.repo.insert_jobs([json.loads(entry) for entry in entries])
+        self.assertEqual(self.repo.drop_buffered(first), 3)
+        self.assertEqual(self.repo.drop_buffered(second), 0)
+
+        # The late ticket is still buffered and the next flush journals it
+        self.assertEqual(self.repo.buffered_count(), 1)
+        self.uc.flush()
+        self.assertEqual(self.repo.buffered_count(), 0)
+        self.assertEqual(self.journaled(), {job(i)["name"] for i in range(4)})
+
+    def test_flush_is_idempotent(self):
+        self.repo.buffer_jobs([job(0), job(0), job(1)])
+        self.uc.flush()
+        self.repo.buffer_jobs([job(1)])
+        self.uc.flush()
+        self.assertEqual(self.journaled(), {job(0)["name"], job(1)["name"]})
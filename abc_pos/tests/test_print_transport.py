@@ -0,0 +1,156 @@
+import socket
+import threading
+import time
+import unittest
+
+from abc_pos.abc_pos.usecase.print_transport import (
+    ESC_FEED_CUT,
+    ESC_INIT,
+    PrintSpooler,
+    deliver,
+    probe,
+    render_ticket,
+)
+
+
+class FakePrinter:
+    """Local TCP server standing in for a raw port 9100 printer."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+
+    def _read(self, conn):
+        time.sleep(self.delay)
+        chunks = []
+        with conn:
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                chunks.append(data)
+        self.received.append(b"".join(chunks))
+
+    def wait_for(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while len(self.received) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.received
+
+    def close(self):
+        self.sock.close()
+
+
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+JOB = {
+    "preparation_printer": "Hot Kitchen",
+    "invoice": "INV-1",
+    "table_number": "T4",
+    "lines": [
+        {"item_code": "BURGER", "item_name": "Burger", "qty": 2.0},
+        {"item_code": "FRIES", "item_name": None, "qty": 1.5},
+    ],
+}
+
+
+class TestPrintTransport(unittest.TestCase):
+    def setUp(self):
+        self.printers = []
+
+    def tearDown(self):
+        for printer in self.printers:
+            printer.close()
+
+    def printer(self, **kwargs):
+        printer = FakePrinter(**kwargs)
+        self.printers.append(printer)
+        return printer
+
+    def test_render_ticket(self):
+        payload = render_ticket(JOB)
+
+        self.assertTrue(payload.startswith(ESC_INIT))
+        self.assertTrue(payload.endswith(ESC_FEED_CUT))
+        self.assertIn(b"Table: T4", payload)
+        self.assertIn(b"2 x ", payload)
+        self.assertIn(b"1.5 x ", payload)
+        self.assertIn(b"FRIES", payload)
+
+    def test_delivers_to_primary(self):
+        primary = self.printer()
+        result = deliver(b"ticket", [("Hot Kitchen", "127.0.0.1", primary.port)])
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.printer, "Hot Kitchen")
+        self.assertEqual(primary.wait_for(1), [b"ticket"])
+
+    def test_fails_over_to_backup_after_retries(self):
+        backup = self.printer()
+        result = deliver(
+            b"ticket",
+            [("Hot Kitchen", "127.0.0.1", closed_port()), ("Backup", "127.0.0.1", backup.port)],
+            retries=2, backoff=0,
+        )
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.printer, "Backup")
+        self.assertEqual(result.attempts, 4)
+        self.assertEqual(result.failed_printers, ["Hot Kitchen"])
+        self.assertEqual(backup.wait_for(1), [b"ticket"])
+
+    def test_probe(self):
+        self.assertTrue(probe("127.0.0.1", self.printer().port))
+        self.assertFalse(probe("127.0.0.1", closed_port()))
+
+    def test_reports_failure_when_all_down(self):
+        result = deliver(
+            b"ticket",
+            [("Hot Kitchen", "127.0.0.1", closed_port()), ("No Address", None, 9100)],
+            retries=1, backoff=0,
+        )
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.attempts, 2)
+        self.assertIn("Hot Kitchen", result.error)
+
+    def test_slow_printer_does_not_block_others(self):
+        slow, fast = self.printer(delay=0.5), self.printer()
+        spooler = PrintSpooler(max_workers=4, retries=0)
+
+        start = time.monotonic()
+        results = spooler.deliver_all({
+            "slow": (b"a" * 8, [("Slow", "127.0.0.1", slow.port)]),
+            **{f"fast-{n}": (b"b", [("Fast", "127.0.0.1", fast.port)]) for n in range(6)},
+        })
+
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(len(fast.wait_for(6)), 6)
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    def test_max_seconds_covers_every_round(self):
+        spooler = PrintSpooler(max_workers=8, retries=2, backoff=0, connect_timeout=2.0, write_timeout=5.0)
+
+        # 3 attempts x 7 s on primary and backup per job, 8 jobs per round
+        self.assertEqual(spooler.max_seconds(8), 42)
+        self.assertEqual(spooler.max_seconds(50), 7 * 42)
@@ -0,0 +1,37 @@
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.usecase.printing_usecase import PrintingUseCase
+
+
+class CountingPrintingRepo:
+    def __init__(self):
+        self.calls = 0
+
+    def get_cashier_device_printers_map(self, cashier_device_name=None):
+        self.calls += 1
+        return [{"cashier_device_name": cashier_device_name or "_Test Device", "print_classes": "{}"}]
+
+
+class TestPrinterMapCache(FrappeTestCase):
+    def setUp(self):
+        self.repo = CountingPrintingRepo()
+        self.uc = PrintingUseCase(repo=self.repo)
+        self.uc.invalidate_printer_maps()
+
+    def tearDown(self):
+        self.uc.invalidate_printer_maps()
+
+    def test_map_precomputed_per_device(self):
+        self.uc.get_cashier_printers_cache("_Test Device")
+        self.uc.get_cashier_printers_cache("_Test Device")
+        self.uc.get_cashier_printers_cache("_Test Device 2")
+
+        self.assertEqual(self.repo.calls, 2)
+
+    def test_invalidation_bumps_version(self):
+        before = self.uc.get_cashier_printers_entry("_Test Device")["version"]
+        self.uc.invalidate_printer_maps()
+        after = self.uc.get_cashier_printers_entry("_Test Device")["version"]
+
+        self.assertNotEqual(before, after)
+        self.assertEqual(self.repo.calls, 2)
@@ -0,0 +1,45 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.usecase.session_usecase import SessionUseCase
+
+USER = "_test_session_cache@example.com"
+
+
+class CountingRepo:
+    def __init__(self, session):
+        self.session = session
+        self.calls = 0
+
+    def session_find_active(self, filters):
+        self.calls += 1
+        return self.session
+
+
+class TestActiveSessionCache(FrappeTestCase):
+    def setUp(self):
+        self.repo = CountingRepo(frappe._dict(name="_Test Session", pos_profile="_Test Profile"))
+        self.uc = SessionUseCase(repo=self.repo)
+        self.uc.evict(USER)
+
+    def tearDown(self):
+        self.uc.evict(USER)
+
+    def test_query_runs_on_miss_only(self):
+        first = self.uc.get_active(USER)
+        second = self.uc.get_active(USER)
+
+        self.assertEqual(self.repo.calls, 1)
+        self.assertEqual(second.pos_profile, first.pos_profile)
+
+    def test_no_session_is_cached(self):
+        self.repo.session = None
+        self.assertIsNone(self.uc.get_active(USER))
+        self.assertIsNone(self.uc.get_active(USER))
+        self.assertEqual(self.repo.calls, 1)
+
+    def test_evict_forces_reload(self):
+        self.uc.get_active(USER)
+        self.uc.evict(USER)
+        self.uc.get_active(USER)
+        self.assertEqual(self.repo.calls, 2)
@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+import frappe
+from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.api.pos_session import sesison_close, session_open
+
+INVOICES = 300
+
+
+class TestSessionClose(FrappeTestCase):
+    def setUp(self):
+        profile = make_pos_profile()
+        frappe.defaults.set_user_default("Company", profile.company)
+        frappe.db.delete("POS Session", {"pos_profile": profile.name, "session_status": "Open"})
+        self.session = session_open(profile.name, company=profile.company, opening_cash=500)["session"]
+        frappe.db.bulk_insert(
+            "POS Invoice",
+            fields=["name", "pos_session", "status", "grand_total"],
+            values=[(f"_Test Close {n:03d}", self.session, "Paid", 10) for n in range(INVOICES)],
+        )
+
+    def test_close_reads_no_invoices_and_defers_submit(self):
+        with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql, patch("frappe.enqueue") as enqueue:
+            response = sesison_close(self.session, closing_cash=500)
+
+        queries = [str(call.args[0]) for call in sql.call_args_list]
+        self.assertFalse([query for query in queries if "tabPOS Invoice" in query])
+        self.assertFalse([query for query in queries if "tabPOS Invoice Merge Log" in query])
+
+        closing_entry = response["closing_entry"]
+        self.assertEqual(response["closing_status"], "queued")
+        self.assertEqual(frappe.db.get_value("POS Closing Entry", closing_entry, "docstatus"), 0)
+        self.assertEqual(frappe.db.get_value("POS Session", self.session, "session_status"), "Closed")
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args.kwargs["closing_entry"], closing_entry)
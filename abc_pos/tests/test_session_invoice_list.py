@@ -0,0 +1,70 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from abc_pos.abc_pos.api.pos_session import (
+    _decode_cursor,
+    _encode_cursor,
+    _statuses,
+    session_invoice_list,
+    session_invoice_summary,
+)
+
+SESSION = "_Test Paging Session"
+
+
+class TestSessionInvoiceCursor(FrappeTestCase):
+    def test_cursor_round_trip(self):
+        row = frappe._dict(creation="2025-09-01 12:30:00.123456", name="ACC-PSINV-2025-00042")
+        self.assertEqual(_decode_cursor(_encode_cursor(row)), (row.creation, row.name))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(frappe.ValidationError):
+            _decode_cursor("not-a-cursor")
+
+    def test_status_filter_forms(self):
+        self.assertIsNone(_statuses(None))
+        self.assertEqual(_statuses("Paid"), ["Paid"])
+        self.assertEqual(_statuses('["Paid", "Draft"]'), ["Paid", "Draft"])
+
+
+class TestSessionInvoicePaging(FrappeTestCase):
+    def setUp(self):
+        frappe.db.delete("POS Invoice", {"pos_session": SESSION})
+        frappe.db.delete("POS Session", {"name": SESSION})
+        frappe.db.bulk_insert(
+            "POS Session", fields=["name", "session_status"], values=[(SESSION, "Open")]
+        )
+        # 25 invoices, most sharing one creation timestamp, so only the name breaks ties
+        now = now_datetime()
+        self.invoices = [
+            (f"_Test Paging {n:02d}", SESSION, now if n % 5 else add_to_date(now, seconds=-n), "Paid", 10)
+            for n in range(25)
+        ]
+        frappe.db.bulk_insert(
+            "POS Invoice",
+            fields=["name", "pos_session", "creation", "status", "grand_total"],
+            values=self.invoices,
+        )
+
+    def test_walking_cursor_returns_each_invoice_once_in_order(self):
+        seen, cursor = [], None
+        while True:
+            page = session_invoice_list(SESSION, cursor=cursor, limit=7)
+            self.assertLessEqual(page["count"], 7)
+            seen += [row.name for row in page["orders"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        expected = [name for name, _, _, _, _ in sorted(self.invoices, key=lambda row: (row[2], row[0]), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def test_summary_covers_every_page(self):
+        summary = session_invoice_summary(SESSION)
+        self.assertEqual(summary["totals"]["count"], 25)
+        self.assertEqual(summary["totals"]["grand_total"], 250)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(session_invoice_list(SESSION, limit=-5)["count"], 1)
+        self.assertEqual(session_invoice_list(SESSION, limit=0)["count"], 25)
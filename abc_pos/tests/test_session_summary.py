@@ -0,0 +1,63 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.repo.session_summary_repo import SessionSummaryRepository
+from abc_pos.abc_pos.usecase.session_summary_usecase import SessionSummaryUseCase
+
+SESSION = "_Test Summary Session"
+
+
+def invoice(sign_total=100.0):
+    return frappe._dict(
+        pos_session=SESSION,
+        grand_total=sign_total,
+        paid_amount=sign_total,
+        change_amount=0,
+        items=[frappe._dict(qty=2), frappe._dict(qty=1)],
+        payments=[
+            frappe._dict(mode_of_payment="Cash", amount=sign_total - 40),
+            frappe._dict(mode_of_payment="Credit Card", amount=40),
+        ],
+    )
+
+
+class TestSessionSummary(FrappeTestCase):
+    def setUp(self):
+        self.uc = SessionSummaryUseCase(repo=SessionSummaryRepository())
+
+    def test_deltas_accumulate(self):
+        self.uc.apply_invoice(invoice(100), 1)
+        self.uc.apply_invoice(invoice(50), 1)
+        self.uc.apply_invoice(invoice(50), -1)
+
+        summary = self.uc.summary(SESSION)
+        self.assertEqual(summary.invoice_count, 1)
+        self.assertEqual(summary.item_lines, 2)
+        self.assertEqual(summary.item_qty, 3)
+        self.assertEqual(summary.grand_total, 100)
+        self.assertEqual(summary.payments, {"Cash": 60, "Credit Card": 40})
+
+    def test_reconcile_corrects_drift(self):
+        # No invoices exist for this session, so every stored total is drift
+        self.uc.apply_invoice(invoice(100), 1)
+
+        result = self.uc.reconcile(SESSION)
+        summary = self.uc.summary(SESSION)
+
+        self.assertEqual(result["status"], "Corrected")
+        self.assertEqual(summary.invoice_count, 0)
+        self.assertEqual(summary.grand_total, 0)
+        self.assertEqual(self.uc.reconcile(SESSION)["status"], "Matched")
+
+    def test_closing_shows_cash_discrepancy(self):
+        self.uc.apply_invoice(invoice(100), 1)
+        summary = self.uc.summary(SESSION)
+
+        # 500 opening float + 60 cash taken, but the drawer holds 550
+        rows = {row["mode_of_payment"]: row for row in self.uc.closing_reconciliation(summary, {"Cash": 500}, {}, 550)}
+
+        self.assertEqual(rows["Cash"]["expected_amount"], 560)
+        self.assertEqual(rows["Cash"]["closing_amount"], 550)
+        self.assertEqual(rows["Cash"]["difference"], -10)
+        # Nobody counted card takings, so they close as expected
+        self.assertEqual(rows["Credit Card"]["difference"], 0)
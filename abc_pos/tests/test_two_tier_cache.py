@@ -0,0 +1,51 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from abc_pos.abc_pos.usecase.two_tier_cache import TwoTierCache
+
+
+class TestTwoTierCache(FrappeTestCase):
+    def setUp(self):
+        self.cache = TwoTierCache("abc_pos:_test_two_tier", local_ttl=60)
+        self.cache.invalidate()
+        self.loads = 0
+
+    def tearDown(self):
+        self.cache.invalidate()
+
+    def loader(self):
+        self.loads += 1
+        return {"loads": self.loads}
+
+    def test_loads_once(self):
+        first = self.cache.get_entry("key", self.loader)
+        second = self.cache.get_entry("key", self.loader)
+
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(first, second)
+
+    def test_redis_tier_shared_between_processes(self):
+        self.cache.get("key", self.loader)
+        other_process = TwoTierCache("abc_pos:_test_two_tier", local_ttl=60)
+
+        self.assertEqual(other_process.get("key", self.loader), {"loads": 1})
+        self.assertEqual(self.loads, 1)
+
+    def test_invalidate_changes_version(self):
+        before = self.cache.get_entry("key", self.loader)
+        self.cache.invalidate("key")
+        after = self.cache.get_entry("key", self.loader)
+
+        self.assertEqual(self.loads, 2)
+        self.assertNotEqual(before["version"], after["version"])
+
+    def test_none_is_cached(self):
+        self.cache.get("missing", lambda: None)
+        self.assertIsNone(self.cache.get("missing", self.loader))
+        self.assertEqual(self.loads, 0)
+
+    def test_missing_not_cached_when_disabled(self):
+        cache = TwoTierCache("abc_pos:_test_two_tier", local_ttl=60, cache_missing=False)
+        self.assertIsNone(cache.get("unknown", lambda: None))
+        self.assertIsNone(frappe.cache().get_value("abc_pos:_test_two_tier:unknown"))
+        self.assertEqual(cache.get("unknown", self.loader), {"loads": 1})